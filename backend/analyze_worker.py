@@ -0,0 +1,65 @@
+import sys
+import os
+import signal
+import asyncio
+import argparse
+import functools
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.database import close_db_client
+from backend.services.analysis import run_analysis
+from backend.services.analyze_jobs import AnalyzeJobRunner, job_store, ANALYZE_WORKERS, ANALYZE_JOB_POLL
+from backend.services.db_service import session_logger
+from backend.services.scraper import close_http_session, jd_cache
+from backend.services.ai_service import question_cache
+from backend.services.resume_cache import resume_cache
+from backend.services.similar_index import similar_index
+from backend.services.workers import shutdown_pools
+from backend.services.prewarm import prewarm, readiness, STEPS, PREWARM
+
+# Everything a job touches; sign-ins never reach this process, so the auth pool stays cold
+WORKER_STEPS = [(name, warm) for name, warm in STEPS if name != "auth_pool"]
+
+async def serve(concurrency: int, poll_interval: float):
+    # Question banks live in the API process that serves /api/session/{id}/next-question, so jobs run
+    # here return their first question without a session
+    runner = AnalyzeJobRunner(job_store, functools.partial(run_analysis, interview_session=False), concurrency, poll_interval)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    session_logger.start()
+    # Warm up before claiming anything, so the first jobs do not wait on process pool start-up
+    if PREWARM:
+        # One attempt per step: whatever failed is loaded on first use instead
+        await prewarm(WORKER_STEPS, retry=False)
+        failed = {name: status["error"] for name, status in readiness()["subsystems"].items() if status["state"] == "failed"}
+        if failed:
+            print(f"Warning: prewarm failed for {failed}", flush=True)
+    runner.start()
+    print(f"Status: {runner.name} running {concurrency} job workers on {job_store.path}", flush=True)
+    await stop.wait()
+
+    # Jobs still running go back on the queue; queued sessions are flushed before the pools go away
+    await runner.close()
+    await session_logger.close()
+    shutdown_pools()
+    close_db_client()
+    await close_http_session()
+    jd_cache.close()
+    question_cache.close()
+    resume_cache.close()
+    similar_index.close()
+    job_store.close()
+    print(f"Status: stopped ({runner.stats()})")
+
+# --- CLI ---
+# Usage (from the repo root): python -m backend.analyze_worker --concurrency 4
+# Run as many as the host has CPU for; with ANALYZE_WORKERS=0 the API processes only queue jobs.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run analyze jobs queued by POST /api/analyze/jobs.")
+    parser.add_argument("--concurrency", type=int, default=max(ANALYZE_WORKERS, 1), help="jobs this process runs at once")
+    parser.add_argument("--poll", type=float, default=ANALYZE_JOB_POLL, help="seconds between queue checks while idle")
+    args = parser.parse_args()
+    asyncio.run(serve(args.concurrency, args.poll))
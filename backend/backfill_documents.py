@@ -0,0 +1,74 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.database import get_db_client
+from backend.services.document_store import store_documents, compress_text, content_hash
+
+BATCH_SIZE = 200
+
+def backfill(batch_size: int = BATCH_SIZE) -> dict:
+    """Moves inline resume_text / jd_text of un-migrated interviews into the documents table, by id order."""
+    supabase = get_db_client()
+    report = {"rows": 0, "raw_bytes": 0, "documents": 0, "stored_bytes": 0}
+    seen = set()
+    last_id = None
+    while True:
+        # 1. Keyset over rows that have no hashes yet (re-running resumes where it stopped)
+        query = supabase.table("interviews").select("id, resume_text, jd_text").is_("resume_hash", "null").is_("jd_hash", "null")
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(batch_size).execute().data
+        if not rows:
+            return report
+
+        for row in rows:
+            texts = {"resume": row.get("resume_text") or "", "jd": row.get("jd_text") or ""}
+            # 2. Store each distinct text once, then point the row at it
+            hashes = store_documents(texts)
+            supabase.table("interviews").update({"resume_hash": hashes["resume"], "jd_hash": hashes["jd"]}).eq("id", row["id"]).execute()
+
+            report["rows"] += 1
+            for text in texts.values():
+                if not text:
+                    continue
+                report["raw_bytes"] += len(text.encode("utf-8"))
+                digest = content_hash(text)
+                if digest not in seen:
+                    seen.add(digest)
+                    report["documents"] += 1
+                    report["stored_bytes"] += len(compress_text(text))
+        last_id = rows[-1]["id"]
+        print(f"   {report['rows']} rows migrated...")
+
+def clear_inline_text() -> int:
+    """Nulls resume_text / jd_text on rows whose text now lives in the documents table."""
+    supabase = get_db_client()
+    response = (
+        supabase.table("interviews")
+        .update({"resume_text": None, "jd_text": None})
+        .not_.is_("resume_hash", "null")
+        .not_.is_("jd_hash", "null")
+        .execute()
+    )
+    return len(response.data or [])
+
+# --- CLI ---
+# Usage (from the repo root, after backend/migrations/003_documents.sql): python -m backend.backfill_documents
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move interview resume / JD text into the content-addressed documents table.")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--clear-text", action="store_true", help="afterwards, null the inline text columns of migrated rows")
+    args = parser.parse_args()
+
+    print("1. Backfilling documents from existing interviews...")
+    report = backfill(args.batch_size)
+    saved = report["raw_bytes"] - report["stored_bytes"]
+    print(f"   {report['rows']} rows, {report['documents']} distinct documents")
+    print(f"   {report['raw_bytes']} bytes of inline text -> {report['stored_bytes']} bytes stored ({saved} saved)")
+
+    if args.clear_text:
+        print("2. Clearing inline text on migrated rows...")
+        print(f"   {clear_inline_text()} rows cleared")
+    print("Status: Backfill Complete.")
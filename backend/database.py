@@ -1,7 +1,13 @@
+import sys
 import os
-from supabase import create_client, Client
+import time
+import threading
+import httpx
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.telemetry import record_external, status_outcome
+
 # Load the secret keys from the .env file
 load_dotenv()
 
@@ -13,12 +19,130 @@ raw_key = os.environ.get("SUPABASE_KEY")
 url = raw_url.strip().strip('"').strip("'") if raw_url else None
 key = raw_key.strip().strip('"').strip("'") if raw_key else None
 
-def get_db_client() -> Client:
-    """Initializes and returns the Supabase client."""
+# Connection pool tuning for the shared PostgREST HTTP client
+POOL_SIZE = int(os.environ.get("SUPABASE_POOL_SIZE", "10"))
+KEEPALIVE_SECONDS = float(os.environ.get("SUPABASE_KEEPALIVE_SECONDS", "60"))
+REQUEST_TIMEOUT = float(os.environ.get("SUPABASE_TIMEOUT", "30"))
+
+class _TrackedStream(httpx.SyncByteStream):
+    """Wraps a response body so the pool slot is released only once the body is closed."""
+
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._on_close()
+
+class PooledTransport(httpx.HTTPTransport):
+    """Keep-alive HTTP transport that caps in-flight requests and records pool statistics."""
+
+    def __init__(self, pool_size: int = POOL_SIZE, keepalive_seconds: float = KEEPALIVE_SECONDS):
+        super().__init__(limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive_seconds,
+        ))
+        self.pool_size = pool_size
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._requests = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        # 1. Wait for a free slot (this is the queueing time a burst of requests sees)
+        start = time.perf_counter()
+        self._slots.acquire()
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._in_use += 1
+            self._requests += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        # 2. Send over a warm keep-alive connection when one is idle
+        table = request.url.path.rstrip("/").rsplit("/", 1)[-1]
+        sent = time.perf_counter()
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            record_external("supabase", table, "error", time.perf_counter() - sent)
+            self._release()
+            raise
+        record_external("supabase", table, status_outcome(response.status_code), time.perf_counter() - sent)
+
+        # 3. Hold the slot until the caller has finished reading the body
+        response.stream = _TrackedStream(response.stream, self._release)
+        return response
+
+    def _release(self):
+        with self._lock:
+            self._in_use -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        connections = self._pool.connections
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "in_use": self._in_use,
+                "open_connections": len(connections),
+                "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+                "requests": self._requests,
+                "wait_ms_total": round(self._wait_total * 1000, 3),
+                "wait_ms_avg": round(self._wait_total * 1000 / self._requests, 3) if self._requests else 0.0,
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+            }
+
+_client = None
+_transport = None
+_http_client = None
+_client_lock = threading.Lock()
+
+def init_db_client() -> "Client":
+    """Builds the process-wide Supabase client on top of a pooled keep-alive HTTP client."""
+    global _client, _transport, _http_client
     if not url or not key:
         raise ValueError("CRITICAL ERROR: Supabase credentials not found in .env file or Render Environment")
-    
-    return create_client(url, key)
+
+    with _client_lock:
+        if _client is None:
+            # The SDK pulls in auth, storage, realtime and functions clients: imported here, not at module import
+            from supabase import create_client, ClientOptions
+            _transport = PooledTransport()
+            _http_client = httpx.Client(transport=_transport, timeout=REQUEST_TIMEOUT)
+            _client = create_client(url, key, options=ClientOptions(httpx_client=_http_client))
+    return _client
+
+def get_db_client() -> "Client":
+    """Returns the shared Supabase client (created on first use outside the FastAPI lifespan)."""
+    if _client is not None:
+        return _client
+    return init_db_client()
+
+def close_db_client():
+    """Closes the pooled connections. Called from the FastAPI shutdown hook."""
+    global _client, _transport, _http_client
+    with _client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _client = None
+        _transport = None
+        _http_client = None
+
+def get_pool_stats() -> dict:
+    """Returns in-use / idle / wait-time statistics for the Supabase connection pool."""
+    if _transport is None:
+        return {"pool_size": POOL_SIZE, "initialized": False}
+    return {"initialized": True, **_transport.stats()}
 
 # --- TEST BLOCK ---
 if __name__ == "__main__":
@@ -26,5 +150,6 @@ if __name__ == "__main__":
     try:
         supabase = get_db_client()
         print("Status: Connection Successful! Supabase client initialized.")
+        print(f"Pool: {get_pool_stats()}")
     except Exception as e:
-        print(f"Status: Connection Failed. Error: {e}")
\ No newline at end of file
+        print(f"Status: Connection Failed. Error: {e}")
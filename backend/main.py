@@ -1,24 +1,111 @@
 from fastapi import FastAPI, File, UploadFile, Form
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
 from pydantic import BaseModel
-import shutil
-from backend.database import get_db_client
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
+import json
+from backend.database import get_db_client, close_db_client, get_pool_stats
 import os
 
 
-# Import all 6 of our custom services
-from backend.services.pdf_parser import extract_text_from_pdf
+# Import our custom services
+from backend.services.pdf_parser import read_upload_limited
 from backend.services.data_cleaner import clean_text
-from backend.services.scraper import scrape_job_description
-from backend.services.ml_engine import calculate_match_score, extract_missing_keywords
-from backend.services.db_service import log_interview_session, get_interview_history
-from backend.services.ai_service import generate_interview_question, evaluate_candidate_answer
+from backend.services.scraper import scrape_job_description, close_http_session, jd_cache
+from backend.services.ranking import rank_resumes
+from backend.services.db_service import session_logger, get_interview_history, get_interview_session, HISTORY_PAGE_SIZE
+from backend.services.ai_service import evaluate_candidate_answer, stream_candidate_evaluation, question_cache, question_bank, gateway
 from backend.services.auth_service import register_user, authenticate_user
+from backend.services.llm_gateway import LLMError
+from backend.services.workers import run_blocking, shutdown_pools
+from backend.services.telemetry import TelemetryMiddleware, stage, render_metrics, register_gauge
+from backend.services.prewarm import start_prewarm, readiness
+from backend.services.analysis import run_analysis
+from backend.services.analyze_jobs import job_store, job_runner, JobQueueFullError
+from backend.services.bulk_ingest import ingest, iter_uploads
+from backend.services.resume_cache import resume_cache
+from backend.services.similar_index import similar_index, similar_jobs, similar_candidates, IndexNotBuiltError
 
 class ChatPayload(BaseModel):
     question: str
     answer: str
 
-app = FastAPI(title="Shadow Recruiter API")
+class RankResume(BaseModel):
+    id: str
+    text: str
+
+class RankPayload(BaseModel):
+    resumes: list[RankResume]
+    job_url: Optional[str] = None
+    job_description: Optional[str] = None
+    top_k: int = 10
+    chunk_size: int = 500
+
+class SimilarJobsPayload(BaseModel):
+    job_url: Optional[str] = None
+    job_description: Optional[str] = None
+    top_k: int = 10
+
+class SimilarCandidatesPayload(BaseModel):
+    missing_skills: list[str]
+    top_k: int = 10
+    exclude_candidate: Optional[str] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Start serving right away: the Supabase client, the TF-IDF model, the SDK imports and the process
+    # pools are warmed in the background (see /api/ready); a request that gets there first loads what it needs
+    prewarm_task = start_prewarm()
+    # Background writer for interview sessions (also replays anything spilled by the previous run)
+    session_logger.start()
+    # In-process analyze job workers (ANALYZE_WORKERS=0 leaves the jobs to python -m backend.analyze_worker)
+    job_runner.start()
+    yield
+    if prewarm_task is not None:
+        prewarm_task.cancel()
+        await asyncio.gather(prewarm_task, return_exceptions=True)
+    # Jobs still running go back on the queue for the next worker
+    await job_runner.close()
+    job_store.close()
+    await question_bank.close()
+    # Flush queued sessions while the DB client and I/O pool are still up
+    await session_logger.close()
+    # Drain the thread and process pools so in-flight work finishes before the worker exits
+    shutdown_pools()
+    close_db_client()
+    await close_http_session()
+    jd_cache.close()
+    question_cache.close()
+    resume_cache.close()
+    similar_index.close()
+
+app = FastAPI(title="Shadow Recruiter API", lifespan=lifespan)
+# Server-Timing header on every response, request / stage histograms for /metrics, opt-in slow-request profiles
+app.add_middleware(TelemetryMiddleware)
+
+# Live component state, read whenever /metrics is scraped
+register_gauge("session_log_queue_depth", "Interview sessions waiting for the write-behind logger.", lambda: session_logger.stats()["queue_depth"])
+register_gauge("llm_in_flight", "Gemini requests currently in flight.", lambda: gateway.stats()["in_flight"])
+register_gauge("llm_circuit_open", "1 while the Gemini circuit breaker is open.", lambda: int(gateway.breaker.state == "open"))
+register_gauge("supabase_pool_in_use", "Supabase connections currently checked out.", lambda: get_pool_stats()["in_use"])
+register_gauge("analyze_jobs", "Analyze jobs in the shared queue, by state.", lambda: job_store.depth(), label="state")
+register_gauge("similar_index_rows", "Vectors in the similarity index, by index.", lambda: similar_index.sizes(), label="index")
+register_gauge("question_bank_sessions", "Interview sessions holding a question bank.", lambda: question_bank.stats()["active_sessions"])
+
+def error_response(message: str, status_code: int = 500, **extra) -> JSONResponse:
+    """The usual {"status": "error"} body, with an HTTP status that load balancers and metrics can see."""
+    return JSONResponse({"status": "error", "message": message, **extra}, status_code=status_code)
+
+def auth_response(result: dict):
+    # Sign-ins shed by the auth pool's backpressure are 503, so clients and load balancers back off
+    if result.get("retryable"):
+        return JSONResponse(result, status_code=503)
+    return result
+
+def llm_error_response(error: LLMError) -> JSONResponse:
+    # Structured, so clients can tell a rate limit or an open circuit from a bad request
+    return error_response(str(error), error.http_status, error=error.to_dict())
 
 @app.post("/api/analyze")
 async def analyze_application(
@@ -28,85 +115,289 @@ async def analyze_application(
     resume: UploadFile = File(...)
 ):
     try:
-        # 1. Save uploaded PDF temporarily to the server
-        temp_pdf_path = f"temp_{resume.filename}"
-        with open(temp_pdf_path, "wb") as buffer:
-            shutil.copyfileobj(resume.file, buffer)
-        
-        # 2. Extract and Clean Resume
-        raw_resume = extract_text_from_pdf(temp_pdf_path)
-        clean_resume = clean_text(raw_resume)
-        os.remove(temp_pdf_path) # Clean up the temp file immediately
-        
-        # 3. Scrape and Clean Job Description
-        raw_jd = scrape_job_description(job_url)
-        clean_jd = clean_text(raw_jd)
-        
-        # 4. Math Engine Analysis
-        match_score = calculate_match_score(clean_resume, clean_jd)
-        missing_skills = extract_missing_keywords(clean_resume, clean_jd)
-        
-        # 5. Database Memory Injection
-        log_interview_session(job_role, match_score, missing_skills, clean_resume, clean_jd, candidate_name)
-        
-        # 6. AI Brain Question Generation
-        question = generate_interview_question(job_role, missing_skills)
-        
-        # Return the final payload to the frontend
-        return {
-            "status": "success",
-            "match_score": match_score,
-            "missing_skills": missing_skills,
-            "interview_question": question
-        }
+        # 1. Read the uploaded PDF straight into memory (size-capped while streaming, no temp file)
+        with stage("read_upload"):
+            resume_bytes = await read_upload_limited(resume)
+
+        # 2. Parse + scrape, clean, score, log the session and generate the first question
+        return await run_analysis(resume_bytes, job_url, job_role, candidate_name)
+    except LLMError as e:
+        return llm_error_response(e)
     except Exception as e:
-        return {"status": "error", "message": str(e)}
+        return error_response(str(e))
     
-# Add this to your imports at the top of main.py if it's not already there:
-# from backend.services.ai_service import evaluate_candidate_answer
+@app.post("/api/analyze/jobs", status_code=202)
+async def submit_analyze_job(
+    job_url: str = Form(...),
+    job_role: str = Form(...),
+    candidate_name: str = Form(...),
+    resume: UploadFile = File(...)
+):
+    """Queues an analysis and returns its job ID right away; poll GET /api/analyze/jobs/{job_id} for progress."""
+    try:
+        with stage("read_upload"):
+            resume_bytes = await read_upload_limited(resume)
+        request = {"job_url": job_url, "job_role": job_role, "candidate_name": candidate_name}
+        job_id = await run_blocking(job_store.submit, request, resume_bytes)
+    except JobQueueFullError as e:
+        return error_response(str(e), 503, retryable=True)
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e))
+    # An idle in-process worker starts on it now instead of at its next poll
+    job_runner.notify()
+    return JSONResponse({"status": "success", "job_id": job_id, "state": "queued", "poll_url": f"/api/analyze/jobs/{job_id}"}, status_code=202)
+
+@app.get("/api/analyze/jobs/{job_id}")
+async def analyze_job_status(job_id: str):
+    """The job's state, per-stage progress and timings, and once finished its result (the /api/analyze payload) or error."""
+    try:
+        job = await run_blocking(job_store.get, job_id)
+        if job is None:
+            return error_response("Unknown or expired analysis job.", 404)
+        return {"status": "success", "job": job}
+    except Exception as e:
+        return error_response(str(e))
 
 @app.post("/api/chat")
 async def chat_with_recruiter(payload: ChatPayload):
     try:
         # Pass the data to the Shadow Recruiter
-        feedback = evaluate_candidate_answer(payload.question, payload.answer)
+        feedback = await evaluate_candidate_answer(payload.question, payload.answer)
         
         return {
             "status": "success",
             "feedback": feedback
         }
+    except LLMError as e:
+        return llm_error_response(e)
+    except Exception as e:
+        return error_response(str(e))
+
+@app.get("/api/session/{session_id}/next-question")
+async def next_interview_question(session_id: str):
+    """Serves the session's next pre-generated question (refilling the bank in the background when low)."""
+    try:
+        result = await question_bank.next_question(session_id)
+        if result is None:
+            return error_response("Unknown or expired interview session.", 404)
+        question, remaining = result
+        return {
+            "status": "success",
+            "question": question,
+            "questions_remaining": remaining,
+            # None means the interview's question cap was reached
+            "finished": question is None
+        }
+    except LLMError as e:
+        return llm_error_response(e)
     except Exception as e:
-        return {"status": "error", "message": str(e)}
+        return error_response(str(e))
+
+def sse_event(payload: dict, event: str = None) -> str:
+    """Formats one Server-Sent Events frame."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(payload)}\n\n"
+
+@app.post("/api/chat/stream")
+async def chat_with_recruiter_stream(payload: ChatPayload):
+    """Streams the recruiter's feedback as Server-Sent Events: delta frames, then a done (or error) frame."""
+    async def events():
+        chunks = []
+        try:
+            async for text in stream_candidate_evaluation(payload.question, payload.answer):
+                chunks.append(text)
+                yield sse_event({"delta": text})
+            yield sse_event({"feedback": "".join(chunks).strip()}, event="done")
+        except LLMError as e:
+            yield sse_event(e.to_dict(), event="error")
+        except Exception as e:
+            yield sse_event({"message": str(e)}, event="error")
+
+    # Disable proxy buffering so each frame reaches the browser as soon as it is written
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/api/rank")
+async def rank_candidates(payload: RankPayload):
+    """Ranks a pool of resumes against one job posting and streams NDJSON events back (no LLM calls)."""
+    # 1. Resolve the job description once for the whole pool
+    if payload.job_description:
+        raw_jd = payload.job_description
+    elif payload.job_url:
+        raw_jd = await scrape_job_description(payload.job_url)
+        if raw_jd.startswith("Failed to scrape URL"):
+            return error_response(raw_jd, 502)
+    else:
+        return error_response("Provide either job_url or job_description.", 400)
+    clean_jd = clean_text(raw_jd)
+
+    texts = [resume.text for resume in payload.resumes]
+    top_k = max(1, payload.top_k)
+    chunk_size = max(1, payload.chunk_size)
+
+    async def events():
+        # 2. Chunked scoring on the process pool, then missing skills for the top k
+        async for event in rank_resumes(texts, clean_jd, top_k, chunk_size):
+            if event["event"] == "candidate":
+                event = {"event": "candidate", "rank": event["rank"], "id": payload.resumes[event["index"]].id,
+                         "match_score": event["match_score"], "missing_skills": event["missing_skills"]}
+            yield json.dumps(event) + "\n"
+        yield json.dumps({"event": "done", "total": len(texts)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/api/similar/jobs")
+async def similar_jobs_endpoint(payload: SimilarJobsPayload):
+    """Stored job postings closest to this one (TF-IDF/SVD embeddings, cosine similarity)."""
+    if payload.job_description:
+        raw_jd = payload.job_description
+    elif payload.job_url:
+        raw_jd = await scrape_job_description(payload.job_url)
+        if raw_jd.startswith("Failed to scrape URL"):
+            return error_response(raw_jd, 502)
+    else:
+        return error_response("Provide either job_url or job_description.", 400)
+    try:
+        jobs = await similar_jobs(clean_text(raw_jd), payload.top_k)
+    except IndexNotBuiltError as e:
+        return error_response(str(e), 503)
+    return {"status": "success", "jobs": jobs}
+
+@app.post("/api/similar/candidates")
+async def similar_candidates_endpoint(payload: SimilarCandidatesPayload):
+    """Candidates whose interview sessions had the closest skill gaps (one entry per candidate)."""
+    try:
+        candidates = await similar_candidates(payload.missing_skills, payload.top_k, payload.exclude_candidate)
+    except IndexNotBuiltError as e:
+        return error_response(str(e), 503)
+    return {"status": "success", "candidates": candidates}
+
+@app.post("/api/ingest/resumes")
+async def ingest_resumes(files: list[UploadFile] = File(...), store: bool = Form(True), include_text: bool = Form(False)):
+    """Bulk resume ingestion from PDFs and ZIP / tar archives of PDFs (any mix, in one multipart upload).
+
+    Streams NDJSON: a "file" or "failed" event per PDF as soon as it is parsed, "stored" events as the
+    cleaned text is written to the documents table in batches, then a "done" summary.
+    """
+    async def events():
+        # Uploads are spooled to disk by the framework; archive members are read from there a few at a time
+        async for event in ingest(iter_uploads(files), store=store, include_text=include_text):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 @app.get("/api/history/{candidate_name}")
-async def fetch_history(candidate_name: str):
+async def fetch_history(candidate_name: str, limit: int = HISTORY_PAGE_SIZE, cursor: Optional[str] = None):
+    """Session summaries (no resume / JD text), newest first. Pass next_cursor back as cursor for the next page."""
     try:
-        data = get_interview_history(candidate_name)
+        page = await run_blocking(get_interview_history, candidate_name, limit, cursor)
         return {
             "status": "success",
-            "data": data
+            "data": page["items"],
+            "next_cursor": page["next_cursor"]
         }
+    except ValueError as e:
+        return error_response(str(e), 400)
     except Exception as e:
-        return {"status": "error", "message": str(e)}
+        return error_response(str(e))
+
+@app.get("/api/history/{candidate_name}/sessions/{session_id}")
+async def fetch_history_session(candidate_name: str, session_id: str):
+    """One session in full, including the resume and job description text."""
+    try:
+        session = await run_blocking(get_interview_session, candidate_name, session_id)
+        if session is None:
+            return error_response("Interview session not found.", 404)
+        return {
+            "status": "success",
+            "data": session
+        }
+    except ValueError as e:
+        return error_response(str(e), 400)
+    except Exception as e:
+        return error_response(str(e))
 
 @app.post("/api/register")
 async def api_register(username: str = Form(...), password: str = Form(...)):
-    return register_user(username, password)
+    # Hashing runs on the auth process pool; only the insert touches the I/O threads
+    return auth_response(await register_user(username, password))
 
 @app.post("/api/login")
 async def api_login(username: str = Form(...), password: str = Form(...)):
-    return authenticate_user(username, password)
+    return auth_response(await authenticate_user(username, password))
 
 @app.api_route("/api/keepalive", methods=["GET", "HEAD"])
 def keep_alive():
     """Hidden endpoint for UptimeRobot to ping, keeping Render & Supabase awake."""
     try:
-        # 1. THIS IS THE LINE THAT IS MISSING IN THE CLOUD:
+        # 1. Grab the shared pooled client (no new TLS handshake per ping)
         supabase_client = get_db_client() 
         
-        # 2. Now we use the client we just created:
+        # 2. Touch the database so Supabase stays awake:
         supabase_client.table("users").select("*").limit(1).execute()
         
         return {"status": "alive", "database": "awake"}
     except Exception as e:
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+        # 503, so uptime checks and load balancers see the outage
+        return error_response(str(e), 503)
+
+@app.get("/api/ready")
+def ready():
+    """Readiness probe: 200 once the local subsystems are warm, 503 (with what is still cold) while warming up.
+
+    A failing database or Gemini warm-up does not hold readiness back; it shows up under degraded while it is retried.
+    """
+    state = readiness()
+    status = ("degraded" if state["degraded"] else "success") if state["ready"] else "warming"
+    return JSONResponse({"status": status, **state}, status_code=200 if state["ready"] else 503)
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint: request and stage latency histograms, error and external call counters, gauges."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/db/pool")
+def db_pool_stats():
+    """Reports in-use, idle and wait-time statistics for the Supabase connection pool."""
+    return {"status": "success", "pool": get_pool_stats()}
+
+@app.get("/api/db/session-log")
+def session_log_stats():
+    """Reports queue depth, batch sizes, flush latency and spill counters for the write-behind session logger."""
+    return {"status": "success", "session_log": session_logger.stats()}
+
+@app.get("/api/scraper/cache")
+def scraper_cache_stats():
+    """Reports hit / miss / revalidation counters for the job description cache."""
+    return {"status": "success", "cache": jd_cache.stats()}
+
+@app.get("/api/resume/cache")
+def resume_cache_stats():
+    """Reports hit ratio and saved parsing time for the parsed resume cache."""
+    return {"status": "success", "cache": resume_cache.stats()}
+
+@app.get("/api/similar/index")
+def similar_index_stats():
+    """Reports rows per index, appends and average query time for the similarity index."""
+    return {"status": "success", "index": similar_index.stats()}
+
+@app.get("/api/analyze/queue")
+def analyze_queue_stats():
+    """Reports job counts by state and this process's job workers."""
+    return {"status": "success", "queue": job_store.stats(), "workers": job_runner.stats()}
+
+@app.get("/api/ai/cache")
+def ai_cache_stats():
+    """Reports hit ratio and saved LLM latency for the interview question cache."""
+    return {"status": "success", "cache": question_cache.stats()}
+
+@app.get("/api/ai/question-bank")
+def ai_question_bank_stats():
+    """Reports active sessions, bank hit ratio and refill counters for the pre-generated question banks."""
+    return {"status": "success", "bank": question_bank.stats()}
+
+@app.get("/api/ai/gateway")
+def ai_gateway_stats():
+    """Reports in-flight calls, retries, hedges and circuit breaker state for the Gemini gateway."""
+    return {"status": "success", "gateway": gateway.stats()}
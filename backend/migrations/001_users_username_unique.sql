@@ -0,0 +1,6 @@
+-- Registration is a single INSERT that relies on this constraint to reject duplicate usernames
+-- (auth_service.register_user maps Postgres error 23505 to "Username already taken.").
+--
+-- Run once in the Supabase SQL editor. If it fails, list the duplicates first:
+--   SELECT username, COUNT(*) FROM users GROUP BY username HAVING COUNT(*) > 1;
+ALTER TABLE users ADD CONSTRAINT users_username_key UNIQUE (username);
@@ -0,0 +1,4 @@
+-- Serves the history API: WHERE candidate_name = ? ORDER BY created_at DESC, id DESC LIMIT n,
+-- including keyset pages (created_at, id) < (cursor) without scanning earlier rows.
+CREATE INDEX IF NOT EXISTS interviews_candidate_created_id_idx
+    ON interviews (candidate_name, created_at DESC, id DESC);
@@ -0,0 +1,19 @@
+-- Resume and job description text is stored once per distinct content, zlib-compressed and
+-- base64-encoded, keyed by the SHA-256 of the cleaned text (backend/services/document_store.py).
+CREATE TABLE IF NOT EXISTS documents (
+    hash         TEXT PRIMARY KEY,
+    kind         TEXT NOT NULL,             -- 'resume' or 'jd' (the first use of this content)
+    content      TEXT NOT NULL,
+    raw_bytes    INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL,
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS documents_kind_created_idx ON documents (kind, created_at);
+
+ALTER TABLE interviews ADD COLUMN IF NOT EXISTS resume_hash TEXT REFERENCES documents (hash);
+ALTER TABLE interviews ADD COLUMN IF NOT EXISTS jd_hash TEXT REFERENCES documents (hash);
+
+-- Then backfill existing rows:  python -m backend.backfill_documents
+-- Once it reports 0 rows left, the inline copies can go:
+--   python -m backend.backfill_documents --clear-text
+--   ALTER TABLE interviews DROP COLUMN resume_text, DROP COLUMN jd_text;
@@ -0,0 +1,90 @@
+import sys
+import os
+import json
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.database import get_db_client
+from backend.services.document_store import fetch_documents
+from backend.services.similar_index import build_index, SIMILAR_INDEX_PATH, SIMILAR_INDEX_DIMS
+
+PAGE_SIZE = 1000
+# Hashes per documents lookup (they travel in the query string)
+HASH_BATCH = 100
+
+def fetch_sessions(limit: int = None) -> list:
+    """Keyset pages over every interview whose text lives in the documents table, oldest first."""
+    supabase = get_db_client()
+    sessions = []
+    last_id = None
+    while limit is None or len(sessions) < limit:
+        query = (
+            supabase.table("interviews")
+            .select("id, created_at, candidate_name, job_role, match_score, missing_skills, jd_hash")
+            .not_.is_("jd_hash", "null")
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(PAGE_SIZE).execute().data
+        sessions.extend(rows)
+        if len(rows) < PAGE_SIZE:
+            break
+        last_id = rows[-1]["id"]
+    return sessions[:limit] if limit else sessions
+
+def fetch_job_texts(hashes: list) -> dict:
+    """{jd_hash: text} for every distinct hash, a batch of lookups at a time."""
+    texts = {}
+    for start in range(0, len(hashes), HASH_BATCH):
+        texts.update(fetch_documents(hashes[start:start + HASH_BATCH]))
+    return texts
+
+def collect(sessions: list, texts: dict) -> tuple:
+    """The build_index inputs: each distinct posting once (its first session's role and date), every session's gaps."""
+    jobs = {}
+    gaps = []
+    for session in sessions:
+        digest = session["jd_hash"]
+        if digest in texts and digest not in jobs:
+            jobs[digest] = {"jd_hash": digest, "job_role": session["job_role"], "text": texts[digest], "created_at": session["created_at"]}
+        skills = session.get("missing_skills") or []
+        # Older rows may hold the list as a JSON string
+        if isinstance(skills, str):
+            skills = json.loads(skills)
+        gaps.append({
+            "candidate_name": session.get("candidate_name"),
+            "job_role": session["job_role"],
+            "match_score": session.get("match_score"),
+            "missing_skills": skills,
+            "jd_hash": digest,
+            "created_at": session["created_at"],
+        })
+    return list(jobs.values()), gaps
+
+# --- CLI ---
+# Usage (from the repo root): python -m backend.rebuild_similar_index --dims 128
+# Sessions logged while a rebuild runs may miss the new index; rerun it (or schedule it nightly) to catch up.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the similar-jobs / similar-gaps index from stored interviews.")
+    parser.add_argument("--output", default=SIMILAR_INDEX_PATH, help="index directory (replaced atomically)")
+    parser.add_argument("--dims", type=int, default=SIMILAR_INDEX_DIMS, help="SVD embedding dimensions")
+    parser.add_argument("--limit", type=int, default=None, help="only index the oldest N sessions")
+    args = parser.parse_args()
+
+    # Run python -m backend.backfill_documents first on databases that predate the documents table
+    print("1. Fetching interview sessions from Supabase...")
+    sessions = fetch_sessions(args.limit)
+    print(f"   {len(sessions)} sessions")
+
+    print("2. Fetching job description text...")
+    texts = fetch_job_texts(sorted({session["jd_hash"] for session in sessions}))
+    jobs, gaps = collect(sessions, texts)
+    if len(jobs) < 2:
+        sys.exit("Fewer than two job descriptions found; nothing to index.")
+    print(f"   {len(jobs)} distinct job descriptions")
+
+    print("3. Fitting TF-IDF/SVD and embedding...")
+    built = build_index(args.output, jobs, gaps, args.dims)
+
+    print(f"4. Indexed {built['jobs']} jobs and {built['gaps']} skill gaps ({built['dims']} dimensions) in {args.output}")
+    print("Status: Running API processes switch to the new index on their next query.")
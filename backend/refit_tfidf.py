@@ -0,0 +1,49 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.database import get_db_client
+from backend.services.ml_engine import fit_corpus_model, MODEL_PATH
+from backend.services.document_store import decompress_text
+
+PAGE_SIZE = 1000
+
+def fetch_job_descriptions(limit: int = None) -> list:
+    """Pages through the stored job descriptions (each distinct posting once) and returns their text."""
+    supabase = get_db_client()
+    documents = []
+    start = 0
+    while limit is None or len(documents) < limit:
+        response = (
+            supabase.table("documents").select("content").eq("kind", "jd")
+            .order("created_at").range(start, start + PAGE_SIZE - 1).execute()
+        )
+        rows = response.data or []
+        documents.extend(decompress_text(row["content"]) for row in rows if row.get("content"))
+        if len(rows) < PAGE_SIZE:
+            break
+        start += PAGE_SIZE
+    return documents[:limit] if limit else documents
+
+# --- CLI ---
+# Usage (from the repo root): python -m backend.refit_tfidf --min-df 2
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refit the corpus TF-IDF model from stored job descriptions.")
+    parser.add_argument("--output", default=MODEL_PATH, help="where to write the fitted model")
+    parser.add_argument("--min-df", type=int, default=2, help="drop terms seen in fewer than this many JDs")
+    parser.add_argument("--limit", type=int, default=None, help="only use the oldest N job descriptions")
+    args = parser.parse_args()
+
+    # Run python -m backend.backfill_documents first on databases that predate the documents table
+    print("1. Fetching job descriptions from Supabase...")
+    documents = fetch_job_descriptions(args.limit)
+    if not documents:
+        sys.exit("No job descriptions found; nothing to fit.")
+    print(f"   {len(documents)} job descriptions")
+
+    print("2. Fitting TF-IDF vocabulary and IDF weights...")
+    vectorizer = fit_corpus_model(documents, args.output, min_df=min(args.min_df, len(documents)))
+
+    print(f"3. Saved {len(vectorizer.vocabulary_)} terms to {args.output}")
+    print("Status: Restart the API (or its workers) to pick up the new model.")
@@ -1,7 +1,16 @@
+import sys
 import os
-from google import genai
+import time
+import json
+import asyncio
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.workers import run_blocking
+from backend.services.llm_cache import ResponseCache, make_key
+from backend.services.llm_gateway import GeminiGateway, LLMUpstreamError
+from backend.services.question_bank import QuestionBank, parse_questions
+
 # Load the secret keys from the .env file
 load_dotenv()
 
@@ -9,11 +18,37 @@ api_key = os.environ.get("GEMINI_API_KEY")
 if not api_key:
     raise ValueError("CRITICAL ERROR: GEMINI_API_KEY not found in .env")
 
-# Initialize the official SDK client
-client = genai.Client(api_key=api_key)
+# The official SDK client, built on first use (GEMINI_BASE_URL points it at a local fake model for load tests)
+base_url = os.environ.get("GEMINI_BASE_URL")
+client = None
+
+def get_client():
+    """Returns the Gemini SDK client, importing the SDK and creating the client on the first call."""
+    global client
+    if client is None:
+        from google import genai
+        from google.genai import types
+        client = genai.Client(api_key=api_key, http_options=types.HttpOptions(base_url=base_url) if base_url else None)
+    return client
+
+# Using the exact model string we verified on Google's servers
+MODEL_NAME = 'gemini-2.5-flash'
+
+# Identical (role, skill set) prompts come up constantly, so questions are memoized
+question_cache = ResponseCache()
 
-def generate_interview_question(job_role: str, missing_skills: list) -> str:
+# Every Gemini call goes through the gateway (in-flight cap, deadlines, retries, hedging, circuit breaker).
+# Failures surface as LLMError subclasses instead of "AI Error: ..." strings.
+gateway = GeminiGateway(get_client)
+
+async def generate_interview_question(job_role: str, missing_skills: list) -> str:
     """Uses the official Gemini SDK to generate a targeted technical interview question."""
+
+    # 1. Serve a cached question for the same model, role and skill set when we have one
+    cache_key = make_key(MODEL_NAME, job_role, missing_skills)
+    cached = await run_blocking(question_cache.get, cache_key)
+    if cached is not None:
+        return cached
     
     skills_str = ", ".join(missing_skills) if missing_skills else "advanced technical concepts"
     
@@ -26,20 +61,56 @@ def generate_interview_question(job_role: str, missing_skills: list) -> str:
     Do not introduce yourself. Do not say "Hello". Just ask the question directly.
     """
     
-    try:
-        # Using the exact model string we verified on Google's servers
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=prompt,
-        )
-        return response.text.strip()
-    except Exception as e:
-        return f"AI Error: {str(e)}"
-
-def evaluate_candidate_answer(question: str, answer: str) -> str:
-    """Evaluates the candidate's answer to the technical question."""
-    
+    # 2. Ask Gemini through the gateway (raises LLMError on failure, so errors never reach the cache)
+    start = time.perf_counter()
+    question = await gateway.generate(prompt, MODEL_NAME)
+
+    # 3. Only real questions reach the cache
+    await run_blocking(question_cache.put, cache_key, question, time.perf_counter() - start)
+    return question
+
+async def generate_question_batch(job_role: str, missing_skills: list, count: int, avoid: list = ()) -> list:
+    """Generates `count` interview questions covering all the missing skills in ONE Gemini call."""
+
+    # 1. A session's first batch depends only on (role, skills), so it is cached like single questions
+    cache_key = make_key(f"{MODEL_NAME}:batch:{count}", job_role, missing_skills) if not avoid else None
+    if cache_key:
+        cached = await run_blocking(question_cache.get, cache_key)
+        if cached is not None:
+            return json.loads(cached)
+
+    skills_str = ", ".join(missing_skills) if missing_skills else "advanced technical concepts"
+    avoid_str = "\n".join(f"- {question}" for question in avoid)
+
     prompt = f"""
+    You are an expert, strict Technical Recruiter conducting an interview for a {job_role} position.
+    The candidate's resume shows they might be weak or missing experience in the following areas: {skills_str}.
+    
+    Your task:
+    Write exactly {count} highly technical, challenging interview questions, ordered from warm-up to hardest.
+    Spread them across ALL of the areas above so every missing skill is tested at least once.
+    Each question must stand alone. Do not introduce yourself. Do not number them.
+    {f"Do not repeat or rephrase these questions, which were already asked:{chr(10)}{avoid_str}" if avoid else ""}
+    
+    Respond with ONLY a JSON array of {count} strings.
+    """
+
+    # 2. One round trip for the whole batch
+    start = time.perf_counter()
+    questions = parse_questions(await gateway.generate(prompt, MODEL_NAME))[:count]
+    if not questions:
+        raise LLMUpstreamError("Gemini returned no parsable questions.")
+
+    if cache_key:
+        await run_blocking(question_cache.put, cache_key, json.dumps(questions), time.perf_counter() - start)
+    return questions
+
+# Pre-generated questions per interview session, so each turn is served without an LLM round trip
+question_bank = QuestionBank(generate_question_batch)
+
+def build_evaluation_prompt(question: str, answer: str) -> str:
+    """The grading prompt shared by the blocking and streaming evaluators."""
+    return f"""
     You are the expert, strict Technical Recruiter. 
     Earlier, you asked the candidate this question: "{question}"
     
@@ -53,15 +124,18 @@ def evaluate_candidate_answer(question: str, answer: str) -> str:
     
     Do not break character. Speak directly to the candidate.
     """
+
+async def evaluate_candidate_answer(question: str, answer: str) -> str:
+    """Evaluates the candidate's answer to the technical question."""
     
-    try:
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            contents=prompt,
-        )
-        return response.text.strip()
-    except Exception as e:
-        return f"AI Evaluation Error: {str(e)}"
+    prompt = build_evaluation_prompt(question, answer)
+    return await gateway.generate(prompt, MODEL_NAME)
+
+async def stream_candidate_evaluation(question: str, answer: str):
+    """Streams the evaluation as text chunks as soon as Gemini produces them."""
+    prompt = build_evaluation_prompt(question, answer)
+    async for text in gateway.stream(prompt, MODEL_NAME):
+        yield text
 
 # --- TEST BLOCK ---
 if __name__ == "__main__":
@@ -70,7 +144,7 @@ if __name__ == "__main__":
     test_role = "Data Analyst"
     test_missing = ["python pandas", "sql window functions"]
     
-    question = generate_interview_question(test_role, test_missing)
+    question = asyncio.run(generate_interview_question(test_role, test_missing))
     
     print("--- AI GENERATED QUESTION ---")
     print(question)
@@ -0,0 +1,104 @@
+import sys
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.pdf_parser import extract_pages_parallel, MAX_PDF_PAGES
+from backend.services.resume_cache import resume_cache
+from backend.services.data_cleaner import clean_text
+from backend.services.scraper import scrape_job_description
+from backend.services.ml_engine import analyze
+from backend.services.db_service import session_logger
+from backend.services.ai_service import question_bank, generate_interview_question
+from backend.services.workers import run_blocking, run_cpu_bound
+from backend.services.telemetry import stage
+
+# The analyze pipeline once the upload has been read, in order (what job progress is reported against)
+ANALYSIS_STAGES = ("pdf_extract", "scrape", "clean_text", "ml_analyze", "session_log_enqueue", "question")
+
+async def _no_progress(stage_name: str, state: str):
+    pass
+
+async def run_analysis(resume_bytes: bytes, job_url: str, job_role: str, candidate_name: str,
+                       progress=None, interview_session: bool = True) -> dict:
+    """Runs the analyze pipeline for an uploaded resume and returns the /api/analyze success payload.
+
+    progress(stage, state) is awaited as each stage starts ("running") and finishes ("done").
+    interview_session=False returns one question without a question bank session (session_id None),
+    for processes whose banks the API cannot serve follow-up questions from.
+    """
+    progress = progress or _no_progress
+
+    @asynccontextmanager
+    async def tracked(name: str):
+        await progress(name, "running")
+        with stage(name):
+            yield
+        await progress(name, "done")
+
+    async def tracked_call(name: str, awaitable):
+        async with tracked(name):
+            return await awaitable
+
+    async def extract_resume():
+        # A re-uploaded PDF (same bytes) is served from the parsed resume cache: no extraction, no cleaning
+        key, cached = await run_blocking(resume_cache.lookup, resume_bytes)
+        if cached is not None:
+            if cached["pages"] > MAX_PDF_PAGES:
+                raise ValueError(f"Resume PDF has {cached['pages']} pages; the limit is {MAX_PDF_PAGES}.")
+            return key, cached["text"], None, 0.0
+        start = time.perf_counter()
+        pages = await extract_pages_parallel(resume_bytes)
+        return key, None, pages, time.perf_counter() - start
+
+    # 1. Parse the resume (page-parallel on the process pool) and scrape the job description at the same time
+    (resume_key, clean_resume, pages, parse_seconds), raw_jd = await asyncio.gather(
+        tracked_call("pdf_extract", extract_resume()),
+        tracked_call("scrape", scrape_job_description(job_url)),
+    )
+    async with tracked("clean_text"):
+        if clean_resume is None:
+            start = time.perf_counter()
+            clean_resume = clean_text("".join(pages))
+            parse_seconds += time.perf_counter() - start
+        clean_jd = clean_text(raw_jd)
+    # Only parses with text are kept (bulk ingestion shares the cache and rejects empty documents)
+    if pages is not None and clean_resume:
+        await run_blocking(resume_cache.put, resume_key, clean_resume, len(pages), parse_seconds)
+
+    # 2. Math Engine Analysis (one tokenization pass for both the score and the missing skills)
+    async with tracked("ml_analyze"):
+        analysis = await run_cpu_bound(analyze, clean_resume, clean_jd)
+    match_score, missing_skills = analysis["match_score"], analysis["missing_skills"]
+
+    # 3. Database Memory Injection is write-behind: queued here, batched into Supabase in the background
+    async with tracked("session_log_enqueue"):
+        await session_logger.enqueue({
+            "job_role": job_role,
+            "match_score": match_score,
+            "missing_skills": missing_skills,
+            "resume_text": clean_resume,
+            "jd_text": clean_jd,
+            "candidate_name": candidate_name,
+        })
+
+    # 4. AI Brain Question Generation: the session's question bank is filled with one batch covering
+    # every missing skill; later turns are served from it by /api/session/{id}/next-question.
+    async with tracked("question"):
+        if interview_session:
+            session_id = question_bank.create(job_role, missing_skills)
+            question, remaining = await question_bank.next_question(session_id)
+        else:
+            session_id, remaining = None, 0
+            question = await generate_interview_question(job_role, missing_skills)
+
+    return {
+        "status": "success",
+        "match_score": match_score,
+        "missing_skills": missing_skills,
+        "interview_question": question,
+        "session_id": session_id,
+        "questions_remaining": remaining
+    }
@@ -0,0 +1,370 @@
+import sys
+import os
+import json
+import time
+import uuid
+import random
+import socket
+import sqlite3
+import asyncio
+import logging
+import threading
+import functools
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.analysis import run_analysis, ANALYSIS_STAGES
+from backend.services.llm_gateway import LLMError
+from backend.services.workers import run_blocking
+
+# The queue is a SQLite file, so every API worker and every `python -m backend.analyze_worker` process on
+# the host shares it. Set ANALYZE_JOBS_PATH="" for a private in-memory queue (single process only).
+ANALYZE_JOBS_PATH = os.environ.get("ANALYZE_JOBS_PATH", "analyze_jobs.sqlite3")
+# Job workers inside each API process (0 = the API only queues; standalone workers run the jobs)
+ANALYZE_WORKERS = int(os.environ.get("ANALYZE_WORKERS", "2"))
+# Submissions beyond this many waiting jobs are shed with a retryable 503
+ANALYZE_MAX_QUEUED = int(os.environ.get("ANALYZE_MAX_QUEUED", "200"))
+# A running job whose worker stops renewing its lease (every third of it) for this long goes to another worker
+ANALYZE_JOB_LEASE = float(os.environ.get("ANALYZE_JOB_LEASE", "120"))
+ANALYZE_JOB_MAX_ATTEMPTS = int(os.environ.get("ANALYZE_JOB_MAX_ATTEMPTS", "2"))
+# Finished jobs (and their results) are kept this long for polling clients
+ANALYZE_JOB_TTL = float(os.environ.get("ANALYZE_JOB_TTL", "3600"))
+# How often idle workers look for jobs submitted by other processes (same-process submits wake them at once)
+ANALYZE_JOB_POLL = float(os.environ.get("ANALYZE_JOB_POLL", "0.5"))
+# Longest pause a worker takes after the job store fails (e.g. "database is locked") before trying again
+ANALYZE_JOB_BACKOFF_CAP = float(os.environ.get("ANALYZE_JOB_BACKOFF_CAP", "30"))
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFullError(RuntimeError):
+    """Raised when ANALYZE_MAX_QUEUED jobs are already waiting; the caller should retry later."""
+
+class JobLeaseLostError(RuntimeError):
+    """Raised inside a running job once its lease has gone to another worker; this worker drops the job."""
+
+class AnalyzeJobStore:
+    """SQLite-backed queue of analyze jobs with per-stage progress, leases and expiring results."""
+
+    def __init__(self, path: str = ANALYZE_JOBS_PATH, max_queued: int = ANALYZE_MAX_QUEUED, lease: float = ANALYZE_JOB_LEASE,
+                 max_attempts: int = ANALYZE_JOB_MAX_ATTEMPTS, ttl: float = ANALYZE_JOB_TTL):
+        self.path = path or ":memory:"
+        self.max_queued = max_queued
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = None
+        self.counters = {"submitted": 0, "rejected": 0, "claimed": 0, "reclaimed": 0, "succeeded": 0, "failed": 0, "expired": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use, so importing the module never creates the file
+        if self._db is None:
+            # Autocommit; claims take the write lock explicitly with BEGIN IMMEDIATE
+            self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS analyze_jobs ("
+                " id TEXT PRIMARY KEY, state TEXT NOT NULL, created_at REAL NOT NULL, started_at REAL, finished_at REAL,"
+                " lease_until REAL, worker TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+                " request TEXT NOT NULL, resume BLOB, stages TEXT NOT NULL, result TEXT, error TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS analyze_jobs_state ON analyze_jobs (state, created_at)")
+        return self._db
+
+    def submit(self, request: dict, resume: bytes, stages: tuple = ANALYSIS_STAGES) -> str:
+        """Queues a job (request holds the pipeline's keyword arguments) and returns its ID."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            # 1. Drop finished jobs nobody polled for, then apply backpressure
+            db.execute("DELETE FROM analyze_jobs WHERE state IN ('succeeded', 'failed') AND finished_at < ?", (now - self.ttl,))
+            queued = db.execute("SELECT COUNT(*) FROM analyze_jobs WHERE state = 'queued'").fetchone()[0]
+            if queued >= self.max_queued:
+                self.counters["rejected"] += 1
+                raise JobQueueFullError(f"{queued} analyses are already waiting; try again shortly.")
+            # 2. Every stage starts out pending, so pollers see the whole pipeline from the first response
+            db.execute(
+                "INSERT INTO analyze_jobs (id, state, created_at, request, resume, stages) VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, now, json.dumps(request), resume, json.dumps({name: {"state": "pending"} for name in stages})),
+            )
+            self.counters["submitted"] += 1
+        return job_id
+
+    def claim(self, worker: str):
+        """Takes the oldest queued job (or a running one whose lease ran out) for `worker`; None when idle."""
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            # Idle polls only read, so they never hold up submits and progress updates waiting on the write lock
+            if db.execute("SELECT 1 FROM analyze_jobs WHERE state = 'queued' OR (state = 'running' AND lease_until < ?) LIMIT 1",
+                          (now,)).fetchone() is None:
+                return None
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # 1. Jobs whose worker died too many times are failed rather than retried forever
+                expired = db.execute(
+                    "UPDATE analyze_jobs SET state = 'failed', finished_at = ?, resume = NULL, lease_until = NULL, error = ?"
+                    " WHERE state = 'running' AND lease_until < ? AND attempts >= ?",
+                    (now, json.dumps({"message": "The analysis worker stopped responding."}), now, self.max_attempts),
+                ).rowcount
+                # 2. Oldest first, in a single statement so two workers can never take the same job
+                row = db.execute(
+                    "UPDATE analyze_jobs SET state = 'running', worker = ?, attempts = attempts + 1,"
+                    " started_at = COALESCE(started_at, ?), lease_until = ?"
+                    " WHERE id = (SELECT id FROM analyze_jobs WHERE state = 'queued' OR (state = 'running' AND lease_until < ?)"
+                    "             ORDER BY created_at LIMIT 1)"
+                    " RETURNING id, request, resume, attempts",
+                    (worker, now, now + self.lease, now),
+                ).fetchone()
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            self.counters["expired"] += expired
+            if row is None:
+                return None
+            self.counters["claimed"] += 1
+            if row[3] > 1:
+                self.counters["reclaimed"] += 1
+        return {"id": row[0], "request": json.loads(row[1]), "resume": row[2], "attempt": row[3]}
+
+    def update_stages(self, job_id: str, worker: str, stages: dict) -> bool:
+        """Records progress and renews the lease. False if the job was meanwhile handed to another worker."""
+        with self._lock:
+            updated = self._connect().execute(
+                "UPDATE analyze_jobs SET stages = ?, lease_until = ? WHERE id = ? AND worker = ? AND state = 'running'",
+                (json.dumps(stages), time.time() + self.lease, job_id, worker),
+            ).rowcount
+        return bool(updated)
+
+    def finish(self, job_id: str, worker: str, stages: dict, result: dict = None, error: dict = None):
+        """Stores the final result (or error) and drops the uploaded resume."""
+        state = "failed" if error is not None else "succeeded"
+        with self._lock:
+            updated = self._connect().execute(
+                "UPDATE analyze_jobs SET state = ?, finished_at = ?, lease_until = NULL, resume = NULL, stages = ?, result = ?, error = ?"
+                " WHERE id = ? AND worker = ? AND state = 'running'",
+                (state, time.time(), json.dumps(stages), json.dumps(result) if result is not None else None,
+                 json.dumps(error) if error is not None else None, job_id, worker),
+            ).rowcount
+            if updated:
+                self.counters[state] += 1
+
+    def release(self, job_id: str, worker: str):
+        """Puts an interrupted job back at the front of the queue without counting the attempt (worker shutdown)."""
+        with self._lock:
+            self._connect().execute(
+                "UPDATE analyze_jobs SET state = 'queued', worker = NULL, lease_until = NULL, attempts = attempts - 1"
+                " WHERE id = ? AND worker = ? AND state = 'running'",
+                (job_id, worker),
+            )
+
+    def get(self, job_id: str):
+        """The job's public view: state, ordered stages, progress, queue position and result or error; None if unknown."""
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                "SELECT id, state, created_at, started_at, finished_at, attempts, stages, result, error FROM analyze_jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            position = None
+            if row[1] == "queued":
+                position = db.execute("SELECT COUNT(*) FROM analyze_jobs WHERE state = 'queued' AND created_at < ?", (row[2],)).fetchone()[0]
+        stages = [{"name": name, **status} for name, status in json.loads(row[6]).items()]
+        done = sum(status["state"] == "done" for status in stages)
+        return {
+            "id": row[0],
+            "state": row[1],
+            "created_at": row[2],
+            "started_at": row[3],
+            "finished_at": row[4],
+            "attempts": row[5],
+            "queue_position": position,
+            "progress": round(done / len(stages), 3) if stages else 0.0,
+            "stages": stages,
+            "result": json.loads(row[7]) if row[7] else None,
+            "error": json.loads(row[8]) if row[8] else None,
+        }
+
+    def depth(self) -> dict:
+        """Job counts by state."""
+        with self._lock:
+            rows = self._connect().execute("SELECT state, COUNT(*) FROM analyze_jobs GROUP BY state").fetchall()
+        return {"queued": 0, "running": 0, "succeeded": 0, "failed": 0, **dict(rows)}
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, "jobs": self.depth(), "path": self.path, "max_queued": self.max_queued}
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+def error_payload(error: Exception) -> dict:
+    """What a failed job reports: the LLM error's code and retryability when there is one."""
+    if isinstance(error, LLMError):
+        return {**error.to_dict(), "http_status": error.http_status}
+    return {"message": str(error), "http_status": 500}
+
+class AnalyzeJobRunner:
+    """Asyncio workers that claim jobs from the store and run the analyze pipeline, reporting stage progress."""
+
+    def __init__(self, store: AnalyzeJobStore, pipeline=run_analysis, workers: int = ANALYZE_WORKERS,
+                 poll_interval: float = ANALYZE_JOB_POLL, name: str = None, backoff_cap: float = ANALYZE_JOB_BACKOFF_CAP):
+        self.store = store
+        self.pipeline = pipeline
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.backoff_cap = backoff_cap
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = []
+        self._wakeup = None
+        self._busy = 0
+        self.counters = {"succeeded": 0, "failed": 0, "released": 0, "lease_lost": 0, "store_errors": 0}
+
+    def start(self):
+        """Starts the worker tasks on the running loop (a no-op with 0 workers)."""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._work(f"{self.name}/{i}")) for i in range(self.workers)]
+
+    def notify(self):
+        """Wakes an idle worker in this process right away (jobs from other processes are found by polling)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _work(self, worker: str):
+        failures = 0
+        while True:
+            try:
+                await self._step(worker)
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # A store error must not end the worker task: back off (full jitter) and go on
+                failures += 1
+                self.counters["store_errors"] += 1
+                delay = random.uniform(0, min(self.backoff_cap, self.poll_interval * (2 ** min(failures, 16))))
+                logger.exception("Analyze worker %s failed; retrying in %.1fs", worker, delay)
+                await asyncio.sleep(delay)
+
+    async def _step(self, worker: str):
+        """Claims and runs one job, or waits for the next poll when there is none."""
+        claim = asyncio.ensure_future(run_blocking(self.store.claim, worker))
+        try:
+            job = await asyncio.shield(claim)
+        except asyncio.CancelledError:
+            # The claim finishes on its thread regardless; hand back whatever it took
+            job = await claim
+            if job is not None:
+                await run_blocking(self.store.release, job["id"], worker)
+            raise
+        if job is None:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            return
+        await self._run(worker, job)
+
+    async def _renew(self, job_id: str, worker: str, stages: dict):
+        """Records progress and renews the lease; raises JobLeaseLostError once another worker owns the job."""
+        try:
+            renewed = await run_blocking(self.store.update_stages, job_id, worker, stages)
+        except sqlite3.Error as e:
+            # Progress is best effort: the next stage or heartbeat tries again well before the lease runs out
+            logger.warning("Could not record progress of analyze job %s: %s", job_id, e)
+            return
+        if not renewed:
+            raise JobLeaseLostError(f"Analyze job {job_id} was handed to another worker.")
+
+    async def _run(self, worker: str, job: dict):
+        stages = {name: {"state": "pending"} for name in ANALYSIS_STAGES}
+        started = {}
+        lost, stalled = False, None
+        self._busy += 1
+
+        async def progress(name: str, state: str):
+            if state == "running":
+                started[name] = time.perf_counter()
+                stages[name] = {"state": "running"}
+            else:
+                stages[name] = {"state": "done", "seconds": round(time.perf_counter() - started[name], 3)}
+            await self._renew(job["id"], worker, stages)
+
+        async def heartbeat():
+            # Keeps the lease alive through long stages (a slow Gemini call), not just at stage boundaries
+            nonlocal lost, stalled
+            while True:
+                await asyncio.sleep(self.store.lease / 3)
+                try:
+                    await self._renew(job["id"], worker, stages)
+                except JobLeaseLostError:
+                    lost = True
+                    work.cancel()
+                    return
+                except Exception as e:
+                    # Without a heartbeat the lease would run out mid-job; hand the job back now instead
+                    logger.warning("Heartbeat of analyze job %s failed; releasing it", job["id"])
+                    stalled = e
+                    work.cancel()
+                    return
+
+        work = asyncio.ensure_future(self.pipeline(job["resume"], progress=progress, **job["request"]))
+        beating = asyncio.get_running_loop().create_task(heartbeat())
+        try:
+            result, error = None, None
+            try:
+                result = await work
+            except JobLeaseLostError:
+                lost = True
+            except asyncio.CancelledError:
+                if not lost:
+                    # Shutting down or the heartbeat broke: another worker (or this one later) picks the job up again
+                    await asyncio.shield(run_blocking(self.store.release, job["id"], worker))
+                    self.counters["released"] += 1
+                    if stalled is None:
+                        raise
+                    # The worker loop logs the error and backs off before claiming again
+                    raise stalled from None
+            except Exception as e:
+                for name, status in stages.items():
+                    if status["state"] == "running":
+                        stages[name] = {"state": "failed", "seconds": round(time.perf_counter() - started[name], 3)}
+                error = error_payload(e)
+            if lost:
+                # Its new owner runs it and records the outcome
+                self.counters["lease_lost"] += 1
+                logger.warning("Analyze job %s was handed to another worker; %s dropped it", job["id"], worker)
+                return
+            await run_blocking(self.store.finish, job["id"], worker, stages, result=result, error=error)
+            self.counters["failed" if error is not None else "succeeded"] += 1
+        finally:
+            beating.cancel()
+            self._busy -= 1
+
+    async def close(self):
+        """Stops the workers; jobs they were running go back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {**self.counters, "workers": len(self._tasks), "busy": self._busy, "name": self.name}
+
+job_store = AnalyzeJobStore()
+# Any API process or standalone worker may claim a job, and question banks only live in the process that built
+# them, so /api/session/{id}/next-question on another uvicorn worker would 404: jobs return the first question
+# without a session, exactly as in python -m backend.analyze_worker
+job_runner = AnalyzeJobRunner(job_store, functools.partial(run_analysis, interview_session=False))
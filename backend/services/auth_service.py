@@ -1,54 +1,75 @@
 import sys
 import os
-from passlib.context import CryptContext
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.database import get_db_client
+from backend.services.workers import run_blocking, run_auth_bound, PoolBusyError
 
-# Define the encryption algorithm
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Built on first use: the hashing only ever runs in auth pool processes, never in the API process
+_pwd_context = None
 
-def register_user(username: str, password: str):
+# Postgres error code for a unique constraint violation (users.username is UNIQUE, see backend/migrations)
+UNIQUE_VIOLATION = "23505"
+
+def get_pwd_context():
+    """Returns the bcrypt CryptContext (the encryption algorithm), creating it on first use in this process."""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+def hash_password(password: str) -> str:
+    """Bcrypt hash (runs in an auth pool process; bcrypt only reads the first 72 bytes)."""
+    return get_pwd_context().hash(password[:72])
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Bcrypt check (runs in an auth pool process)."""
+    return get_pwd_context().verify(password[:72], password_hash)
+
+def insert_user(username: str, password_hash: str):
+    supabase = get_db_client()
+    return supabase.table("users").insert({"username": username, "password_hash": password_hash}).execute()
+
+def fetch_password_hash(username: str):
+    """Returns the stored hash for username, or None. Only the one column we need crosses the wire."""
+    supabase = get_db_client()
+    response = supabase.table("users").select("password_hash").eq("username", username).limit(1).execute()
+    return response.data[0]["password_hash"] if response.data else None
+
+async def register_user(username: str, password: str):
     """Hashes the password and creates a new user in Supabase."""
+    from postgrest.exceptions import APIError # Already loaded by the Supabase client that raises it
     try:
-        supabase = get_db_client()
-        
-        # 1. Check if user already exists
-        existing = supabase.table("users").select("*").eq("username", username).execute()
-        if existing.data:
-            return {"status": "error", "message": "Username already taken."}
-        
-        # 2. Enforce bcrypt's 72-byte limit
-        safe_password = password[:72]
-        
-        # 3. Hash the password
-        hashed_pw = pwd_context.hash(safe_password)
-        
-        # 4. Save to database
-        supabase.table("users").insert({"username": username, "password_hash": hashed_pw}).execute()
+        # 1. Hash the password on the auth process pool (never on the event loop)
+        hashed_pw = await run_auth_bound(hash_password, password)
+
+        # 2. One insert; the unique constraint on username decides races between concurrent sign-ups
+        await run_blocking(insert_user, username, hashed_pw)
         return {"status": "success", "message": "Registration successful."}
+    except APIError as e:
+        if e.code == UNIQUE_VIOLATION:
+            return {"status": "error", "message": "Username already taken."}
+        return {"status": "error", "message": str(e)}
+    except PoolBusyError as e:
+        return {"status": "error", "message": str(e), "retryable": True}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-def authenticate_user(username: str, password: str):
+async def authenticate_user(username: str, password: str):
     """Verifies the plain-text password against the hashed password in the database."""
     try:
-        supabase = get_db_client()
-        
-        # 1. Find the user
-        response = supabase.table("users").select("*").eq("username", username).execute()
-        if not response.data:
+        # 1. Find the user's hash
+        password_hash = await run_blocking(fetch_password_hash, username)
+        if password_hash is None:
             return {"status": "error", "message": "User not found."}
-        
-        user = response.data[0]
-        
-        # 2. Enforce bcrypt's 72-byte limit
-        safe_password = password[:72]
-        
-        # 3. Verify the mathematical hash
-        if pwd_context.verify(safe_password, user["password_hash"]):
+
+        # 2. Verify the mathematical hash on the auth process pool
+        if await run_auth_bound(verify_password, password, password_hash):
             return {"status": "success", "message": "Authentication successful."}
         else:
             return {"status": "error", "message": "Incorrect password."}
+    except PoolBusyError as e:
+        return {"status": "error", "message": str(e), "retryable": True}
     except Exception as e:
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,200 @@
+import sys
+import os
+import time
+import asyncio
+import tarfile
+import zipfile
+from contextlib import nullcontext
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.pdf_parser import extract_clean_text, MAX_PDF_BYTES, MAX_PDF_PAGES
+from backend.services.document_store import store_document_batch, content_hash
+from backend.services.resume_cache import resume_cache
+from backend.services.workers import run_blocking, run_cpu_bound, CPU_WORKERS
+
+# PDFs being parsed at once (read ahead of the pool by at most this many, so memory stays flat for any archive size)
+BULK_MAX_IN_FLIGHT = int(os.environ.get("BULK_MAX_IN_FLIGHT", str(CPU_WORKERS * 2)))
+# Files accepted per request, across every uploaded PDF and archive member
+BULK_MAX_FILES = int(os.environ.get("BULK_MAX_FILES", "2000"))
+# Extracted resumes are written to the documents table in batches of this many
+BULK_STORE_BATCH = int(os.environ.get("BULK_STORE_BATCH", "50"))
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+def _ignored(name: str) -> bool:
+    """Folders and OS droppings (macOS resource forks, Finder metadata) that archives carry along."""
+    base = os.path.basename(name)
+    return name.startswith("__MACOSX/") or base.startswith("._") or base in ("", ".DS_Store", "Thumbs.db")
+
+def _read_member(name: str, declared_size: int, opener, max_bytes: int):
+    """Reads one archive member, never more than max_bytes + 1 bytes (declared sizes can lie)."""
+    if not name.lower().endswith(".pdf"):
+        return ValueError("Not a PDF.")
+    if declared_size > max_bytes:
+        return ValueError(f"Larger than the {max_bytes // (1024 * 1024)} MB limit.")
+    with opener() as f:
+        data = f.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        return ValueError(f"Larger than the {max_bytes // (1024 * 1024)} MB limit.")
+    return data
+
+def iter_upload(filename: str, fileobj, max_bytes: int = MAX_PDF_BYTES):
+    """Yields (name, pdf bytes or ValueError) for an uploaded PDF, or for every file inside a ZIP / tar upload.
+
+    Members are read one at a time from the (disk-spooled) upload, so only the PDFs currently in flight
+    are ever held in memory.
+    """
+    lower = filename.lower()
+    if lower.endswith(".zip"):
+        # ZIP needs random access to its central directory; the spooled upload is seekable
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or _ignored(info.filename):
+                    continue
+                member = f"{filename}/{info.filename}"
+                yield member, _read_member(info.filename, info.file_size, lambda: archive.open(info), max_bytes)
+    elif lower.endswith(TAR_SUFFIXES):
+        # Stream mode ("r|*"): a single forward pass, compressed or not
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for info in archive:
+                if not info.isfile() or _ignored(info.name):
+                    continue
+                member = f"{filename}/{info.name}"
+                yield member, _read_member(info.name, info.size, lambda: archive.extractfile(info), max_bytes)
+    else:
+        # The framework owns (and closes) the upload itself
+        yield filename, _read_member(filename, 0, lambda: nullcontext(fileobj), max_bytes)
+
+async def iter_uploads(uploads: list, max_bytes: int = MAX_PDF_BYTES):
+    """Async (name, bytes or error) over every file of every upload; archive reads run on the I/O pool."""
+    for upload in uploads:
+        members = iter_upload(upload.filename or "upload.pdf", upload.file, max_bytes)
+        while True:
+            try:
+                item = await run_blocking(next, members, None)
+            except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+                yield upload.filename, ValueError(f"Unreadable archive: {e}")
+                break
+            if item is None:
+                break
+            yield item
+
+async def _extract(name: str, data: bytes, max_pages: int) -> dict:
+    start = time.perf_counter()
+    try:
+        # Resumes already parsed by /api/analyze or an earlier ingest come from the parsed resume cache
+        key, extracted = await run_blocking(resume_cache.lookup, data)
+        if extracted is None:
+            extracted = await run_cpu_bound(extract_clean_text, data, max_pages)
+            await run_blocking(resume_cache.put, key, extracted["text"], extracted["pages"], time.perf_counter() - start)
+        elif extracted["pages"] > max_pages:
+            raise ValueError(f"PDF has {extracted['pages']} pages; the limit is {max_pages}.")
+    except Exception as e:
+        return {"event": "failed", "file": name, "error": str(e)}
+    text = extracted["text"]
+    return {
+        "event": "file",
+        "file": name,
+        "pages": extracted["pages"],
+        "words": text.count(" ") + 1,
+        "hash": content_hash(text),
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+        "text": text,
+    }
+
+async def ingest(files, store: bool = True, include_text: bool = False, max_in_flight: int = None,
+                 max_files: int = BULK_MAX_FILES, max_pages: int = MAX_PDF_PAGES, store_batch: int = BULK_STORE_BATCH):
+    """Extracts and cleans every PDF from `files` (async (name, bytes or error) pairs) on the CPU pool and yields
+    one event per file as it completes, then a summary.
+
+    Events: {"event": "file", file, pages, words, hash[, text]}, {"event": "failed", file, error},
+    {"event": "stored", count} / {"event": "store_failed", files, error} per documents batch, and a final
+    {"event": "done", ...} with the totals.
+    """
+    max_in_flight = max_in_flight or BULK_MAX_IN_FLIGHT
+    start = time.perf_counter()
+    totals = {"files": 0, "succeeded": 0, "failed": 0, "stored": 0, "pages": 0}
+    pending = set()
+    unstored = []
+
+    def finished(result: dict) -> dict:
+        if result["event"] == "file":
+            totals["succeeded"] += 1
+            totals["pages"] += result["pages"]
+            if store:
+                unstored.append(result)
+            if not include_text:
+                result = {key: value for key, value in result.items() if key != "text"}
+        else:
+            totals["failed"] += 1
+        return result
+
+    async def flush():
+        # One documents round trip per batch; content hashing makes re-ingesting a cohort free
+        batch = unstored[:]
+        unstored.clear()
+        try:
+            await run_blocking(store_document_batch, [("resume", result["text"]) for result in batch])
+        except Exception as e:
+            return {"event": "store_failed", "files": [result["file"] for result in batch], "error": str(e)}
+        totals["stored"] += len(batch)
+        return {"event": "stored", "count": len(batch)}
+
+    try:
+        # 1. Read ahead of the pool by at most max_in_flight files, reporting each one as soon as it is done
+        async for name, data in files:
+            if totals["files"] >= max_files:
+                yield {"event": "error", "error": f"More than {max_files} files; the rest were not processed."}
+                break
+            totals["files"] += 1
+            if isinstance(data, Exception):
+                totals["failed"] += 1
+                yield {"event": "failed", "file": name, "error": str(data)}
+                continue
+            pending.add(asyncio.ensure_future(_extract(name, data, max_pages)))
+            done = {task for task in pending if task.done()}
+            if len(pending) >= max_in_flight:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending -= done
+            for task in done:
+                yield finished(task.result())
+            if len(unstored) >= store_batch:
+                yield await flush()
+
+        # 2. Drain what is still in the pool
+        for next_done in asyncio.as_completed(pending):
+            yield finished(await next_done)
+            if len(unstored) >= store_batch:
+                yield await flush()
+    finally:
+        # A client that disconnects mid-stream leaves nothing queued behind it
+        for task in pending:
+            task.cancel()
+    if unstored:
+        yield await flush()
+
+    elapsed = time.perf_counter() - start
+    yield {"event": "done", **totals, "seconds": round(elapsed, 3),
+           "files_per_s": round(totals["files"] / elapsed, 1) if elapsed else 0.0}
+
+# --- CLI ---
+# Usage (from the repo root): python -m backend.services.bulk_ingest resumes.zip --no-store
+if __name__ == "__main__":
+    import json
+    import argparse
+    parser = argparse.ArgumentParser(description="Extract (and store) every resume PDF in PDFs / ZIP / tar archives.")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--no-store", action="store_true", help="only extract, do not write to the documents table")
+    args = parser.parse_args()
+
+    async def main():
+        async def files():
+            for path in args.paths:
+                with open(path, "rb") as f:
+                    for item in iter_upload(os.path.basename(path), f):
+                        yield item
+
+        async for event in ingest(files(), store=not args.no_store):
+            print(json.dumps(event))
+
+    asyncio.run(main())
@@ -1,43 +1,80 @@
-import pandas as pd
-import re
+import numpy as np
 import sys
 import os
 
 #Ensure Python can find our parser
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from services.pdf_parser import extract_text_from_pdf
+from backend.services.workers import get_cpu_pool
+
+# Documents per process pool task in clean_texts(parallel=True)
+CLEAN_CHUNK_SIZE = int(os.environ.get("CLEAN_CHUNK_SIZE", "2000"))
+
+# One byte -> byte table does the whole character pass: A-Z are lowercased, letters / digits / . , +
+# survive, everything else (symbols, bullets, control and whitespace bytes) becomes a space.
+_KEEP = b"abcdefghijklmnopqrstuvwxyz0123456789.,+"
+_CLEAN_TABLE = bytes(c + 32 if 65 <= c <= 90 else c if c in _KEEP else 32 for c in range(256))
+
+def _clean_words(raw_text: str) -> list:
+    """The cleaned text's words, as bytes."""
+    # Non-ASCII text is lowercased first (a few symbols lowercase to ASCII letters, e.g. the Kelvin sign);
+    # whatever is still non-ASCII becomes '?' and then a space, exactly like the old [^a-z0-9\s.,+] pass
+    if not raw_text.isascii():
+        raw_text = raw_text.lower()
+    return raw_text.encode("ascii", "replace").translate(_CLEAN_TABLE).split()
 
 def clean_text(raw_text: str) -> str:
     """Removes unnecessary whitespace, special characters, and normalizes text."""
     if not raw_text:
         return ""
-    
-    # 1. Convert everything to lowercase so "Python" and "PYTHON" match
-    text = raw_text.lower()
 
-    # 2. Regex: Remove weird bullet points and symbols, keep letters/numbers/basic punctuation
-    text = re.sub(r'[^a-z0-9\s\.\,\+]', ' ', text)
+    # Lowercase, keep letters/numbers/basic punctuation, collapse whitespace: one translate and one split
+    return b" ".join(_clean_words(raw_text)).decode("ascii")
 
-    # 3. Regex: Replace multiple spaces and line breaks with a single space
-    text = re.sub(r'\s+', ' ', text).strip()
+def _clean_chunk(documents: list) -> tuple:
+    """Cleans one chunk (module-level so the process pool can pickle it). Returns (texts, int32 word counts)."""
+    cleaned = []
+    word_counts = np.zeros(len(documents), dtype=np.int32)
+    for i, raw_text in enumerate(documents):
+        # None / NaN (missing rows in a Series) clean to ""
+        words = _clean_words(raw_text) if isinstance(raw_text, str) and raw_text else []
+        cleaned.append(b" ".join(words).decode("ascii"))
+        word_counts[i] = len(words)
+    return cleaned, word_counts
 
-    return text
+def clean_texts(documents, parallel: bool = False, chunk_size: int = CLEAN_CHUNK_SIZE) -> "pd.DataFrame":
+    """Bulk clean_text for reprocessing jobs: an iterable or Series in, a cleaned_content / word_count frame out.
 
-def structure_resume_data(raw_text: str) -> pd.DataFrame:
-    """Cleans raw text and structures it into a Pandas DataFrame."""
-    cleaned_text = clean_text(raw_text)
+    A Series keeps its index. With parallel=True, chunks of chunk_size documents are spread over the
+    shared CPU process pool (call workers.shutdown_pools() when a script is done with it).
+    """
+    # pandas is only needed by the bulk / reporting paths, so the API does not pay its import at startup
+    import pandas as pd
+    index = documents.index if isinstance(documents, pd.Series) else None
+    documents = list(documents)
+    chunks = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
 
+    if parallel and len(chunks) > 1:
+        results = list(get_cpu_pool().map(_clean_chunk, chunks))
+    else:
+        results = [_clean_chunk(chunk) for chunk in chunks]
+
+    return pd.DataFrame({
+        "cleaned_content": [text for texts, _ in results for text in texts],
+        "word_count": np.concatenate([counts for _, counts in results]) if results else np.zeros(0, dtype=np.int32),
+    }, index=index)
+
+def structure_resume_data(raw_text: str) -> "pd.DataFrame":
+    """Cleans raw text and structures it into a Pandas DataFrame."""
     #Pack the cleaned data into a Pandas DataFrame for easy analysis later 
-    df = pd.DataFrame({
-        "document_type": ["resume"],
-        "cleaned_content": [cleaned_text],
-        "word_count": [len(cleaned_text.split())]
-    })
+    df = clean_texts([raw_text])
+    df.insert(0, "document_type", "resume")
 
     return df
 
 # ---TEST BLOCK---
 if __name__ == "__main__":
+    from services.pdf_parser import extract_text_from_pdf
+
     print("1. Extracting raw text using Parser.")
     
     #Go up to two levels to find the test_resume.pdf in the root folder.
@@ -1,32 +1,201 @@
 import sys
 import os
+import re
+import json
+import time
+import base64
+import threading
+from collections import OrderedDict
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backend.database import get_db_client
+from backend.services.document_store import store_document_batch, fetch_documents
+from backend.services.session_logger import SessionLogger
+from backend.services.similar_index import similar_index, index_sessions
+
+# Only what the history table shows; resume_text / jd_text are fetched per session on demand
+HISTORY_COLUMNS = "id, created_at, job_role, match_score, missing_skills"
+HISTORY_PAGE_SIZE = int(os.environ.get("HISTORY_PAGE_SIZE", "10"))
+HISTORY_MAX_PAGE_SIZE = int(os.environ.get("HISTORY_MAX_PAGE_SIZE", "100"))
+# Short, because the cache is per worker process: another worker's writes become visible after at most this long
+HISTORY_CACHE_TTL = float(os.environ.get("HISTORY_CACHE_TTL", "30"))
+# Cached pages across all candidates; the least recently read candidates are evicted past this
+HISTORY_CACHE_MAX_PAGES = int(os.environ.get("HISTORY_CACHE_MAX_PAGES", "2000"))
+
+# candidate_name -> {(cursor, limit): (expires_at, page)}, least recently read candidate first
+_history_cache = OrderedDict()
+_history_pages = 0
+_history_lock = threading.Lock()
+
+# What a created_at sort key can contain (it is interpolated into a PostgREST filter)
+_TIMESTAMP = re.compile(r"[0-9TZ:.+\- ]+")
+# A positive bigint primary key
+_SESSION_ID = re.compile(r"[0-9]{1,18}")
+
+def invalidate_history(candidate_name: str):
+    """Drops every cached history page of one candidate."""
+    global _history_pages
+    with _history_lock:
+        _history_pages -= len(_history_cache.pop(candidate_name, {}))
+
+def _evict_history():
+    """Trims the cache to HISTORY_CACHE_MAX_PAGES, least recently read candidates (then their oldest pages) first."""
+    global _history_pages
+    while _history_pages > HISTORY_CACHE_MAX_PAGES and _history_cache:
+        candidate_name, pages = next(iter(_history_cache.items()))
+        if len(_history_cache) > 1:
+            _history_pages -= len(_history_cache.pop(candidate_name))
+        else:
+            # One candidate holds every page: drop its oldest one
+            del pages[next(iter(pages))]
+            _history_pages -= 1
+
+def insert_sessions(sessions: list) -> int:
+    """Multi-row insert of interview sessions (dicts of log_interview_session's arguments). Raises on failure.
+
+    Resume and JD text are stored once per distinct content in the documents table (one lookup and at
+    most one upload for the whole batch); the rows keep only the hashes.
+    """
+    supabase = get_db_client()
+    hashes = store_document_batch(
+        [item for s in sessions for item in (("resume", s["resume_text"]), ("jd", s["jd_text"]))]
+    )
+    rows = [
+        {
+            "job_role": s["job_role"],
+            "match_score": s["match_score"],
+            "missing_skills": s["missing_skills"],
+            "resume_hash": hashes[2 * i],
+            "jd_hash": hashes[2 * i + 1],
+            "candidate_name": s.get("candidate_name", "Anonymous"),
+        }
+        for i, s in enumerate(sessions)
+    ]
+    supabase.table("interviews").insert(rows, returning="minimal").execute()
+    # These candidates' cached history no longer includes their newest sessions
+    for candidate_name in {row["candidate_name"] for row in rows}:
+        invalidate_history(candidate_name)
+    return len(rows)
+
+# /api/analyze enqueues sessions here; a background task batches them into insert_sessions calls, and each
+# written batch is then added to the similarity index in the background
+session_logger = SessionLogger(insert_sessions, after_write=index_sessions)
 
 def log_interview_session(job_role: str, match_score: float, missing_skills: list, resume_text: str, jd_text: str, candidate_name: str = "Anonymous"):
-    """Saves the interview session to Supabase, tagged with the candidate's name."""
+    """Saves the interview session to Supabase, tagged with the candidate's name.
+
+    The API logs through the write-behind session_logger instead; this stays for scripts and one-offs.
+    """
+    sessions = [{
+        "job_role": job_role,
+        "match_score": match_score,
+        "missing_skills": missing_skills,
+        "resume_text": resume_text,
+        "jd_text": jd_text,
+        "candidate_name": candidate_name,
+    }]
     try:
-        supabase = get_db_client()
-        data = {
-            "job_role": job_role,
-            "match_score": match_score,
-            "missing_skills": missing_skills,
-            "resume_text": resume_text,
-            "jd_text": jd_text,
-            "candidate_name": candidate_name # New field added
-        }
-        response = supabase.table("interviews").insert(data).execute()
-        return response.data
+        written = insert_sessions(sessions)
     except Exception as e:
         return f"Database Error: {str(e)}"
+    # New postings and skill gaps become searchable right away (a failure here is logged, never raised)
+    similar_index.append_sessions(sessions)
+    return written
 
-def get_interview_history(candidate_name: str):
-    """Fetches the 10 most recent interview sessions for a SPECIFIC candidate."""
+def encode_cursor(row: dict) -> str:
+    """Opaque cursor for the row a page ended on: its (created_at, id) sort key."""
+    key = json.dumps({"created_at": row["created_at"], "id": row["id"]})
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+def decode_cursor(cursor: str) -> dict:
     try:
-        supabase = get_db_client()
-        # Filter by candidate_name, order by newest, limit 10
-        response = supabase.table("interviews").select("*").eq("candidate_name", candidate_name).order("created_at", desc=True).limit(10).execute()
-        return response.data
-    except Exception as e:
-        return f"Database Fetch Error: {str(e)}"
\ No newline at end of file
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at, row_id = key["created_at"], key["id"]
+    except Exception:
+        raise ValueError("Invalid history cursor.")
+    # Checked here, so a tampered cursor is a 400 rather than a malformed PostgREST filter
+    if not isinstance(created_at, str) or not _TIMESTAMP.fullmatch(created_at) or type(row_id) is not int:
+        raise ValueError("Invalid history cursor.")
+    return {"created_at": created_at, "id": row_id}
+
+def parse_session_id(session_id) -> int:
+    """Interview IDs are integers; anything else is the caller's mistake (ValueError), not a database error."""
+    if not _SESSION_ID.fullmatch(str(session_id)):
+        raise ValueError("Invalid session ID.")
+    return int(session_id)
+
+def get_interview_history(candidate_name: str, limit: int = HISTORY_PAGE_SIZE, cursor: str = None) -> dict:
+    """Fetches one page of a candidate's session summaries, newest first.
+
+    Keyset pagination on (created_at, id): pass the returned next_cursor to get the following page.
+    Returns {"items": [...], "next_cursor": str or None}.
+    """
+    limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+    cache_key = (cursor, limit)
+
+    # 1. Per-candidate cache (LRU over candidates, TTL per page)
+    with _history_lock:
+        pages = _history_cache.get(candidate_name)
+        cached = pages.get(cache_key) if pages is not None else None
+        if cached is not None:
+            _history_cache.move_to_end(candidate_name)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    # 2. Summary columns only, one row more than the page to learn whether another page exists
+    supabase = get_db_client()
+    query = (
+        supabase.table("interviews")
+        .select(HISTORY_COLUMNS)
+        .eq("candidate_name", candidate_name)
+    )
+    if cursor:
+        # Rows strictly after the cursor in (created_at DESC, id DESC) order; served by the
+        # (candidate_name, created_at DESC, id DESC) index from backend/migrations
+        key = decode_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{key["created_at"]}",and(created_at.eq."{key["created_at"]}",id.lt.{key["id"]})'
+        )
+    response = query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1).execute()
+
+    rows = response.data
+    page = {"items": rows[:limit], "next_cursor": encode_cursor(rows[limit - 1]) if len(rows) > limit else None}
+
+    global _history_pages
+    now = time.monotonic()
+    with _history_lock:
+        pages = _history_cache.setdefault(candidate_name, {})
+        _history_cache.move_to_end(candidate_name)
+        # Drop this candidate's expired pages first; other candidates' go by LRU eviction
+        for stale in [k for k, (expires_at, _) in pages.items() if expires_at <= now]:
+            del pages[stale]
+            _history_pages -= 1
+        if cache_key not in pages:
+            _history_pages += 1
+        pages[cache_key] = (now + HISTORY_CACHE_TTL, page)
+        _evict_history()
+    return page
+
+def get_interview_session(candidate_name: str, session_id: str):
+    """Fetches one full session (including resume_text and jd_text), scoped to its candidate. None if absent."""
+    session_id = parse_session_id(session_id)
+    supabase = get_db_client()
+    response = (
+        supabase.table("interviews")
+        .select("*")
+        .eq("id", session_id)
+        .eq("candidate_name", candidate_name)
+        .limit(1)
+        .execute()
+    )
+    if not response.data:
+        return None
+    session = response.data[0]
+
+    # Resolve document hashes back into text (rows not yet backfilled still carry the text inline)
+    texts = fetch_documents([session.get("resume_hash"), session.get("jd_hash")])
+    for column in ("resume", "jd"):
+        digest = session.get(f"{column}_hash")
+        if digest in texts:
+            session[f"{column}_text"] = texts[digest]
+    return session
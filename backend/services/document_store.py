@@ -0,0 +1,84 @@
+import sys
+import os
+import zlib
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.database import get_db_client
+
+# zlib level for stored documents (1 = fastest, 9 = smallest)
+DOCUMENT_COMPRESSION_LEVEL = int(os.environ.get("DOCUMENT_COMPRESSION_LEVEL", "6"))
+# Hashes this worker has already seen in the documents table, so repeat uploads skip the round trip
+KNOWN_HASHES_SIZE = int(os.environ.get("DOCUMENT_KNOWN_HASHES", "4096"))
+
+_known_hashes = OrderedDict()
+_known_lock = threading.Lock()
+
+def content_hash(text: str) -> str:
+    """Documents are addressed by the SHA-256 of their (already cleaned) text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def compress_text(text: str) -> str:
+    """zlib-compressed, base64-encoded text (PostgREST moves text columns more easily than bytea)."""
+    return base64.b64encode(zlib.compress(text.encode("utf-8"), DOCUMENT_COMPRESSION_LEVEL)).decode("ascii")
+
+def decompress_text(content: str) -> str:
+    return zlib.decompress(base64.b64decode(content)).decode("utf-8")
+
+def _remember(hashes):
+    with _known_lock:
+        for digest in hashes:
+            _known_hashes[digest] = True
+            _known_hashes.move_to_end(digest)
+        while len(_known_hashes) > KNOWN_HASHES_SIZE:
+            _known_hashes.popitem(last=False)
+
+def store_document_batch(items: list) -> list:
+    """Stores each (kind, text) once by content hash and returns the hashes in order. Empty texts map to None.
+
+    Known hashes cost nothing; otherwise one lookup finds which hashes exist and only the missing
+    documents are compressed and uploaded (insert-or-ignore, so concurrent writers cannot collide).
+    """
+    hashes = [content_hash(text) if text else None for _, text in items]
+
+    # 1. Skip anything this worker has already stored or seen
+    with _known_lock:
+        unknown = {digest: i for i, digest in enumerate(hashes) if digest and digest not in _known_hashes}
+    if not unknown:
+        return hashes
+
+    # 2. One round trip to find which of the rest already exist
+    supabase = get_db_client()
+    existing = supabase.table("documents").select("hash").in_("hash", sorted(unknown)).execute()
+    present = {row["hash"] for row in existing.data}
+
+    # 3. Upload only new documents, each once
+    rows = []
+    for digest, i in unknown.items():
+        if digest not in present:
+            kind, text = items[i]
+            content = compress_text(text)
+            rows.append({"hash": digest, "kind": kind, "content": content,
+                         "raw_bytes": len(text.encode("utf-8")), "stored_bytes": len(content)})
+    if rows:
+        supabase.table("documents").upsert(rows, on_conflict="hash", ignore_duplicates=True, returning="minimal").execute()
+
+    _remember(unknown)
+    return hashes
+
+def store_documents(documents: dict) -> dict:
+    """Stores each {kind: text} once by content hash and returns {kind: hash}. Empty texts map to None."""
+    kinds = list(documents)
+    return dict(zip(kinds, store_document_batch([(kind, documents[kind]) for kind in kinds])))
+
+def fetch_documents(hashes: list) -> dict:
+    """Returns {hash: text} for the given hashes (missing ones are left out)."""
+    wanted = sorted({digest for digest in hashes if digest})
+    if not wanted:
+        return {}
+    supabase = get_db_client()
+    response = supabase.table("documents").select("hash, content").in_("hash", wanted).execute()
+    return {row["hash"]: decompress_text(row["content"]) for row in response.data}
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Cache tuning. JD_CACHE_PATH is optional: leave it unset to keep the cache in memory only.
+JD_CACHE_TTL = float(os.environ.get("JD_CACHE_TTL", "3600"))
+JD_CACHE_SIZE = int(os.environ.get("JD_CACHE_SIZE", "256"))
+JD_CACHE_PATH = os.environ.get("JD_CACHE_PATH")
+# Disk tier bounds, applied on write: rows beyond JD_CACHE_MAX_ROWS go oldest first, and rows not refetched or
+# revalidated for JD_CACHE_MAX_AGE seconds are dropped (younger stale rows still allow a conditional request)
+JD_CACHE_MAX_ROWS = int(os.environ.get("JD_CACHE_MAX_ROWS", "10000"))
+JD_CACHE_MAX_AGE = float(os.environ.get("JD_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+
+class JobDescriptionCache:
+    """URL-keyed cache of extracted job description text with an LRU memory tier and an optional SQLite tier."""
+
+    def __init__(self, ttl: float = JD_CACHE_TTL, max_entries: int = JD_CACHE_SIZE, path: str = JD_CACHE_PATH,
+                 max_rows: int = JD_CACHE_MAX_ROWS, max_age: float = JD_CACHE_MAX_AGE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.max_age = max_age
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jd_cache (url TEXT PRIMARY KEY, entry TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS jd_cache_stored_at ON jd_cache (stored_at)")
+            self._db.commit()
+        self.counters = {"hits": 0, "misses": 0, "revalidated": 0, "refreshed": 0, "errors": 0}
+        self._latency = {"hits": 0.0, "misses": 0.0, "revalidated": 0.0, "refreshed": 0.0}
+
+    def get(self, url: str):
+        """Returns the cached entry dict for url (memory first, then disk), or None."""
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+                return entry
+            if self._db is None:
+                return None
+            row = self._db.execute("SELECT entry FROM jd_cache WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        # Promote disk hits into the memory tier
+        entry = json.loads(row[0])
+        self._put_memory(url, entry)
+        return entry
+
+    def put(self, url: str, text: str, etag: str = None, last_modified: str = None):
+        """Stores freshly fetched (or revalidated) text with its HTTP validators."""
+        entry = {"text": text, "etag": etag, "last_modified": last_modified, "fetched_at": time.time()}
+        self._put_memory(url, entry)
+        if self._db is not None:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO jd_cache (url, entry, stored_at) VALUES (?, ?, ?)",
+                    (url, json.dumps(entry), entry["fetched_at"]),
+                )
+                # Eviction: drop rows past the max age, then the oldest beyond max_rows
+                self._db.execute("DELETE FROM jd_cache WHERE stored_at < ?", (entry["fetched_at"] - self.max_age,))
+                self._db.execute(
+                    "DELETE FROM jd_cache WHERE rowid IN (SELECT rowid FROM jd_cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+                self._db.commit()
+        return entry
+
+    def _put_memory(self, url: str, entry: dict):
+        with self._lock:
+            self._memory[url] = entry
+            self._memory.move_to_end(url)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["fetched_at"] < self.ttl
+
+    def record(self, outcome: str, seconds: float = 0.0):
+        """Counts a lookup outcome (hits / misses / revalidated / refreshed / errors) and its latency."""
+        with self._lock:
+            self.counters[outcome] += 1
+            if outcome in self._latency:
+                self._latency[outcome] += seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+            avg_ms = {
+                outcome: round(total * 1000 / counters[outcome], 3) if counters[outcome] else 0.0
+                for outcome, total in self._latency.items()
+            }
+            entries = len(self._memory)
+        lookups = counters["hits"] + counters["misses"] + counters["revalidated"] + counters["refreshed"]
+        # Every hit or 304 would otherwise have cost a full download + parse (an average miss)
+        saved_ms = (counters["hits"] * (avg_ms["misses"] - avg_ms["hits"])
+                    + counters["revalidated"] * (avg_ms["misses"] - avg_ms["revalidated"]))
+        return {
+            **counters,
+            "hit_ratio": round((counters["hits"] + counters["revalidated"]) / lookups, 4) if lookups else 0.0,
+            "avg_ms": avg_ms,
+            "estimated_saved_ms": round(max(saved_ms, 0.0), 1),
+            "memory_entries": entries,
+            "disk_tier": self._db is not None,
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
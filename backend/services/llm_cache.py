@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Cache tuning. Set LLM_CACHE_PATH to an empty string to keep the cache in memory only.
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", "llm_cache.sqlite3")
+LLM_CACHE_TTL = float(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MEMORY_SIZE = int(os.environ.get("LLM_CACHE_MEMORY_SIZE", "512"))
+LLM_CACHE_MAX_ROWS = int(os.environ.get("LLM_CACHE_MAX_ROWS", "20000"))
+# Serve up to N different cached answers per prompt so candidates don't see the same question word for word
+LLM_CACHE_VARIANTS = int(os.environ.get("LLM_CACHE_VARIANTS", "1"))
+
+def make_key(model: str, job_role: str, skills: list) -> str:
+    """Hash of the normalized prompt inputs: model, role and the sorted, lowercased skill set."""
+    normalized = {
+        "model": model,
+        "role": " ".join(job_role.lower().split()),
+        "skills": sorted({" ".join(skill.lower().split()) for skill in skills}),
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+class ResponseCache:
+    """Two-tier (in-process LRU + SQLite) cache of LLM responses with TTL, row-count eviction and variants."""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, ttl: float = LLM_CACHE_TTL,
+                 memory_size: int = LLM_CACHE_MEMORY_SIZE, max_rows: int = LLM_CACHE_MAX_ROWS,
+                 variants: int = LLM_CACHE_VARIANTS):
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self.variants = max(1, variants)
+        self._memory = OrderedDict() # key -> list of (response, created_at)
+        self._lock = threading.Lock()
+        self.path = path
+        self._db = None
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._miss_seconds = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use, so importing the module never creates the file
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT NOT NULL, variant INTEGER NOT NULL, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL, PRIMARY KEY (key, variant))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+            self._db.commit()
+        return self._db
+
+    def _fresh(self, entries: list) -> list:
+        cutoff = time.time() - self.ttl
+        return [entry for entry in entries if entry[1] >= cutoff]
+
+    def get(self, key: str):
+        """Returns a cached response, or None when the key is unknown, expired or still collecting variants."""
+        with self._lock:
+            # 1. In-process tier
+            entries = self._fresh(self._memory.get(key, []))
+            tier = "memory_hits"
+
+            # 2. SQLite tier (also consulted when another worker may hold more variants)
+            if len(entries) < self.variants and self.path:
+                rows = self._connect().execute(
+                    "SELECT response, created_at FROM llm_cache WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl),
+                ).fetchall()
+                entries = [tuple(row) for row in rows]
+                tier = "disk_hits"
+
+            # In variant mode, keep generating until N distinct answers exist for this prompt
+            if len(entries) < self.variants:
+                self._counters["misses"] += 1
+                return None
+
+            self._memory[key] = entries
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+            self._counters[tier] += 1
+            if tier == "disk_hits":
+                self._db.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+            return random.choice(entries)[0]
+
+    def put(self, key: str, response: str, latency: float = 0.0):
+        """Stores a successful response (callers must never pass error text) and the latency it cost."""
+        now = time.time()
+        with self._lock:
+            entries = [entry for entry in self._fresh(self._memory.get(key, [])) if entry[0] != response]
+            entries = (entries + [(response, now)])[-self.variants:]
+            self._memory[key] = entries
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+            self._counters["stores"] += 1
+            self._miss_seconds += latency
+
+            if self.path:
+                db = self._connect()
+                # A key never holds more than N rows: fill free variant slots, then overwrite the oldest
+                used = db.execute(
+                    "SELECT variant FROM llm_cache WHERE key = ? ORDER BY created_at", (key,)
+                ).fetchall()
+                free = sorted(set(range(self.variants)) - {row[0] for row in used})
+                slot = free[0] if free else used[0][0]
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, variant, response, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, slot, response, now, now),
+                )
+                # Size-based eviction: drop expired rows, then the least recently used beyond max_rows
+                db.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+                db.execute(
+                    "DELETE FROM llm_cache WHERE rowid IN (SELECT rowid FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+                db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            miss_seconds = self._miss_seconds
+            rows = self._connect().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] if self.path else None
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        avg_miss_ms = miss_seconds * 1000 / counters["stores"] if counters["stores"] else 0.0
+        return {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "avg_generation_ms": round(avg_miss_ms, 1),
+            # Every hit skipped one LLM round trip of average length
+            "estimated_saved_ms": round(hits * avg_miss_ms, 1),
+            "memory_keys": len(self._memory),
+            "disk_rows": rows,
+            "variants": self.variants,
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,306 @@
+import os
+import time
+import random
+import sys
+import asyncio
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.telemetry import record_external
+
+# Gateway tuning (all per worker process)
+LLM_MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", "16"))
+LLM_DEADLINE = float(os.environ.get("LLM_DEADLINE", "30"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE = float(os.environ.get("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_CAP = float(os.environ.get("LLM_BACKOFF_CAP", "8"))
+# Send a second, racing request if the first has not answered after this many seconds (0 = off)
+LLM_HEDGE_AFTER = float(os.environ.get("LLM_HEDGE_AFTER", "0"))
+LLM_BREAKER_THRESHOLD = int(os.environ.get("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_RESET = float(os.environ.get("LLM_BREAKER_RESET", "30"))
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+class LLMError(Exception):
+    """Base class for structured LLM failures. `code` is a stable machine-readable identifier."""
+    code = "llm_error"
+    retryable = False
+    # What the API answers with when this error ends a request
+    http_status = 502
+
+    def to_dict(self) -> dict:
+        return {"code": self.code, "retryable": self.retryable, "message": str(self)}
+
+class LLMTimeoutError(LLMError):
+    code = "llm_timeout"
+    retryable = True
+    http_status = 504
+
+class LLMRateLimitError(LLMError):
+    code = "llm_rate_limited"
+    retryable = True
+    http_status = 429
+
+class LLMUpstreamError(LLMError):
+    code = "llm_upstream_error"
+
+class LLMUnavailableError(LLMError):
+    """Raised without calling upstream while the circuit breaker is open."""
+    code = "llm_unavailable"
+    retryable = True
+    http_status = 503
+
+def classify_error(error: Exception) -> LLMError:
+    """Maps SDK / transport exceptions onto the structured LLMError types."""
+    if isinstance(error, LLMError):
+        return error
+    if isinstance(error, (asyncio.TimeoutError, httpx.TimeoutException)):
+        return LLMTimeoutError("Gemini did not answer before the deadline.")
+    status = getattr(error, "code", None)
+    if status == 429:
+        return LLMRateLimitError(f"Gemini quota exceeded: {error}")
+    wrapped = LLMUpstreamError(f"Gemini request failed: {error}")
+    wrapped.retryable = status in RETRYABLE_STATUS or isinstance(error, httpx.TransportError)
+    return wrapped
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; lets one trial call through after `reset` seconds."""
+
+    def __init__(self, threshold: int = LLM_BREAKER_THRESHOLD, reset: float = LLM_BREAKER_RESET):
+        self.threshold = threshold
+        self.reset = reset
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset else "open"
+
+    def before_call(self) -> bool:
+        """Raises while open; returns True when this call is the half-open trial."""
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise LLMUnavailableError("Gemini is failing; circuit breaker is open.")
+        if state == "half_open":
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failures >= self.threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        """Frees the trial slot after a call that says nothing about upstream health (cancelled, bad request)."""
+        self._trial_in_flight = False
+
+    def record_outcome(self, error: "LLMError", trial: bool):
+        """Only availability failures (timeouts, 429/5xx, transport errors) count towards opening."""
+        if error.retryable:
+            self.record_failure()
+        elif trial:
+            self.release_trial()
+
+class GeminiGateway:
+    """Every Gemini call goes through here: in-flight cap, deadline, jittered retries, hedging, breaker."""
+
+    def __init__(self, get_client, max_in_flight: int = LLM_MAX_IN_FLIGHT, deadline: float = LLM_DEADLINE,
+                 max_retries: int = LLM_MAX_RETRIES, backoff_base: float = LLM_BACKOFF_BASE,
+                 backoff_cap: float = LLM_BACKOFF_CAP, hedge_after: float = LLM_HEDGE_AFTER,
+                 breaker: CircuitBreaker = None):
+        # get_client is looked up on every call so the SDK client can be swapped (tests, lazy init)
+        self.get_client = get_client
+        self.max_in_flight = max_in_flight
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = None
+        self._in_flight = 0
+        self.counters = {"calls": 0, "upstream_requests": 0, "retries": 0, "hedges": 0, "hedge_wins": 0,
+                         "timeouts": 0, "failures": 0, "rejected_open_circuit": 0}
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    async def _request(self, model: str, prompt: str) -> str:
+        async with self.semaphore:
+            self._in_flight += 1
+            self.counters["upstream_requests"] += 1
+            sent = time.perf_counter()
+            try:
+                response = await self.get_client().aio.models.generate_content(model=model, contents=prompt)
+            except asyncio.CancelledError:
+                # A lost hedge or the deadline: no answer, but the request did go out
+                record_external("gemini", model, "cancelled", time.perf_counter() - sent)
+                raise
+            except Exception as e:
+                record_external("gemini", model, classify_error(e).code, time.perf_counter() - sent)
+                raise
+            finally:
+                self._in_flight -= 1
+        text = (response.text or "").strip()
+        if not text:
+            record_external("gemini", model, "empty", time.perf_counter() - sent)
+            raise LLMUpstreamError("Gemini returned an empty response.")
+        record_external("gemini", model, "ok", time.perf_counter() - sent)
+        return text
+
+    async def _hedged_request(self, model: str, prompt: str) -> str:
+        """Primary request plus, if it is slow, one backup; the first success wins and the loser is cancelled."""
+        primary = asyncio.ensure_future(self._request(model, prompt))
+        if not self.hedge_after:
+            return await primary
+
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if done:
+                return primary.result()
+
+            self.counters["hedges"] += 1
+            backup = asyncio.ensure_future(self._request(model, prompt))
+            tasks.append(backup)
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.counters["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Cancel the loser (and everything, if the deadline cancelled us)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def generate(self, prompt: str, model: str) -> str:
+        """Returns the model's text or raises an LLMError once retries or the deadline run out."""
+        self.counters["calls"] += 1
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.deadline
+        attempt = 0
+        while True:
+            try:
+                trial = self.breaker.before_call()
+            except LLMUnavailableError:
+                self.counters["rejected_open_circuit"] += 1
+                raise
+
+            remaining = give_up_at - loop.time()
+            try:
+                text = await asyncio.wait_for(self._hedged_request(model, prompt), timeout=max(remaining, 0.001))
+                self.breaker.record_success()
+                return text
+            except Exception as e:
+                error = classify_error(e)
+                if isinstance(error, LLMTimeoutError):
+                    self.counters["timeouts"] += 1
+                self.breaker.record_outcome(error, trial)
+                self.counters["failures"] += 1
+
+                # Retry only retryable errors, and only if the backoff still fits inside the deadline
+                delay = self.backoff(attempt)
+                if not error.retryable or attempt >= self.max_retries or loop.time() + delay >= give_up_at:
+                    raise error from (e if error is not e else None)
+            except BaseException:
+                # Cancelled by the caller: otherwise a half-open trial would hold the breaker shut for good
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            # Only a retryable failure with time left gets here
+            self.counters["retries"] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def stream(self, prompt: str, model: str):
+        """Streams text chunks. Retries are only possible before the first chunk has been handed out."""
+        self.counters["calls"] += 1
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.deadline
+        attempt = 0
+        while True:
+            try:
+                trial = self.breaker.before_call()
+            except LLMUnavailableError:
+                self.counters["rejected_open_circuit"] += 1
+                raise
+
+            started = False
+            sent = time.perf_counter()
+            try:
+                async with self.semaphore:
+                    self._in_flight += 1
+                    self.counters["upstream_requests"] += 1
+                    try:
+                        remaining = max(give_up_at - loop.time(), 0.001)
+                        chunks = await asyncio.wait_for(
+                            self.get_client().aio.models.generate_content_stream(model=model, contents=prompt), remaining
+                        )
+                        iterator = chunks.__aiter__()
+                        while True:
+                            try:
+                                # Each chunk must arrive before the overall deadline
+                                chunk = await asyncio.wait_for(iterator.__anext__(), max(give_up_at - loop.time(), 0.001))
+                            except StopAsyncIteration:
+                                break
+                            if chunk.text:
+                                started = True
+                                yield chunk.text
+                    finally:
+                        self._in_flight -= 1
+                self.breaker.record_success()
+                record_external("gemini", model, "ok", time.perf_counter() - sent)
+                return
+            except Exception as e:
+                error = classify_error(e)
+                record_external("gemini", model, error.code, time.perf_counter() - sent)
+                if isinstance(error, LLMTimeoutError):
+                    self.counters["timeouts"] += 1
+                self.breaker.record_outcome(error, trial)
+                self.counters["failures"] += 1
+                delay = self.backoff(attempt)
+                if started or not error.retryable or attempt >= self.max_retries or loop.time() + delay >= give_up_at:
+                    raise error from (e if error is not e else None)
+            except BaseException:
+                # Cancelled, or the consumer closed the stream early (GeneratorExit)
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            # Only a retryable failure with time left gets here
+            self.counters["retries"] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+        }
@@ -1,66 +1,212 @@
+import sys
+import os
+import heapq
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-def calculate_match_score(resume_text: str, job_description: str) -> float:
-    """Converts text to vectors and calculates Cosine Similarity for a match score."""
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.skill_matcher import find_skills, top_skill_gaps, ResumeSkillIndex
+
+# Where the corpus-fitted vectorizer lives (built offline by backend/refit_tfidf.py)
+MODEL_PATH = os.environ.get(
+    "TFIDF_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "tfidf.joblib"),
+)
+
+_vectorizer = None
+_feature_names = None
+_model_checked = False
+
+def build_vectorizer(**kwargs) -> "TfidfVectorizer":
+    """The one vectorizer configuration used everywhere (removes filler words like 'the', 'and')."""
+    # scikit-learn costs over a second to import, so it is loaded on first use (or by the startup prewarm)
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(stop_words='english', **kwargs)
+
+def fit_corpus_model(documents: list, path: str = MODEL_PATH, min_df: int = 1) -> "TfidfVectorizer":
+    """Fits a vectorizer on a corpus of job descriptions and saves it to disk."""
+    vectorizer = build_vectorizer(min_df=min_df)
+    vectorizer.fit(documents)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    import joblib
+    joblib.dump(vectorizer, path)
+    return vectorizer
+
+def load_model(path: str = MODEL_PATH):
+    """Loads the saved vectorizer once per process (IDF weights memory-mapped). Returns None if absent."""
+    global _vectorizer, _feature_names, _model_checked
+    _model_checked = True
+    if not os.path.exists(path):
+        _vectorizer, _feature_names = None, None
+        return None
+    import joblib
+    _vectorizer = joblib.load(path, mmap_mode='r')
+    # Build the index -> term lookup once, not on every request
+    _feature_names = _vectorizer.get_feature_names_out()
+    return _vectorizer
+
+def get_vectorizer():
+    """Returns the corpus-fitted vectorizer, loading it on first use in this process."""
+    if not _model_checked:
+        load_model()
+    return _vectorizer
+
+def analyze(resume_text: str, job_description: str, top_k: int = 5) -> dict:
+    """Tokenizes both documents once and returns the match score and the top missing skills."""
     if not resume_text or not job_description:
-        return 0.0
+        return {"match_score": 0.0, "missing_skills": []}
 
-    # 1. Initialize Vectorizer (removes filler words like 'the', 'and')
-    vectorizer = TfidfVectorizer(stop_words='english')
+    # 1. One transform with the corpus-fitted model, or one local fit when no model has been built yet
+    vectorizer = get_vectorizer()
+    if vectorizer is not None:
+        tfidf_matrix = vectorizer.transform([resume_text, job_description])
+        feature_names = _feature_names
+    else:
+        vectorizer = build_vectorizer()
+        tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
+        feature_names = vectorizer.get_feature_names_out()
+    resume_vec, jd_vec = tfidf_matrix[0], tfidf_matrix[1]
 
-    # 2. Fit and transform the texts into a numerical matrix
-    tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
+    # 2. Rows are L2-normalised, so the cosine similarity is a sparse dot product
+    match_score = round(float(resume_vec.multiply(jd_vec).sum()) * 100, 2)
 
-    # 3. Calculate the distance between the Resume Vector [0] and Job Vector [1]
-    similarity_matrix = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
+    # 3. Missing skills: taxonomy skills first, then the heaviest JD terms the resume never uses
+    missing_skills = missing_skills_for(
+        find_skills(job_description), resume_text, jd_vec, set(resume_vec.indices), feature_names, top_k
+    )
 
-    # 4. Extract the raw float and convert to a percentage
-    match_score = similarity_matrix[0][0] * 100
+    return {"match_score": match_score, "missing_skills": missing_skills}
 
-    return round(match_score, 2)
+def missing_skills_for(jd_scan, resume_text: str, jd_vec, resume_terms: set, feature_names, top_k: int = 5) -> list:
+    """Combines taxonomy skill gaps (multi-word aware) with TF-IDF term gaps to fill top_k slots."""
+    jd_skills, jd_skill_words = jd_scan
+    missing_skills = top_skill_gaps(jd_skills, ResumeSkillIndex(resume_text), top_k)
+    if len(missing_skills) < top_k:
+        # Words that belong to a JD skill phrase are already accounted for by the taxonomy
+        missing_skills += top_missing_terms(jd_vec, resume_terms, feature_names, top_k - len(missing_skills), jd_skill_words)
+    return missing_skills
 
-def extract_missing_keywords(resume_text: str, job_description: str) -> list:
-    """Uses TF-IDF weights to find the most critical missing skills."""
-    vectorizer = TfidfVectorizer(stop_words='english')
-    
-    # Analyze the job description to find the most "weighted" words
-    tfidf_matrix = vectorizer.fit_transform([job_description])
-    feature_names = vectorizer.get_feature_names_out()
-    
-    # Map each word to its importance score
-    word_weights = dict(zip(feature_names, tfidf_matrix.toarray()[0]))
-    
-    # Sort words from highest importance to lowest
-    sorted_job_words = sorted(word_weights.items(), key=lambda x: x[1], reverse=True)
-    
+def top_missing_terms(jd_vec, resume_terms: set, feature_names, top_k: int = 5, exclude: set = frozenset()) -> list:
+    """Returns the top_k heaviest JD terms whose vocabulary index is not in resume_terms."""
+    # Heap of (-weight, index): heaviest first, ties alphabetical (indices are in vocabulary order),
+    # and only as many pops as it takes to find top_k survivors
+    heap = list(zip(-jd_vec.data, jd_vec.indices))
+    heapq.heapify(heap)
     missing_skills = []
-    resume_text_lower = resume_text.lower()
-    
-    # Find the top 5 most important words that are missing from the resume
-    for word, weight in sorted_job_words:
-        # Ignore raw numbers and check if the word is absent
-        if word not in resume_text_lower and not word.isnumeric():
+    while heap and len(missing_skills) < top_k:
+        _, idx = heapq.heappop(heap)
+        word = str(feature_names[idx])
+        # Ignore raw numbers and anything the resume already mentions
+        if idx not in resume_terms and not word.isnumeric() and word not in exclude:
             missing_skills.append(word)
-            if len(missing_skills) >= 5:
-                break
-                
     return missing_skills
 
+# --- BATCH RANKING (one JD against many resumes) ---
+
+def _batch_vectorizer(job_description: str):
+    """Corpus model when available; otherwise a vocabulary fitted on the JD alone (same in every worker)."""
+    vectorizer = get_vectorizer()
+    if vectorizer is not None:
+        return vectorizer, _feature_names
+    vectorizer = build_vectorizer().fit([job_description])
+    return vectorizer, vectorizer.get_feature_names_out()
+
+def score_resumes(resume_texts: list, job_description: str) -> np.ndarray:
+    """Scores one chunk of resumes: one sparse matrix, one sparse matrix-vector product."""
+    vectorizer, _ = _batch_vectorizer(job_description)
+    resume_matrix = vectorizer.transform(resume_texts)
+    jd_vec = vectorizer.transform([job_description])
+    scores = resume_matrix @ jd_vec.T
+    return (scores.toarray().ravel() * 100).astype(np.float32)
+
+def missing_skills_batch(resume_texts: list, job_description: str, top_k: int = 5) -> list:
+    """Missing skills for each resume in a (small) list, e.g. the final top-k."""
+    vectorizer, feature_names = _batch_vectorizer(job_description)
+    resume_matrix = vectorizer.transform(resume_texts).tocsr()
+    jd_vec = vectorizer.transform([job_description])
+    # Scan the JD for taxonomy skills once for the whole batch
+    jd_scan = find_skills(job_description)
+    return [
+        missing_skills_for(jd_scan, text, jd_vec, set(resume_matrix[i].indices), feature_names, top_k)
+        for i, text in enumerate(resume_texts)
+    ]
+
+def merge_top_k(heap: list, scores: np.ndarray, offset: int, k: int) -> list:
+    """Folds a chunk of scores into a size-k min-heap of (score, -global_index); earlier resumes win ties."""
+    # Only the chunk's own top-k can enter the global top-k. argpartition alone picks arbitrarily among
+    # scores tied with the k-th best, so take everything above it and then the earliest of the ties
+    if len(scores) > k:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        candidates = np.concatenate([above, np.flatnonzero(scores == kth)[:k - len(above)]])
+    else:
+        candidates = range(len(scores))
+    for i in candidates:
+        item = (float(scores[i]), -(offset + int(i)))
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return heap
+
+def ranked_from_heap(heap: list) -> list:
+    """Turns a merge_top_k heap into [(score, index), ...] best first."""
+    return [(score, -neg_index) for score, neg_index in sorted(heap, reverse=True)]
+
+# --- DENSE EMBEDDINGS (TF-IDF -> truncated SVD, for the similarity index) ---
+
+_embedders = {} # path -> (mtime, embedder), per process
+
+def fit_embedder(documents: list, dims: int = 128, min_df: int = 1) -> dict:
+    """TF-IDF (the corpus-fitted vocabulary when there is one) followed by a truncated SVD down to `dims`."""
+    from sklearn.decomposition import TruncatedSVD
+    vectorizer = get_vectorizer() or build_vectorizer(min_df=min_df).fit(documents)
+    tfidf = vectorizer.transform(documents)
+    # The SVD cannot have more components than terms (or documents)
+    dims = max(1, min(dims, tfidf.shape[1] - 1, len(documents) - 1))
+    svd = TruncatedSVD(n_components=dims, random_state=0).fit(tfidf)
+    return {"vectorizer": vectorizer, "svd": svd}
+
+def embed_texts(embedder: dict, texts: list) -> np.ndarray:
+    """float32 rows, L2-normalised so that a dot product is a cosine similarity (all-zero rows stay zero)."""
+    vectors = embedder["svd"].transform(embedder["vectorizer"].transform(texts)).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+def save_embedder(embedder: dict, path: str):
+    import joblib
+    joblib.dump(embedder, path)
+
+def embed_with_saved(path: str, texts: list) -> np.ndarray:
+    """embed_texts with the embedder saved at path, loaded once per process (and again after a rebuild)."""
+    mtime = os.path.getmtime(path)
+    cached = _embedders.get(path)
+    if cached is None or cached[0] != mtime:
+        import joblib
+        cached = _embedders[path] = (mtime, joblib.load(path))
+    return embed_texts(cached[1], texts)
+
+def calculate_match_score(resume_text: str, job_description: str) -> float:
+    """Converts text to vectors and calculates Cosine Similarity for a match score."""
+    return analyze(resume_text, job_description)["match_score"]
+
+def extract_missing_keywords(resume_text: str, job_description: str) -> list:
+    """Uses TF-IDF weights to find the most critical missing skills."""
+    return analyze(resume_text, job_description)["missing_skills"]
+
 # --- TEST BLOCK ---
 if __name__ == "__main__":
     print("Initializing ML Engine...\n")
-    
+
     # Dummy data to test the mathematical logic
     sample_resume = "I am a backend developer skilled in python, sql, and pandas. I use flask."
     sample_jd = "Looking for a backend developer. Must have strong python, sql, fastapi, docker, and AWS."
-    
-    score = calculate_match_score(sample_resume, sample_jd)
-    missing = extract_missing_keywords(sample_resume, sample_jd)
-    
+
+    result = analyze(sample_resume, sample_jd)
+
     print("--- ML ANALYSIS RESULTS ---")
-    print(f"Match Score: {score}%")
-    print(f"Top Missing Keywords: {missing}")
+    print(f"Model: {'corpus-fitted' if get_vectorizer() is not None else 'per-request fit'}")
+    print(f"Match Score: {result['match_score']}%")
+    print(f"Top Missing Keywords: {result['missing_skills']}")
     print("---------------------------")
-    print("Status: ML Engine Complete.")
\ No newline at end of file
+    print("Status: ML Engine Complete.")
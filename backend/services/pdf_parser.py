@@ -1,20 +1,87 @@
-import fitz
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.workers import run_blocking, run_cpu_bound
+from backend.services.data_cleaner import clean_text
+
+# Upload limits (tunable per deployment). A resume should never need more than this.
+MAX_PDF_BYTES = int(os.environ.get("MAX_PDF_BYTES", str(10 * 1024 * 1024)))
+MAX_PDF_PAGES = int(os.environ.get("MAX_PDF_PAGES", "50"))
+# Documents with more pages than this are split into chunks of this size across the process pool
+PAGES_PER_WORKER = int(os.environ.get("PDF_PAGES_PER_WORKER", "8"))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def extract_pages(pdf_bytes: bytes, start: int, stop: int) -> list:
+    """Opens a PDF from memory and returns the text of pages [start, stop) as a list."""
+    import fitz # Imported on first use (pool workers get it preloaded from the forkserver, see workers.POOL_PRELOAD)
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [doc[i].get_text() for i in range(start, min(stop, doc.page_count))]
+
+def count_pages(pdf_bytes: bytes) -> int:
+    """Returns the page count of an in-memory PDF."""
+    import fitz
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return doc.page_count
+
+def extract_clean_text(pdf_bytes: bytes, max_pages: int = MAX_PDF_PAGES) -> dict:
+    """Page limit, extraction and clean_text for one whole PDF in a single call (one process pool round trip
+    per document, for bulk ingestion). Returns {"pages", "text"}; raises ValueError for unusable documents."""
+    import fitz
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        if doc.page_count > max_pages:
+            raise ValueError(f"PDF has {doc.page_count} pages; the limit is {max_pages}.")
+        text = clean_text("".join(page.get_text() for page in doc))
+        pages = doc.page_count
+    if not text:
+        raise ValueError("No extractable text (a scanned image?).")
+    return {"pages": pages, "text": text}
 
 def extract_text_from_pdf(pdf_path: str) -> str:
     """Reads a PDF file and returns all its text as a single string."""
-    extracted_text = ""
-
     try:
-        #Open the document
-        with fitz.open(pdf_path) as doc:
-            #Loop through every single page in the PDF
-            for page in doc:
-                extracted_text += page.get_text()
-        
-        return extracted_text
-    except Exception as e: 
+        with open(pdf_path, "rb") as f:
+            pdf_bytes = f.read()
+        #Join the pages once instead of growing a string page by page
+        return "".join(extract_pages(pdf_bytes, 0, count_pages(pdf_bytes)))
+    except Exception as e:
         return f"Error reading PDF : {str(e)}"
 
+async def read_upload_limited(upload, max_bytes: int = MAX_PDF_BYTES) -> bytes:
+    """Streams an UploadFile into memory in chunks and aborts as soon as it exceeds max_bytes."""
+    chunks = []
+    total = 0
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise ValueError(f"Resume PDF is larger than the {max_bytes // (1024 * 1024)} MB limit.")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+async def extract_pages_parallel(pdf_bytes: bytes, max_pages: int = MAX_PDF_PAGES) -> list:
+    """Extracts the text of every page of an in-memory PDF, fanning page ranges out across the process pool."""
+    # 1. Enforce the page limit before doing any real extraction work
+    page_count = await run_blocking(count_pages, pdf_bytes)
+    if page_count > max_pages:
+        raise ValueError(f"Resume PDF has {page_count} pages; the limit is {max_pages}.")
+
+    # 2. Short documents are cheaper to parse in one worker than to split
+    if page_count <= PAGES_PER_WORKER:
+        return await run_cpu_bound(extract_pages, pdf_bytes, 0, page_count)
+
+    # 3. Long documents: one task per page range, results flattened once in page order
+    ranges = [(start, start + PAGES_PER_WORKER) for start in range(0, page_count, PAGES_PER_WORKER)]
+    results = await asyncio.gather(*(run_cpu_bound(extract_pages, pdf_bytes, start, stop) for start, stop in ranges))
+    return [text for pages in results for text in pages]
+
+async def extract_text_parallel(pdf_bytes: bytes, max_pages: int = MAX_PDF_PAGES) -> str:
+    """Extracts text from an in-memory PDF, fanning page ranges out across the process pool."""
+    return "".join(await extract_pages_parallel(pdf_bytes, max_pages))
+
 # --- TEST BLOCK ---
 # This block only runs if we execute this specific file directly
 if __name__ == "__main__":
@@ -29,4 +96,4 @@ if __name__ == "__main__":
     print("---EXTRACTED TEXT (First 500 characters)---")
     print(result[:500])
     print("\n-----------------------------------------")
-    print("Status: Extraction Complete")
\ No newline at end of file
+    print("Status: Extraction Complete")
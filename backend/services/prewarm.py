@@ -0,0 +1,122 @@
+import sys
+import os
+import time
+import random
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.workers import run_blocking, get_cpu_pool, get_auth_pool, CPU_WORKERS, AUTH_WORKERS
+from backend.services.telemetry import stage, register_gauge
+
+# Warm the heavy subsystems in the background once the server is accepting traffic (0 = leave everything lazy)
+PREWARM = os.environ.get("PREWARM", "1") != "0"
+# Failed steps are retried with jittered exponential backoff from PREWARM_RETRY_BASE up to PREWARM_RETRY_CAP seconds
+PREWARM_RETRY_BASE = float(os.environ.get("PREWARM_RETRY_BASE", "1"))
+PREWARM_RETRY_CAP = float(os.environ.get("PREWARM_RETRY_CAP", "60"))
+
+def warm_database():
+    from backend.database import init_db_client
+    init_db_client()
+
+def warm_pdf_parser():
+    import fitz  # noqa: F401 (page counting runs in this process; the extraction itself in the CPU pool)
+
+def warm_html_parser():
+    from backend.services.scraper import extract_job_text
+    extract_job_text("<html><body><p>warm</p></body></html>")
+
+def warm_gemini_client():
+    from backend.services.ai_service import get_client
+    get_client()
+
+def _warm_cpu_worker(_):
+    """Runs inside a CPU pool worker: loads the corpus-fitted TF-IDF model for that process."""
+    from backend.services.ml_engine import get_vectorizer
+    get_vectorizer()
+    return os.getpid()
+
+def _warm_auth_worker(_):
+    """Runs inside an auth pool worker: builds the CryptContext and picks the bcrypt backend."""
+    from backend.services.auth_service import get_pwd_context
+    get_pwd_context().handler("bcrypt").get_backend()
+    return os.getpid()
+
+def warm_pool(pool, workers: int, warm):
+    """Starts the pool's worker processes (and the forkserver that preloads their imports) and warms each one."""
+    list(pool.map(warm, range(workers)))
+
+# Independent of each other, so they run concurrently; scikit-learn, PyMuPDF and passlib load in the forkserver
+# behind the process pools, never in the API process
+STEPS = [
+    ("cpu_pool", lambda: warm_pool(get_cpu_pool(), CPU_WORKERS, _warm_cpu_worker)),
+    ("auth_pool", lambda: warm_pool(get_auth_pool(), AUTH_WORKERS, _warm_auth_worker)),
+    ("pdf_parser", warm_pdf_parser),
+    ("database", warm_database),
+    ("html_parser", warm_html_parser),
+    ("gemini_client", warm_gemini_client),
+]
+# External services: while these fail the API still reports ready (as degraded); each request surfaces its own error
+OPTIONAL_STEPS = {"database", "gemini_client"}
+
+# name -> {"state": "cold" | "warming" | "warm" | "failed", "seconds": float, "error": str, "retrying": bool}
+_status = {name: {"state": "cold"} for name, _ in STEPS}
+_started = None
+_finished = None
+
+async def _run_step(name: str, warm, attempt: int) -> bool:
+    if attempt == 1:
+        _status[name] = {"state": "warming", "attempts": attempt}
+    else:
+        # A retry keeps reporting the last failure until it succeeds, so degraded/ready do not flip in between
+        previous = {key: value for key, value in _status[name].items() if key != "retry_in"}
+        _status[name] = {**previous, "retrying": True, "attempts": attempt}
+    start = time.perf_counter()
+    try:
+        with stage(f"prewarm_{name}"):
+            await run_blocking(warm)
+    except Exception as e:
+        _status[name] = {"state": "failed", "seconds": round(time.perf_counter() - start, 3), "error": str(e), "attempts": attempt}
+        return False
+    _status[name] = {"state": "warm", "seconds": round(time.perf_counter() - start, 3), "attempts": attempt}
+    return True
+
+async def _warm_step(name: str, warm, retry: bool):
+    attempt = 1
+    # A transient failure (database not up yet) must not leave the step failed for the life of the process
+    while not await _run_step(name, warm, attempt) and retry:
+        delay = random.uniform(0, min(PREWARM_RETRY_CAP, PREWARM_RETRY_BASE * (2 ** min(attempt, 16))))
+        _status[name]["retry_in"] = round(delay, 3)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+async def prewarm(steps: list = STEPS, retry: bool = True):
+    """Runs every warm-up step on the I/O pool. A failed step is recorded, never raised.
+
+    With retry, failed steps are tried again until they succeed, so the call returns once everything is warm;
+    without, it returns after one attempt per step.
+    """
+    global _started, _finished
+    _started = time.time()
+    _finished = None
+    await asyncio.gather(*(_warm_step(name, warm, retry) for name, warm in steps))
+    _finished = time.time()
+
+def start_prewarm():
+    """Schedules prewarm() on the running loop and returns the task, or None when PREWARM=0."""
+    if not PREWARM:
+        return None
+    return asyncio.get_running_loop().create_task(prewarm())
+
+def readiness() -> dict:
+    """Which subsystems are warm. Ready once every required step is warm (or right away when prewarming is off);
+    optional steps that are failing (and being retried) are listed under degraded."""
+    ready = not PREWARM or all(status["state"] == "warm" for name, status in _status.items() if name not in OPTIONAL_STEPS)
+    return {
+        "ready": ready,
+        "degraded": sorted(name for name in OPTIONAL_STEPS if _status[name]["state"] == "failed"),
+        "prewarm": PREWARM,
+        "warming_seconds": round((_finished or time.time()) - _started, 3) if _started else None,
+        "subsystems": {name: dict(status) for name, status in _status.items()},
+    }
+
+register_gauge("subsystem_warm", "1 once a subsystem has been prewarmed.", lambda: {name: int(status["state"] == "warm") for name, status in _status.items()}, label="subsystem")
@@ -0,0 +1,189 @@
+import sys
+import os
+import re
+import json
+import time
+import uuid
+import asyncio
+from collections import OrderedDict, deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.llm_gateway import LLMUpstreamError
+
+# Bank tuning. Sessions live in this worker's memory, so multi-worker deployments need sticky sessions.
+QUESTION_BATCH_SIZE = int(os.environ.get("QUESTION_BATCH_SIZE", "6"))
+# Start a background refill once this many unanswered questions are left
+QUESTION_BANK_LOW_WATER = int(os.environ.get("QUESTION_BANK_LOW_WATER", "2"))
+# Stop refilling a session after this many questions (one interview, not an endless quiz)
+QUESTION_BANK_MAX_QUESTIONS = int(os.environ.get("QUESTION_BANK_MAX_QUESTIONS", "30"))
+SESSION_TTL = float(os.environ.get("SESSION_TTL", str(2 * 3600)))
+MAX_SESSIONS = int(os.environ.get("MAX_SESSIONS", "1000"))
+
+# "1. ...", "2) ...", "- ...", "* ..." list markers a model may use instead of JSON
+LIST_MARKER = re.compile(r'^\s*(?:\d+[.)]|[-*•])\s+')
+
+def parse_questions(text: str) -> list:
+    """Extracts a list of questions from a model reply: a JSON array if present, else a numbered/bulleted list."""
+    # 1. JSON array, possibly wrapped in a ```json fence or surrounded by chatter
+    start, end = text.find("["), text.rfind("]")
+    if start != -1 and end > start:
+        try:
+            items = json.loads(text[start:end + 1])
+            questions = [str(item).strip() for item in items if str(item).strip()]
+            if questions:
+                return questions
+        except ValueError:
+            pass
+
+    # 2. One question per list item (continuation lines are folded into the previous item)
+    questions = []
+    for line in text.splitlines():
+        line = line.strip().strip("`")
+        if not line:
+            continue
+        if LIST_MARKER.match(line):
+            questions.append(LIST_MARKER.sub("", line))
+        elif questions:
+            questions[-1] += " " + line
+    return [q.strip() for q in questions if q.strip()]
+
+class QuestionBank:
+    """Per-session queues of pre-generated interview questions, refilled in the background when they run low.
+
+    `generate_batch(job_role, skills, count, avoid)` is the async LLM call that returns a list of questions.
+    """
+
+    def __init__(self, generate_batch, batch_size: int = QUESTION_BATCH_SIZE, low_water: int = QUESTION_BANK_LOW_WATER,
+                 max_questions: int = QUESTION_BANK_MAX_QUESTIONS, ttl: float = SESSION_TTL, max_sessions: int = MAX_SESSIONS):
+        self.generate_batch = generate_batch
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.max_questions = max_questions
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict() # session_id -> session dict
+        self.counters = {"sessions": 0, "served_from_bank": 0, "served_after_wait": 0, "batches": 0,
+                         "refills": 0, "refill_errors": 0, "expired": 0}
+        self._wait_seconds = 0.0
+
+    def _evict(self):
+        cutoff = time.time() - self.ttl
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and session["last_used"] >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+            self._cancel(session)
+            self.counters["expired"] += 1
+
+    @staticmethod
+    def _cancel(session: dict):
+        task = session["refill"]
+        if task is not None and not task.done():
+            task.cancel()
+
+    def get(self, session_id: str):
+        """Returns the live session dict, or None if it is unknown or expired."""
+        self._evict()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session["last_used"] = time.time()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def create(self, job_role: str, missing_skills: list) -> str:
+        """Registers a session and immediately starts generating its first batch in the background."""
+        self._evict()
+        session_id = uuid.uuid4().hex
+        self._sessions[session_id] = {
+            "job_role": job_role,
+            "skills": list(missing_skills),
+            "queue": deque(),
+            "asked": [],
+            "refill": None,
+            "error": None,
+            "last_used": time.time(),
+        }
+        self.counters["sessions"] += 1
+        self._start_refill(self._sessions[session_id])
+        return session_id
+
+    def _start_refill(self, session: dict):
+        # At most one generation in flight per session, and never past the per-interview cap
+        if session["refill"] is not None and not session["refill"].done():
+            return
+        if len(session["asked"]) + len(session["queue"]) >= self.max_questions:
+            return
+        if session["asked"]:
+            self.counters["refills"] += 1
+        session["refill"] = asyncio.ensure_future(self._refill(session))
+
+    async def _refill(self, session: dict):
+        known = set(session["asked"]) | set(session["queue"])
+        try:
+            questions = await self.generate_batch(
+                session["job_role"], session["skills"], self.batch_size, session["asked"] + list(session["queue"])
+            )
+            session["error"] = None
+        except Exception as e:
+            # Surfaced to the next caller that finds the bank empty; the next call retries
+            session["error"] = e
+            self.counters["refill_errors"] += 1
+            return
+        self.counters["batches"] += 1
+        for question in questions:
+            if question not in known:
+                known.add(question)
+                session["queue"].append(question)
+
+    async def next_question(self, session_id: str):
+        """Pops the next question, instantly when banked.
+
+        Returns (question, remaining), (None, 0) once the interview's question cap is reached,
+        or None for an unknown or expired session.
+        """
+        session = self.get(session_id)
+        if session is None:
+            return None
+
+        # 1. Empty bank: wait for the in-flight generation (or start one) instead of failing
+        waited = not session["queue"]
+        if waited:
+            if len(session["asked"]) >= self.max_questions:
+                return None, 0
+            start = time.perf_counter()
+            self._start_refill(session)
+            # Shielded: a client that disconnects must not cancel a batch other turns will use
+            await asyncio.shield(session["refill"])
+            if not session["queue"]:
+                raise session["error"] or LLMUpstreamError("Gemini returned no usable questions.")
+            self.counters["served_after_wait"] += 1
+            self._wait_seconds += time.perf_counter() - start
+        else:
+            self.counters["served_from_bank"] += 1
+
+        question = session["queue"].popleft()
+        session["asked"].append(question)
+
+        # 2. Running low: top the bank up in the background while the candidate is answering
+        if len(session["queue"]) <= self.low_water:
+            self._start_refill(session)
+        return question, len(session["queue"])
+
+    def stats(self) -> dict:
+        served = self.counters["served_from_bank"] + self.counters["served_after_wait"]
+        return {
+            **self.counters,
+            "active_sessions": len(self._sessions),
+            "bank_hit_ratio": round(self.counters["served_from_bank"] / served, 4) if served else 0.0,
+            "avg_wait_ms": round(self._wait_seconds * 1000 / self.counters["served_after_wait"], 1)
+            if self.counters["served_after_wait"] else 0.0,
+        }
+
+    async def close(self):
+        """Cancels background refills (called on shutdown)."""
+        tasks = [s["refill"] for s in self._sessions.values() if s["refill"] is not None and not s["refill"].done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._sessions.clear()
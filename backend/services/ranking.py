@@ -0,0 +1,32 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.ml_engine import score_resumes, missing_skills_batch, merge_top_k, ranked_from_heap
+from backend.services.workers import run_cpu_bound, CPU_WORKERS
+
+async def rank_resumes(resume_texts: list, job_description: str, top_k: int = 10, chunk_size: int = 500):
+    """Ranks resumes against one (cleaned) JD, yielding progress events and then the ranked top-k.
+
+    What /api/rank streams: chunks are scored on the process pool, at most CPU_WORKERS in flight, and only a
+    top-k heap is kept. Candidate events carry the resume's index in resume_texts.
+    """
+    # 1. Score a window of chunks at a time, folding each into the heap
+    heap = []
+    total = len(resume_texts)
+    offsets = list(range(0, total, chunk_size))
+    for window_start in range(0, len(offsets), CPU_WORKERS):
+        window = offsets[window_start:window_start + CPU_WORKERS]
+        chunk_scores = await asyncio.gather(
+            *(run_cpu_bound(score_resumes, resume_texts[offset:offset + chunk_size], job_description) for offset in window)
+        )
+        for offset, scores in zip(window, chunk_scores):
+            merge_top_k(heap, scores, offset, top_k)
+        yield {"event": "progress", "processed": min(window[-1] + chunk_size, total), "total": total}
+
+    # 2. Missing skills only for the winners
+    ranked = ranked_from_heap(heap)
+    missing = await run_cpu_bound(missing_skills_batch, [resume_texts[i] for _, i in ranked], job_description)
+    for rank, ((score, index), skills) in enumerate(zip(ranked, missing), start=1):
+        yield {"event": "candidate", "rank": rank, "index": index, "match_score": round(score, 2), "missing_skills": skills}
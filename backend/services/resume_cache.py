@@ -0,0 +1,142 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Cache tuning. Set RESUME_CACHE_PATH to an empty string to keep the cache in memory only
+# (and RESUME_CACHE_MEMORY_SIZE=0 as well to turn it off).
+RESUME_CACHE_PATH = os.environ.get("RESUME_CACHE_PATH", "resume_cache.sqlite3")
+RESUME_CACHE_MEMORY_SIZE = int(os.environ.get("RESUME_CACHE_MEMORY_SIZE", "256"))
+RESUME_CACHE_MAX_ROWS = int(os.environ.get("RESUME_CACHE_MAX_ROWS", "5000"))
+# Resumes are personal data: parses nobody has re-uploaded for this long are dropped
+RESUME_CACHE_TTL = float(os.environ.get("RESUME_CACHE_TTL", str(30 * 24 * 3600)))
+
+# Bump whenever PDF extraction or clean_text changes output, so older parses are never served
+PARSER_VERSION = "1"
+
+def resume_key(pdf_bytes: bytes) -> str:
+    """SHA-256 of the uploaded bytes, salted with the parser version."""
+    digest = hashlib.sha256(PARSER_VERSION.encode())
+    digest.update(b"\0")
+    digest.update(pdf_bytes)
+    return digest.hexdigest()
+
+class ParsedResumeCache:
+    """Two-tier (in-process LRU + SQLite) cache of cleaned resume text, keyed by the hash of the PDF bytes."""
+
+    def __init__(self, path: str = RESUME_CACHE_PATH, memory_size: int = RESUME_CACHE_MEMORY_SIZE,
+                 max_rows: int = RESUME_CACHE_MAX_ROWS, ttl: float = RESUME_CACHE_TTL):
+        self.path = path
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self._memory = OrderedDict() # key -> {"text", "pages"}
+        self._lock = threading.Lock()
+        self._db = None
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._parse_seconds = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Opened on first use, so importing the module never creates the file
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            # API processes and analyze workers share the file
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS resume_cache ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, pages INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS resume_cache_last_used ON resume_cache (last_used)")
+            self._db.commit()
+        return self._db
+
+    def _remember(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        """Returns {"text", "pages"} for a previously parsed upload, or None."""
+        with self._lock:
+            # 1. In-process tier
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return entry
+
+            # 2. SQLite tier (parses stored by other workers or before a restart), promoted on a hit
+            row = None
+            if self.path:
+                now = time.time()
+                row = self._connect().execute(
+                    "SELECT text, pages FROM resume_cache WHERE key = ? AND last_used >= ?", (key, now - self.ttl)
+                ).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            self._db.execute("UPDATE resume_cache SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            entry = {"text": row[0], "pages": row[1]}
+            self._remember(key, entry)
+            self._counters["disk_hits"] += 1
+            return entry
+
+    def lookup(self, pdf_bytes: bytes) -> tuple:
+        """Hashes an upload and looks it up in one call (for run_blocking). Returns (key, entry or None)."""
+        key = resume_key(pdf_bytes)
+        return key, self.get(key)
+
+    def put(self, key: str, text: str, pages: int, parse_seconds: float = 0.0):
+        """Stores the cleaned text of a successful parse and what the parse cost."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, {"text": text, "pages": pages})
+            self._counters["stores"] += 1
+            self._parse_seconds += parse_seconds
+            if self.path:
+                db = self._connect()
+                db.execute(
+                    "INSERT OR REPLACE INTO resume_cache (key, text, pages, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, text, pages, now, now),
+                )
+                # Eviction: drop parses idle past the TTL, then the least recently used beyond max_rows
+                db.execute("DELETE FROM resume_cache WHERE last_used < ?", (now - self.ttl,))
+                db.execute(
+                    "DELETE FROM resume_cache WHERE rowid IN (SELECT rowid FROM resume_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+                db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            parse_seconds = self._parse_seconds
+            entries = len(self._memory)
+            rows = self._connect().execute("SELECT COUNT(*) FROM resume_cache").fetchone()[0] if self.path else None
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        avg_parse_ms = parse_seconds * 1000 / counters["stores"] if counters["stores"] else 0.0
+        return {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "avg_parse_ms": round(avg_parse_ms, 1),
+            # Every hit skipped one extraction + clean_text of average length
+            "estimated_saved_ms": round(hits * avg_parse_ms, 1),
+            "memory_entries": entries,
+            "disk_rows": rows,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+# Shared by /api/analyze, analyze jobs and bulk ingestion (never imported by the process pool workers)
+resume_cache = ParsedResumeCache()
@@ -1,33 +1,130 @@
-import requests
-from bs4 import BeautifulSoup
+import sys
+import os
+import time
+import asyncio
+import httpx
+import importlib.util
+from urllib.parse import urlsplit
 import re
 
-def scrape_job_description(url: str) -> str:
-    """Fetches and extracts raw text from a job posting URL."""
-    try:
-        # We use a User-Agent header so websites don't immediately block us as a basic bot.
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.workers import run_blocking
+from backend.services.jd_cache import JobDescriptionCache
+from backend.services.telemetry import stage, record_external, status_outcome
 
-        #Send the GET request to the website
+# We use a User-Agent header so websites don't immediately block us as a basic bot.
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
 
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status() # This throws an error if the site blocks us (e.g. 404 or 403)
+# Hard cap on how much of a job page we download and parse
+MAX_JD_BYTES = int(os.environ.get("MAX_JD_BYTES", str(2 * 1024 * 1024)))
+
+# Boilerplate subtrees that never contain the job description
+SKIP_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'nav', 'head', 'iframe']
+
+# Prefer the C-backed lxml parser when it is installed; fall back to the stdlib parser.
+# Only checked here: lxml and BeautifulSoup themselves are imported on the first extraction.
+HTML_PARSER = 'lxml' if importlib.util.find_spec("lxml") is not None else 'html.parser'
+
+# One pooled HTTP session and one cache per process
+_session = None
+jd_cache = JobDescriptionCache()
+
+def get_http_session() -> httpx.AsyncClient:
+    """Returns the shared keep-alive HTTP session used for every job page fetch."""
+    global _session
+    if _session is None:
+        _session = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=10,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+    return _session
+
+async def close_http_session():
+    """Closes the shared session. Called from the FastAPI shutdown hook."""
+    global _session
+    if _session is not None:
+        await _session.aclose()
+        _session = None
+
+def extract_job_text(html, max_bytes: int = MAX_JD_BYTES) -> str:
+    """Parses raw HTML once and returns every visible text node exactly once, in document order."""
+    #Never parse more than the byte cap, whatever the caller hands us
+    if isinstance(html, str):
+        html = html.encode('utf-8', errors='ignore')
+    html = html[:max_bytes]
 
-        #Parse the HTML structure
-        soup = BeautifulSoup(response.text, 'html.parser')
+    #Parse the HTML structure
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, HTML_PARSER)
 
-        #Extract text specifically from paragraphs, lists, and headers
-        text_elements = soup.find_all(['p', 'li', 'h1', 'h2', 'h3', 'div'])
-        raw_text = " ".join([elem.get_text(separator=' ', strip = True) for elem in text_elements])
+    #Drop boilerplate subtrees (scripts, styles, navigation) before walking the tree
+    for tag in soup(SKIP_TAGS):
+        tag.decompose()
 
-        #Basic cleanup (we will pass this to our pandas cleaner later for deep cleaning)
-        clean_text = re.sub(r'\s+', ' ', raw_text).strip()
+    #One pass over the text nodes: nested containers no longer repeat their children's text
+    raw_text = " ".join(soup.stripped_strings)
+
+    #Basic cleanup (we will pass this to our pandas cleaner later for deep cleaning)
+    return re.sub(r'\s+', ' ', raw_text).strip()
+
+async def fetch_capped(url: str, request_headers: dict, max_bytes: int = MAX_JD_BYTES):
+    """Streams a GET response and stops reading once max_bytes have arrived."""
+    async with get_http_session().stream("GET", url, headers=request_headers) as response:
+        chunks = []
+        total = 0
+        async for chunk in response.aiter_bytes():
+            chunks.append(chunk)
+            total += len(chunk)
+            if total >= max_bytes:
+                break
+        return response, b"".join(chunks)[:max_bytes]
+
+async def scrape_job_description(url: str) -> str:
+    """Returns the job description text for a URL, served from cache or revalidated with a conditional GET."""
+    start = time.perf_counter()
+    try:
+        # 1. Fresh cache entries cost nothing
+        entry = await run_blocking(jd_cache.get, url)
+        if entry is not None and jd_cache.is_fresh(entry):
+            jd_cache.record("hits", time.perf_counter() - start)
+            return entry["text"]
+
+        # 2. Stale entries are revalidated with their validators, so an unchanged page costs a 304
+        request_headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        #Send the GET request over the pooled session (body capped at MAX_JD_BYTES)
+        host = urlsplit(url).hostname or "unknown"
+        sent = time.perf_counter()
+        try:
+            response, body = await fetch_capped(url, request_headers)
+        except Exception:
+            record_external("scraper", host, "error", time.perf_counter() - sent)
+            raise
+        record_external("scraper", host, status_outcome(response.status_code), time.perf_counter() - sent)
+        if response.status_code == 304 and entry is not None:
+            await run_blocking(jd_cache.put, url, entry["text"], entry.get("etag"), entry.get("last_modified"))
+            jd_cache.record("revalidated", time.perf_counter() - start)
+            return entry["text"]
+        response.raise_for_status() # This throws an error if the site blocks us (e.g. 404 or 403)
 
-        return clean_text
+        # 3. HTML parsing is CPU work, so it runs on the I/O thread pool instead of the event loop
+        with stage("html_extract"):
+            text = await run_blocking(extract_job_text, body)
+        await run_blocking(jd_cache.put, url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        jd_cache.record("refreshed" if entry is not None else "misses", time.perf_counter() - start)
+        return text
     
     except Exception as e:
+        jd_cache.record("errors")
         return f"Failed to scrape URL. Error: {str(e)}"
 
 # ---TEST BLOCK---
@@ -37,9 +134,9 @@ if __name__ == "__main__":
     
     print(f"1. Attempting to scrape: {test_url}\n")
     
-    result = scrape_job_description(test_url)
+    result = asyncio.run(scrape_job_description(test_url))
     
     print("--- SCRAPED TEXT (First 500 characters) ---")
     print(result[:500])
     print("\n-------------------------------------------")
-    print("Status: Web Scraping Complete.")
\ No newline at end of file
+    print("Status: Web Scraping Complete.")
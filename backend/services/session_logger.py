@@ -0,0 +1,276 @@
+import sys
+import os
+import glob
+import json
+import time
+import random
+import asyncio
+import logging
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.workers import run_blocking
+from backend.services.telemetry import stage
+
+# Write-behind tuning (per worker process)
+SESSION_LOG_QUEUE_SIZE = int(os.environ.get("SESSION_LOG_QUEUE_SIZE", "1000"))
+SESSION_LOG_BATCH_SIZE = int(os.environ.get("SESSION_LOG_BATCH_SIZE", "50"))
+# How long the drain task waits to fill a batch once the first session has arrived
+SESSION_LOG_FLUSH_INTERVAL = float(os.environ.get("SESSION_LOG_FLUSH_INTERVAL", "0.5"))
+SESSION_LOG_MAX_RETRIES = int(os.environ.get("SESSION_LOG_MAX_RETRIES", "5"))
+SESSION_LOG_BACKOFF_BASE = float(os.environ.get("SESSION_LOG_BACKOFF_BASE", "0.5"))
+SESSION_LOG_BACKOFF_CAP = float(os.environ.get("SESSION_LOG_BACKOFF_CAP", "30"))
+# When the queue is full: "block" waits up to SESSION_LOG_BLOCK_TIMEOUT for room (then spills),
+# "spill" appends to SESSION_LOG_SPILL_PATH straight away. Spilled sessions are replayed on the next start.
+SESSION_LOG_OVERFLOW = os.environ.get("SESSION_LOG_OVERFLOW", "block")
+SESSION_LOG_BLOCK_TIMEOUT = float(os.environ.get("SESSION_LOG_BLOCK_TIMEOUT", "5"))
+SESSION_LOG_SPILL_PATH = os.environ.get("SESSION_LOG_SPILL_PATH", "session_log_spill.jsonl")
+
+logger = logging.getLogger(__name__)
+
+def _abandoned(replaying_path: str) -> bool:
+    """True for a .replaying file whose owner is gone (crashed mid-replay) or that predates per-process names."""
+    suffix = replaying_path.rsplit(".replaying", 1)[1].lstrip(".")
+    if not suffix.isdigit():
+        return True
+    pid = int(suffix)
+    if pid == os.getpid():
+        # Ours from an earlier life of this pid (e.g. a restarted container); this process has not replayed yet
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # Exists but belongs to someone else
+        return False
+    return False
+
+class SessionLogger:
+    """Bounded write-behind queue of interview sessions, drained in batches by one background task.
+
+    `write_batch(sessions)` is the blocking multi-row insert (run on the I/O pool); it must raise on failure.
+    `after_write(sessions)`, if given, is awaited in the background once a batch is written (never holding up
+    the next flush); it must not raise.
+    """
+
+    def __init__(self, write_batch, queue_size: int = SESSION_LOG_QUEUE_SIZE, batch_size: int = SESSION_LOG_BATCH_SIZE,
+                 flush_interval: float = SESSION_LOG_FLUSH_INTERVAL, max_retries: int = SESSION_LOG_MAX_RETRIES,
+                 backoff_base: float = SESSION_LOG_BACKOFF_BASE, backoff_cap: float = SESSION_LOG_BACKOFF_CAP,
+                 overflow: str = SESSION_LOG_OVERFLOW, block_timeout: float = SESSION_LOG_BLOCK_TIMEOUT,
+                 spill_path: str = SESSION_LOG_SPILL_PATH, after_write=None):
+        if overflow not in ("block", "spill"):
+            raise ValueError("SESSION_LOG_OVERFLOW must be 'block' or 'spill'")
+        self.write_batch = write_batch
+        self.after_write = after_write
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.spill_path = spill_path
+        self._queue = None
+        self._task = None
+        self._replay_task = None
+        self._follow_ups = set()
+        self._closing = False
+        self.counters = {"enqueued": 0, "written": 0, "batches": 0, "retries": 0, "failed_batches": 0,
+                         "spilled": 0, "replayed": 0, "blocked": 0}
+        self._flush_seconds = 0.0
+        self._flush_max = 0.0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so it binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+        return self._queue
+
+    def start(self):
+        """Starts the drain task (idempotent) and queues sessions spilled by a previous run for replay."""
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._task = asyncio.ensure_future(self._drain())
+            if self.spill_path:
+                self._replay_task = asyncio.ensure_future(self._replay_spill())
+
+    async def enqueue(self, session: dict):
+        """Hands a session to the background writer; returns as soon as it is queued (or spilled)."""
+        self.start()
+        self.counters["enqueued"] += 1
+        try:
+            self.queue.put_nowait(session)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # Overflow policy
+        if self.overflow == "block" and not self._closing:
+            self.counters["blocked"] += 1
+            try:
+                await asyncio.wait_for(self.queue.put(session), timeout=self.block_timeout)
+                return
+            except asyncio.TimeoutError:
+                pass
+        await run_blocking(self._spill, [session])
+
+    def _spill(self, sessions: list):
+        """Appends sessions to the local spill file (JSON lines) so they survive a full queue or a DB outage."""
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for session in sessions:
+                f.write(json.dumps(session) + "\n")
+        self.counters["spilled"] += len(sessions)
+
+    def _claim_spill(self) -> list:
+        """Takes over the spill file (and any left mid-replay by a crashed process) and returns its sessions."""
+        # Rename first, so sessions spilled while we replay go to a fresh file. The name is per process:
+        # workers starting together each claim different files, and only the winner of a rename reads it.
+        mine = f"{self.spill_path}.replaying.{os.getpid()}"
+        leftovers = [path for path in glob.glob(glob.escape(self.spill_path) + ".replaying*") if _abandoned(path)]
+        sessions = []
+        for path in [self.spill_path] + leftovers:
+            try:
+                os.replace(path, mine)
+            except FileNotFoundError:
+                # Nothing spilled, or another worker claimed it first
+                continue
+            with open(mine, encoding="utf-8") as f:
+                for number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        sessions.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A write cut short by a crash
+                        logger.warning("Skipping unreadable line %d of %s", number, path)
+            os.remove(mine)
+        return sessions
+
+    async def _replay_spill(self):
+        """Queues sessions spilled by a previous run; the file work happens on the I/O pool."""
+        try:
+            sessions = await run_blocking(self._claim_spill)
+        except OSError as e:
+            logger.error("Could not replay spilled sessions from %s: %s", self.spill_path, e)
+            return
+        no_room = []
+        for session in sessions:
+            try:
+                self.queue.put_nowait(session)
+            except asyncio.QueueFull:
+                # No room right now: back to the spill file for the next start
+                no_room.append(session)
+                continue
+            self.counters["replayed"] += 1
+        if no_room:
+            await run_blocking(self._spill, no_room)
+
+    async def _next_batch(self) -> list:
+        """Waits for one session, then collects up to batch_size more for at most flush_interval."""
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - asyncio.get_running_loop().time()
+            try:
+                batch.append(self.queue.get_nowait() if remaining <= 0 or self._closing
+                             else await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return batch
+
+    async def _write(self, batch: list):
+        """One multi-row insert with jittered exponential backoff; spills the batch when retries run out.
+
+        Spills only batches known not to be in the database: replaying a written batch would insert it twice.
+        """
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            # Shielded: the insert carries on in its thread even if shutdown cancels us
+            write = asyncio.ensure_future(run_blocking(self.write_batch, batch))
+            try:
+                with stage("session_log_flush"):
+                    await asyncio.shield(write)
+            except asyncio.CancelledError:
+                # Shutdown timed out mid-write: wait for the thread to learn whether the rows went in
+                await asyncio.wait([write])
+                if write.exception() is None:
+                    self._record_flush(batch, start)
+                else:
+                    self._spill(batch)
+                raise
+            except Exception as e:
+                if attempt == self.max_retries or self._closing:
+                    self.counters["failed_batches"] += 1
+                    logger.error("Session log batch of %d failed (%s); spilling to %s", len(batch), e, self.spill_path)
+                    await asyncio.shield(run_blocking(self._spill, batch))
+                    return
+                self.counters["retries"] += 1
+                try:
+                    await asyncio.sleep(random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt))))
+                except asyncio.CancelledError:
+                    # Between attempts: certainly not written
+                    self._spill(batch)
+                    raise
+                continue
+            self._record_flush(batch, start)
+            return
+
+    def _record_flush(self, batch: list, start: float):
+        self.counters["written"] += len(batch)
+        self.counters["batches"] += 1
+        elapsed = time.perf_counter() - start
+        self._flush_seconds += elapsed
+        self._flush_max = max(self._flush_max, elapsed)
+        if self.after_write is not None:
+            task = asyncio.ensure_future(self.after_write(batch))
+            self._follow_ups.add(task)
+            task.add_done_callback(self._follow_ups.discard)
+
+    async def _drain(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                # Cancellation mid-batch is handled inside _write, which knows whether the batch was written
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def close(self, timeout: float = 30.0):
+        """Flushes everything still queued (called on shutdown); whatever cannot be written in time is spilled."""
+        if self._task is None:
+            return
+        self._closing = True
+        if self._replay_task is not None:
+            await asyncio.gather(self._replay_task, return_exceptions=True)
+            self._replay_task = None
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        # Let the follow-ups of written batches finish while the pools are still up
+        if self._follow_ups:
+            await asyncio.wait(set(self._follow_ups), timeout=timeout)
+        leftovers = []
+        while not self.queue.empty():
+            leftovers.append(self.queue.get_nowait())
+            self.queue.task_done()
+        if leftovers:
+            self._spill(leftovers)
+
+    def stats(self) -> dict:
+        batches = self.counters["batches"]
+        return {
+            **self.counters,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self.queue_size,
+            "overflow": self.overflow,
+            "avg_flush_ms": round(self._flush_seconds * 1000 / batches, 1) if batches else 0.0,
+            "max_flush_ms": round(self._flush_max * 1000, 1),
+            "avg_batch_size": round(self.counters["written"] / batches, 2) if batches else 0.0,
+        }
@@ -0,0 +1,429 @@
+import sys
+import os
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timezone
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.ml_engine import fit_embedder, embed_texts, embed_with_saved, save_embedder
+from backend.services.document_store import content_hash
+from backend.services.workers import run_blocking, run_cpu_bound, get_cpu_pool
+
+# The index directory: the fitted TF-IDF/SVD embedder, one float32 vector file per index and a SQLite file of
+# row metadata. Built by `python -m backend.rebuild_similar_index`, then kept current as sessions are logged.
+SIMILAR_INDEX_PATH = os.environ.get(
+    "SIMILAR_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "similar_index"),
+)
+# Embedding size chosen at rebuild time (more dimensions: closer to plain TF-IDF neighbours, slower queries)
+SIMILAR_INDEX_DIMS = int(os.environ.get("SIMILAR_INDEX_DIMS", "128"))
+# Rows scored per matrix product; bounds a query batch's temporary score matrix to queries x this many floats
+SIMILAR_INDEX_BLOCK_ROWS = int(os.environ.get("SIMILAR_INDEX_BLOCK_ROWS", "32768"))
+SIMILAR_MAX_K = int(os.environ.get("SIMILAR_MAX_K", "50"))
+
+EMBEDDER_FILE = "embedder.joblib"
+META_FILE = "meta.sqlite3"
+INDEXES = ("jobs", "gaps")
+SNIPPET_CHARS = 200
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    # One row per distinct job description (by documents content hash)
+    "CREATE TABLE IF NOT EXISTS jobs (row INTEGER PRIMARY KEY, jd_hash TEXT NOT NULL UNIQUE, job_role TEXT, "
+    "snippet TEXT, created_at TEXT)",
+    # One row per interview session with at least one missing skill
+    "CREATE TABLE IF NOT EXISTS gaps (row INTEGER PRIMARY KEY, candidate_name TEXT, job_role TEXT, match_score REAL, "
+    "missing_skills TEXT, jd_hash TEXT, created_at TEXT)",
+)
+
+logger = logging.getLogger(__name__)
+
+class IndexNotBuiltError(RuntimeError):
+    """Raised by queries before `python -m backend.rebuild_similar_index` has built the index."""
+
+def gap_text(missing_skills: list) -> str:
+    """What a session's skill gaps are embedded as."""
+    return " ".join(missing_skills or [])
+
+def top_k(matrix: np.ndarray, queries: np.ndarray, k: int, block_rows: int = SIMILAR_INDEX_BLOCK_ROWS) -> tuple:
+    """Exact top-k rows by dot product for a batch of queries, best first: (scores, rows), each queries x k.
+
+    One matrix product per block of rows; only each block's own top k (argpartition) is merged with the
+    running best, so memory stays at queries x block_rows whatever the index size.
+    """
+    k = min(k, len(matrix))
+    if k <= 0:
+        return np.empty((len(queries), 0), np.float32), np.empty((len(queries), 0), np.int64)
+    best_scores = np.empty((len(queries), 0), np.float32)
+    best_rows = np.empty((len(queries), 0), np.int64)
+    for start in range(0, len(matrix), block_rows):
+        scores = queries @ matrix[start:start + block_rows].T
+        if scores.shape[1] > k:
+            rows = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(scores, rows, axis=1)
+        else:
+            rows = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        best_scores = np.concatenate([best_scores, scores], axis=1)
+        best_rows = np.concatenate([best_rows, rows + start], axis=1)
+        if best_scores.shape[1] > k:
+            keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+            best_rows = np.take_along_axis(best_rows, keep, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return np.take_along_axis(best_scores, order, axis=1), np.take_along_axis(best_rows, order, axis=1)
+
+class VectorFile:
+    """Append-only float32 matrix in a memory-mapped file. The metadata table says how many rows are live;
+    the file itself grows by doubling, so appends rarely remap."""
+
+    def __init__(self, path: str, dims: int):
+        self.path = path
+        self.dims = dims
+        self._map = None
+        self._capacity = 0
+
+    def _remap(self):
+        capacity = os.path.getsize(self.path) // (4 * self.dims)
+        self._map = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dims)) if capacity else None
+        self._capacity = capacity
+
+    def rows(self, count: int) -> np.ndarray:
+        """The first `count` rows, remapping when another process has grown the file."""
+        if count > self._capacity:
+            self._remap()
+        if not count:
+            return np.empty((0, self.dims), np.float32)
+        return self._map[:count]
+
+    def write(self, start: int, vectors: np.ndarray):
+        """Writes rows [start, start + len(vectors)); callers hold the metadata write lock."""
+        if not len(vectors):
+            return
+        needed = start + len(vectors)
+        if needed > self._capacity:
+            self._remap()
+        if needed > self._capacity:
+            with open(self.path, "r+b") as f:
+                f.truncate(max(needed, 2 * self._capacity, 1024) * 4 * self.dims)
+            self._remap()
+        self._map[start:needed] = vectors
+        self._map.flush()
+
+    def close(self):
+        self._map, self._capacity = None, 0
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def build_index(path: str, jobs: list, gaps: list, dims: int = SIMILAR_INDEX_DIMS, chunk_size: int = 5000) -> dict:
+    """Fits the embedder on the job descriptions and writes a complete index to path, replacing any existing one.
+
+    jobs: dicts of jd_hash, job_role, text, created_at (one per distinct JD). gaps: dicts of candidate_name,
+    job_role, match_score, missing_skills, jd_hash, created_at. Processes using the old index switch over on
+    their next query or append.
+    """
+    # 1. Build next to the live index, so queries keep working until the swap
+    building = f"{path}.building"
+    shutil.rmtree(building, ignore_errors=True)
+    os.makedirs(building)
+    embedder = fit_embedder([job["text"] for job in jobs], dims)
+    save_embedder(embedder, os.path.join(building, EMBEDDER_FILE))
+    dims = embedder["svd"].n_components
+
+    db = sqlite3.connect(os.path.join(building, META_FILE))
+    db.execute("PRAGMA journal_mode=WAL")
+    for statement in SCHEMA:
+        db.execute(statement)
+    # build_id tells an append whose embedding straddled a rebuild that its vectors belong to the old index
+    db.executemany("INSERT INTO info (key, value) VALUES (?, ?)",
+                   [("dims", str(dims)), ("built_at", _now()), ("build_id", uuid.uuid4().hex)])
+
+    # 2. Embed in chunks straight into the vector files
+    gaps = [gap for gap in gaps if gap["missing_skills"]]
+    for name, items, text_of in (("jobs", jobs, lambda job: job["text"]), ("gaps", gaps, lambda gap: gap_text(gap["missing_skills"]))):
+        vector_path = os.path.join(building, f"{name}.f32")
+        open(vector_path, "wb").close()
+        vectors = VectorFile(vector_path, dims)
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            vectors.write(start, embed_texts(embedder, [text_of(item) for item in chunk]))
+        vectors.close()
+    db.executemany(
+        "INSERT INTO jobs (row, jd_hash, job_role, snippet, created_at) VALUES (?, ?, ?, ?, ?)",
+        ((row, job["jd_hash"], job.get("job_role"), job["text"][:SNIPPET_CHARS], job.get("created_at")) for row, job in enumerate(jobs)),
+    )
+    db.executemany(
+        "INSERT INTO gaps (row, candidate_name, job_role, match_score, missing_skills, jd_hash, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        ((row, gap.get("candidate_name"), gap.get("job_role"), gap.get("match_score"), json.dumps(gap["missing_skills"]),
+          gap.get("jd_hash"), gap.get("created_at")) for row, gap in enumerate(gaps)),
+    )
+    db.commit()
+    db.close()
+
+    # 3. Swap directories (a rename each, so readers see the old index or the new one, never half of one)
+    retired = f"{path}.old"
+    shutil.rmtree(retired, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, retired)
+    os.replace(building, path)
+    shutil.rmtree(retired, ignore_errors=True)
+    return {"jobs": len(jobs), "gaps": len(gaps), "dims": dims}
+
+class SimilarityIndex:
+    """Nearest-neighbour search over stored job descriptions ("jobs") and interview skill gaps ("gaps").
+
+    Vectors are memory-mapped and shared by every process on the host; appends take the SQLite write lock,
+    so API workers and analyze workers can all index the sessions they log.
+    """
+
+    def __init__(self, path: str = SIMILAR_INDEX_PATH, block_rows: int = SIMILAR_INDEX_BLOCK_ROWS):
+        self.path = path
+        self.block_rows = block_rows
+        self.dims = None
+        self.build_id = None
+        self._lock = threading.Lock()
+        self._db = None
+        self._vectors = {}
+        self._identity = None
+        self.counters = {"queries": 0, "appended_jobs": 0, "appended_gaps": 0, "append_errors": 0, "appends_skipped": 0}
+        self._query_seconds = 0.0
+
+    @property
+    def embedder_path(self) -> str:
+        return os.path.join(self.path, EMBEDDER_FILE)
+
+    def _open(self) -> bool:
+        """(Re)opens the index when a rebuild has swapped in a new one. False while none has been built."""
+        try:
+            identity = os.stat(os.path.join(self.path, META_FILE)).st_ino
+        except FileNotFoundError:
+            self._close_files()
+            return False
+        if identity != self._identity:
+            self._close_files()
+            # Autocommit; appends take the write lock explicitly with BEGIN IMMEDIATE
+            self._db = sqlite3.connect(os.path.join(self.path, META_FILE), check_same_thread=False, timeout=30, isolation_level=None)
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            info = dict(self._db.execute("SELECT key, value FROM info").fetchall())
+            self.dims = int(info["dims"])
+            # Indexes built before build_id existed are told apart by their build time
+            self.build_id = info.get("build_id", info.get("built_at"))
+            self._vectors = {name: VectorFile(os.path.join(self.path, f"{name}.f32"), self.dims) for name in INDEXES}
+            self._identity = identity
+        return True
+
+    def _close_files(self):
+        if self._db is not None:
+            self._db.close()
+        self._db, self._vectors, self._identity, self.build_id = None, {}, None, None
+
+    def _count(self, name: str) -> int:
+        # Rows are numbered from 0 without gaps
+        return self._db.execute(f"SELECT COALESCE(MAX(row) + 1, 0) FROM {name}").fetchone()[0]
+
+    def ready(self) -> bool:
+        with self._lock:
+            return self._open()
+
+    def sizes(self) -> dict:
+        """Rows per index (zeros before the first build)."""
+        with self._lock:
+            if not self._open():
+                return {name: 0 for name in INDEXES}
+            return {name: self._count(name) for name in INDEXES}
+
+    def search(self, name: str, vectors: np.ndarray, k: int) -> list:
+        """Top-k metadata rows (with "score") of index `name` for each query vector."""
+        start = time.perf_counter()
+        with self._lock:
+            if not self._open():
+                raise IndexNotBuiltError("The similarity index has not been built yet (python -m backend.rebuild_similar_index).")
+            matrix = self._vectors[name].rows(self._count(name))
+        # NumPy releases the GIL for the products, so searches on the I/O pool run side by side
+        scores, rows = top_k(matrix, np.asarray(vectors, np.float32), k, self.block_rows)
+        wanted = sorted({int(row) for row in rows.ravel()})
+        if not wanted:
+            return [[] for _ in vectors]
+        with self._lock:
+            cursor = self._db.execute(f"SELECT * FROM {name} WHERE row IN ({','.join('?' * len(wanted))})", wanted)
+            columns = [column[0] for column in cursor.description]
+            meta = {values[0]: dict(zip(columns, values)) for values in cursor.fetchall()}
+            self.counters["queries"] += len(vectors)
+            self._query_seconds += time.perf_counter() - start
+        results = []
+        for query_scores, query_rows in zip(scores, rows):
+            hits = []
+            for score, row in zip(query_scores, query_rows):
+                hit = {**meta[int(row)], "score": round(float(score), 4)}
+                hit.pop("row")
+                if name == "gaps":
+                    hit["missing_skills"] = json.loads(hit["missing_skills"])
+                hits.append(hit)
+            results.append(hits)
+        return results
+
+    def append_sessions(self, sessions: list, jd_hashes: list = None) -> dict:
+        """Indexes freshly logged sessions (dicts of log_interview_session's arguments): each job description not
+        indexed yet, and every session's missing skills. Never raises; the sessions are already saved.
+
+        Blocks on the process pool while embedding; the API indexes through index_sessions instead.
+        """
+        jd_hashes = jd_hashes if jd_hashes is not None else session_jd_hashes(sessions)
+        try:
+            pending = self.prepare_append(sessions, jd_hashes)
+            if pending is None:
+                return {"jobs": 0, "gaps": 0}
+            vectors = get_cpu_pool().submit(embed_with_saved, self.embedder_path, pending["texts"]).result()
+            return self.commit_append(pending, vectors)
+        except Exception as e:
+            self._append_failed(len(sessions), e)
+            return {"jobs": 0, "gaps": 0}
+
+    def prepare_append(self, sessions: list, jd_hashes: list):
+        """What an append has to embed: postings not indexed yet and every session's skill gaps (None if nothing)."""
+        with self._lock:
+            if not self._open():
+                self.counters["appends_skipped"] += len(sessions)
+                return None
+            known = self._known_hashes(jd_hashes)
+            build_id = self.build_id
+        jobs = {}
+        for session, digest in zip(sessions, jd_hashes):
+            if digest and digest not in known and digest not in jobs and session["jd_text"]:
+                jobs[digest] = session
+        gaps = [(session, digest) for session, digest in zip(sessions, jd_hashes) if session["missing_skills"]]
+        texts = [session["jd_text"] for session in jobs.values()] + [gap_text(session["missing_skills"]) for session, _ in gaps]
+        if not texts:
+            return None
+        return {"jobs": jobs, "gaps": gaps, "texts": texts, "build_id": build_id, "sessions": len(sessions)}
+
+    def commit_append(self, pending: dict, vectors: np.ndarray) -> dict:
+        """Allocates rows, writes the embedded vectors, then commits the metadata that makes them visible."""
+        jobs, gaps = pending["jobs"], pending["gaps"]
+        job_vectors, gap_vectors = vectors[:len(jobs)], vectors[len(jobs):]
+        now = _now()
+        with self._lock:
+            if not self._open():
+                return {"jobs": 0, "gaps": 0}
+            if self.build_id != pending["build_id"]:
+                # Rebuilt since prepare_append: these vectors come from the old embedder. The rebuild read
+                # the sessions from the database, so it has them unless they were logged during it.
+                self.counters["appends_skipped"] += pending["sessions"]
+                logger.warning("Similarity index was rebuilt during an append; dropped %d postings and %d skill gaps",
+                               len(jobs), len(gaps))
+                return {"jobs": 0, "gaps": 0}
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # Another process may have indexed the same postings meanwhile
+                known = self._known_hashes(list(jobs))
+                keep = [i for i, digest in enumerate(jobs) if digest not in known]
+                new_jobs = [(digest, jobs[digest]) for digest in (list(jobs)[i] for i in keep)]
+                start = self._count("jobs")
+                self._vectors["jobs"].write(start, job_vectors[keep])
+                db.executemany(
+                    "INSERT INTO jobs (row, jd_hash, job_role, snippet, created_at) VALUES (?, ?, ?, ?, ?)",
+                    ((start + i, digest, session["job_role"], session["jd_text"][:SNIPPET_CHARS], now) for i, (digest, session) in enumerate(new_jobs)),
+                )
+                start = self._count("gaps")
+                self._vectors["gaps"].write(start, gap_vectors)
+                db.executemany(
+                    "INSERT INTO gaps (row, candidate_name, job_role, match_score, missing_skills, jd_hash, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    ((start + i, session.get("candidate_name", "Anonymous"), session["job_role"], session["match_score"],
+                      json.dumps(session["missing_skills"]), digest, now) for i, (session, digest) in enumerate(gaps)),
+                )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            self.counters["appended_jobs"] += len(new_jobs)
+            self.counters["appended_gaps"] += len(gaps)
+        return {"jobs": len(new_jobs), "gaps": len(gaps)}
+
+    def _append_failed(self, count: int, error: Exception):
+        with self._lock:
+            self.counters["append_errors"] += 1
+        logger.error("Similarity index append of %d sessions failed (%s); run python -m backend.rebuild_similar_index to catch up",
+                     count, error)
+
+    def _known_hashes(self, hashes: list) -> set:
+        wanted = [digest for digest in set(hashes) if digest]
+        if not wanted:
+            return set()
+        rows = self._db.execute(f"SELECT jd_hash FROM jobs WHERE jd_hash IN ({','.join('?' * len(wanted))})", wanted)
+        return {row[0] for row in rows}
+
+    def stats(self) -> dict:
+        sizes = self.sizes()
+        with self._lock:
+            counters = dict(self.counters)
+            query_seconds = self._query_seconds
+            built_at = self._db.execute("SELECT value FROM info WHERE key = 'built_at'").fetchone()[0] if self._db else None
+        return {
+            **counters,
+            "built": built_at is not None,
+            "built_at": built_at,
+            "rows": sizes,
+            "dims": self.dims,
+            "avg_query_ms": round(query_seconds * 1000 / counters["queries"], 3) if counters["queries"] else 0.0,
+            "path": self.path,
+        }
+
+    def close(self):
+        with self._lock:
+            self._close_files()
+
+similar_index = SimilarityIndex()
+
+def session_jd_hashes(sessions: list) -> list:
+    """The documents hashes insert_sessions stored each session's job description under (None for no text)."""
+    return [content_hash(session["jd_text"]) if session["jd_text"] else None for session in sessions]
+
+async def index_sessions(sessions: list) -> dict:
+    """Indexes a batch the session logger has just written, as a background step after its insert commits.
+
+    The embedding runs on the process pool without holding an I/O thread, so session flushes never wait on it.
+    Never raises.
+    """
+    try:
+        pending = await run_blocking(similar_index.prepare_append, sessions, session_jd_hashes(sessions))
+        if pending is None:
+            return {"jobs": 0, "gaps": 0}
+        vectors = await run_cpu_bound(embed_with_saved, similar_index.embedder_path, pending["texts"])
+        return await run_blocking(similar_index.commit_append, pending, vectors)
+    except Exception as e:
+        similar_index._append_failed(len(sessions), e)
+        return {"jobs": 0, "gaps": 0}
+
+async def _embed(text: str) -> np.ndarray:
+    if not await run_blocking(similar_index.ready):
+        raise IndexNotBuiltError("The similarity index has not been built yet (python -m backend.rebuild_similar_index).")
+    return await run_cpu_bound(embed_with_saved, similar_index.embedder_path, [text])
+
+async def similar_jobs(job_description: str, top_k: int = 10) -> list:
+    """Stored job descriptions closest to this (cleaned) one, the posting itself left out."""
+    top_k = max(1, min(top_k, SIMILAR_MAX_K))
+    own = content_hash(job_description)
+    hits = (await run_blocking(similar_index.search, "jobs", await _embed(job_description), top_k + 1))[0]
+    return [hit for hit in hits if hit["jd_hash"] != own][:top_k]
+
+async def similar_candidates(missing_skills: list, top_k: int = 10, exclude_candidate: str = None) -> list:
+    """Candidates whose sessions had the closest skill gaps, best session per candidate."""
+    top_k = max(1, min(top_k, SIMILAR_MAX_K))
+    if not missing_skills:
+        return []
+    # A candidate who practiced many times can own several of the nearest rows: over-fetch, keep their best
+    hits = (await run_blocking(similar_index.search, "gaps", await _embed(gap_text(missing_skills)), top_k * 4))[0]
+    seen = {exclude_candidate}
+    candidates = []
+    for hit in hits:
+        if hit["candidate_name"] not in seen:
+            seen.add(hit["candidate_name"])
+            candidates.append(hit)
+    return candidates[:top_k]
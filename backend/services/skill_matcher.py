@@ -0,0 +1,148 @@
+import sys
+import os
+import re
+import heapq
+from collections import Counter, defaultdict, deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.services.data_cleaner import clean_text
+
+# The skill taxonomy ships with the backend; point SKILL_TAXONOMY_PATH elsewhere to swap it
+TAXONOMY_PATH = os.environ.get(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skills.txt"),
+)
+
+# Words as the matcher sees them: "node.js" and "c++" stay whole, trailing dots and commas drop off
+TOKEN_PATTERN = re.compile(r'[a-z0-9+]+(?:\.[a-z0-9+]+)*')
+
+def tokenize(normalized_text: str) -> list:
+    return TOKEN_PATTERN.findall(normalized_text)
+
+def load_taxonomy(path: str = TAXONOMY_PATH) -> dict:
+    """Reads 'canonical | alias | alias' lines into an {alias token tuple: canonical} dict."""
+    patterns = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            names = [name.strip() for name in line.split("|") if name.strip()]
+            canonical = names[0].lower()
+            for name in names:
+                # Normalize exactly like the documents we scan, so "ci/cd" matches cleaned "ci cd"
+                pattern = tuple(tokenize(clean_text(name)))
+                # One-letter patterns ("c#" -> "c") would match everywhere
+                if pattern and len(" ".join(pattern)) > 1:
+                    patterns[pattern] = canonical
+    return patterns
+
+class SkillAutomaton:
+    """Word-level Aho-Corasick automaton that finds every taxonomy skill in one linear pass over the tokens."""
+
+    def __init__(self, patterns: dict):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.aliases = defaultdict(list)
+
+        # 1. Trie of all patterns, one edge per word
+        for pattern, canonical in patterns.items():
+            self.aliases[canonical].append(pattern)
+            state = 0
+            for word in pattern:
+                if word not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][word] = len(self.goto) - 1
+                state = self.goto[state][word]
+            self.output[state].append((len(pattern), canonical))
+
+        # 2. Failure links (breadth first; depth-1 states fall back to the root), inheriting outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(word, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def scan(self, text: str):
+        """Returns (Counter of canonical skills, set of words covered by the matches) for a normalized text."""
+        counts = Counter()
+        covered = set()
+        goto, fail, output = self.goto, self.fail, self.output
+        root = goto[0]
+        # Matching whole tokens means "java" never fires inside "javascript", nor "go" inside "google"
+        tokens = tokenize(text)
+        state = 0
+        for i, word in enumerate(tokens):
+            if state:
+                while state and word not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(word, 0)
+            else:
+                # Fast path: most words in a document do not start any skill
+                state = root.get(word, 0)
+                if not state:
+                    continue
+            for length, canonical in output[state]:
+                counts[canonical] += 1
+                covered.update(tokens[i - length + 1:i + 1])
+        return counts, covered
+
+class ResumeSkillIndex:
+    """Token set plus phrase index of one resume, answering 'does the resume mention skill X?' in O(1)-ish."""
+
+    def __init__(self, text: str, matcher: SkillAutomaton = None):
+        self.matcher = matcher or get_matcher()
+        tokens = tokenize(clean_text(text))
+        self.tokens = set(tokens)
+        # Space-delimited so a phrase lookup can only match on whole-word boundaries
+        self._joined = f" {' '.join(tokens)} "
+
+    def has_phrase(self, pattern: tuple) -> bool:
+        if len(pattern) == 1:
+            return pattern[0] in self.tokens
+        return f" {' '.join(pattern)} " in self._joined
+
+    def __contains__(self, canonical: str) -> bool:
+        return any(self.has_phrase(pattern) for pattern in self.matcher.aliases.get(canonical, ()))
+
+_matcher = None
+
+def get_matcher() -> SkillAutomaton:
+    """Builds the automaton from the taxonomy once per process."""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillAutomaton(load_taxonomy())
+    return _matcher
+
+def find_skills(text: str):
+    """Returns (Counter of canonical skills, covered words) found in a raw or cleaned text."""
+    return get_matcher().scan(clean_text(text))
+
+def top_skill_gaps(jd_skills: Counter, resume_skills, top_k: int = 5) -> list:
+    """The top_k most-mentioned JD skills absent from the resume, picked with a heap (ties alphabetical)."""
+    gaps = ((count, skill) for skill, count in jd_skills.items() if skill not in resume_skills)
+    return [skill for count, skill in heapq.nsmallest(top_k, gaps, key=lambda gap: (-gap[0], gap[1]))]
+
+# --- TEST BLOCK ---
+if __name__ == "__main__":
+    print("Building skill automaton...\n")
+
+    sample_resume = "Frontend developer: JavaScript, React and Google Analytics. Shipped CI/CD with GitHub Actions."
+    sample_jd = "We need Java and Go engineers with machine learning, CI/CD, Kubernetes and AWS experience."
+
+    jd_skills, _ = find_skills(sample_jd)
+    resume_index = ResumeSkillIndex(sample_resume)
+
+    print("--- SKILL MATCHER RESULTS ---")
+    print(f"JD skills:     {sorted(jd_skills)}")
+    print(f"Missing:       {top_skill_gaps(jd_skills, resume_index)}")
+    print("-----------------------------")
+    print("Status: Skill Matcher Complete.")
@@ -0,0 +1,343 @@
+import os
+import re
+import sys
+import time
+import asyncio
+import logging
+import threading
+import functools
+import contextvars
+from collections import Counter as _Tally, deque
+from contextlib import contextmanager
+
+# Latency histogram bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Opt-in sampling profiler: requests slower than PROFILE_SLOW_MS get a collapsed-stack flame graph (0 = off)
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+# At most one profile per this many seconds, so a slow burst cannot flood the disk
+PROFILE_COOLDOWN = float(os.environ.get("PROFILE_COOLDOWN", "10"))
+
+# Innermost Python frames of a thread that is parked (pool workers waiting for jobs, selectors, sockets);
+# such samples say nothing about where time goes, so the profiler drops them
+IDLE_FRAMES = {"wait", "select", "poll", "_worker", "accept", "readinto", "recv_into", "serve_forever", "_wait_for_tstate_lock"}
+
+# Stage timings of the request being served (a list shared by every task and I/O thread working on it)
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+logger = logging.getLogger(__name__)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _label_text(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class Counter:
+    """Monotonic Prometheus counter with fixed label names."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels.get(name, "") for name in self.labels), 0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(self.labels, key)} {value}")
+        return lines
+
+class Histogram:
+    """Prometheus histogram (cumulative buckets, sum and count) with fixed label names."""
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {} # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            else:
+                series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(labels.get(name, "") for name in self.labels))
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, hits in zip(self.buckets + ("+Inf",), series[:-1]):
+                    cumulative += hits
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_label_text(self.labels, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {series[-1]:.6f}")
+                lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+class Gauge:
+    """Read-at-scrape gauge: `read()` returns a number, or {label value: number} for one label."""
+
+    def __init__(self, name: str, help_text: str, read, label: str = None):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+        self.label = label
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        try:
+            value = self.read()
+        except Exception:
+            return [] # A component that is not up yet simply has no sample
+        if isinstance(value, dict):
+            for label_value, number in sorted(value.items()):
+                lines.append(f"{self.name}{_label_text((self.label,), (label_value,))} {number}")
+        else:
+            lines.append(f"{self.name} {value}")
+        return lines
+
+_registry = []
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+def register_gauge(name: str, help_text: str, read, label: str = None) -> Gauge:
+    """Exposes a service's live state (queue depth, in-flight calls, ...) at /metrics."""
+    return _register(Gauge(name, help_text, read, label))
+
+REQUEST_SECONDS = _register(Histogram("http_request_duration_seconds", "HTTP request latency until the response headers are sent.", ("method", "route", "status")))
+REQUEST_ERRORS = _register(Counter("http_request_errors_total", "HTTP responses with a 4xx or 5xx status.", ("method", "route", "status")))
+STAGE_SECONDS = _register(Histogram("pipeline_stage_duration_seconds", "Latency of one named pipeline stage.", ("stage",)))
+STAGE_ERRORS = _register(Counter("pipeline_stage_errors_total", "Pipeline stages that raised.", ("stage",)))
+EXTERNAL_CALLS = _register(Counter("external_calls_total", "Calls to Gemini, Supabase and scraped job sites by outcome.", ("service", "target", "outcome")))
+EXTERNAL_SECONDS = _register(Histogram("external_call_duration_seconds", "Latency of calls to external services.", ("service", "target")))
+
+def render_metrics() -> str:
+    """Prometheus text exposition format (version 0.0.4) for every registered metric."""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def _record_stage(name: str, elapsed: float):
+    STAGE_SECONDS.observe(elapsed, stage=name)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((name, elapsed))
+
+@contextmanager
+def stage(name: str):
+    """Times a block as pipeline stage `name`: histogram, error counter and the request's Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        _record_stage(name, time.perf_counter() - start)
+
+async def measured(name: str, awaitable):
+    """Awaits `awaitable` as stage `name` (for timing the branches of an asyncio.gather separately)."""
+    with stage(name):
+        return await awaitable
+
+def timed(name: str):
+    """Decorator form of stage() for plain and async functions."""
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_external(service: str, target: str, outcome: str, elapsed: float = None):
+    """Counts one call to an external service; `target` must be low-cardinality (model, table, host)."""
+    EXTERNAL_CALLS.inc(service=service, target=target, outcome=outcome)
+    if elapsed is not None:
+        EXTERNAL_SECONDS.observe(elapsed, service=service, target=target)
+
+def status_outcome(status_code: int) -> str:
+    """'2xx', '4xx', ... for an HTTP status."""
+    return f"{status_code // 100}xx"
+
+def server_timing(timings: list, total: float) -> str:
+    """Server-Timing header value; repeated stages are summed and keep their first position."""
+    merged = {}
+    for name, elapsed in timings:
+        merged[name] = merged.get(name, 0.0) + elapsed
+    parts = [f"{name};dur={elapsed * 1000:.1f}" for name, elapsed in merged.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+class SamplingProfiler:
+    """Samples every thread's Python stack on a timer and keeps the last few seconds in a ring buffer.
+
+    For a slow request, the samples taken during it are written as collapsed stacks
+    (`thread;frame;frame count` lines), the input format of flamegraph.pl and speedscope.
+    Idle threads are skipped. Work on the process pools is not visible here, only the event
+    loop and the I/O threads.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000, window: float = 120.0,
+                 out_dir: str = PROFILE_DIR, cooldown: float = PROFILE_COOLDOWN):
+        self.interval = interval
+        self.out_dir = out_dir
+        self.cooldown = cooldown
+        self._samples = deque(maxlen=max(1, int(window / interval)))
+        self._thread = None
+        self._stop = threading.Event()
+        self._last_dump = 0.0
+        self.profiles_written = 0
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="shadow-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident == own or frame.f_code.co_name in IDLE_FRAMES:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                frames.append(names.get(ident, f"thread-{ident}"))
+                stacks.append(";".join(reversed(frames)))
+            self._samples.append((time.perf_counter(), stacks))
+
+    def dump(self, start: float, end: float, label: str):
+        """Writes the samples taken between two perf_counter() readings. Returns the file path, or None."""
+        if end - self._last_dump < self.cooldown:
+            return None
+        tally = _Tally(stack for taken, stacks in list(self._samples) if start <= taken <= end for stack in stacks)
+        if not tally:
+            return None
+        self._last_dump = end
+        os.makedirs(self.out_dir, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_")
+        path = os.path.join(self.out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{slug}_{(end - start) * 1000:.0f}ms.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in tally.most_common():
+                f.write(f"{stack} {count}\n")
+        self.profiles_written += 1
+        return path
+
+def _route_template(scope: dict) -> str:
+    # The route's path template, not the raw path, so /api/history/{candidate_name} stays one series
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class TelemetryMiddleware:
+    """ASGI middleware: per-request stage list, Server-Timing header, request histograms and slow-request profiles."""
+
+    def __init__(self, app, profile_slow_ms: float = PROFILE_SLOW_MS):
+        self.app = app
+        self.profile_slow = profile_slow_ms / 1000
+        self.profiler = SamplingProfiler() if profile_slow_ms > 0 else None
+        if self.profiler is not None:
+            self.profiler.start()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = []
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+        # Streaming responses are measured up to their headers, which is what Server-Timing can describe
+        headers_at = None
+
+        async def send_with_timing(message):
+            nonlocal status, headers_at
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers_at = time.perf_counter()
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(timings, headers_at - start).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            end = headers_at or time.perf_counter()
+            labels = {"method": scope["method"], "route": _route_template(scope), "status": str(status)}
+            REQUEST_SECONDS.observe(end - start, **labels)
+            if status >= 400:
+                REQUEST_ERRORS.inc(**labels)
+            if self.profiler is not None and end - start >= self.profile_slow:
+                path = self.profiler.dump(start, time.perf_counter(), f"{scope['method']} {labels['route']}")
+                if path:
+                    logger.warning("Slow request (%.0f ms) profiled to %s", (end - start) * 1000, path)
+            _request_timings.reset(token)
+
+# --- TEST BLOCK ---
+if __name__ == "__main__":
+    print("1. Timing two stages...")
+    token = _request_timings.set([])
+    with stage("parse"):
+        time.sleep(0.02)
+    with stage("score"):
+        time.sleep(0.01)
+    print(f"   Server-Timing: {server_timing(_request_timings.get(), 0.031)}")
+    _request_timings.reset(token)
+
+    print("2. Recording an external call...")
+    record_external("gemini", "gemini-2.5-flash", "ok", 0.4)
+    print(render_metrics()[:600])
+    print("Status: Telemetry Check Complete.")
@@ -0,0 +1,113 @@
+import os
+import asyncio
+import functools
+import contextvars
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Pool sizes are tunable from the environment so one container can be sized to its CPU quota.
+IO_WORKERS = int(os.environ.get("IO_WORKERS", "32"))
+CPU_WORKERS = int(os.environ.get("CPU_WORKERS", str(os.cpu_count() or 1)))
+# Password hashing gets its own pool so a login burst cannot starve PDF parsing and TF-IDF (and vice versa)
+AUTH_WORKERS = int(os.environ.get("AUTH_WORKERS", str(CPU_WORKERS)))
+# Backpressure: at most this many password jobs running or queued; callers wait up to AUTH_QUEUE_TIMEOUT for a slot
+AUTH_MAX_PENDING = int(os.environ.get("AUTH_MAX_PENDING", str(AUTH_WORKERS * 4)))
+AUTH_QUEUE_TIMEOUT = float(os.environ.get("AUTH_QUEUE_TIMEOUT", "5"))
+# Process pool workers are started by a forkserver: one clean, single-threaded process that imports POOL_PRELOAD once
+# and forks every worker from there. Forking the API process itself is unsafe once imports are lazy: a fork that lands
+# while another thread is half-way through an import (or holds any other lock) leaves the child deadlocked.
+POOL_START_METHOD = os.environ.get("POOL_START_METHOD", "forkserver")
+POOL_PRELOAD = [
+    "sklearn.feature_extraction.text",
+    "fitz",
+    "passlib.context",
+    "backend.services.ml_engine",
+    "backend.services.pdf_parser",
+    "backend.services.data_cleaner",
+    "backend.services.auth_service",
+]
+
+_io_pool = None
+_cpu_pool = None
+_auth_pool = None
+_auth_slots = None
+_mp_context = None
+
+class PoolBusyError(RuntimeError):
+    """Raised when a bounded pool has no free slot within its queue timeout; the caller should retry later."""
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """Returns the shared thread pool used for blocking I/O (sync SDKs, disk, sockets)."""
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="shadow-io")
+    return _io_pool
+
+def get_mp_context():
+    """The multiprocessing context both process pools start their workers with (the platform default when
+    POOL_START_METHOD is not available here, e.g. forkserver on Windows)."""
+    global _mp_context
+    if _mp_context is None:
+        if POOL_START_METHOD in multiprocessing.get_all_start_methods():
+            _mp_context = multiprocessing.get_context(POOL_START_METHOD)
+            if POOL_START_METHOD == "forkserver":
+                _mp_context.set_forkserver_preload(POOL_PRELOAD)
+        else:
+            _mp_context = multiprocessing.get_context()
+    return _mp_context
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """Returns the shared process pool used for CPU-heavy work (PDF parsing, TF-IDF)."""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=get_mp_context())
+    return _cpu_pool
+
+def get_auth_pool() -> ProcessPoolExecutor:
+    """Returns the process pool reserved for bcrypt hashing and verification."""
+    global _auth_pool
+    if _auth_pool is None:
+        _auth_pool = ProcessPoolExecutor(max_workers=AUTH_WORKERS, mp_context=get_mp_context())
+    return _auth_pool
+
+async def run_blocking(func, *args, **kwargs):
+    """Runs a blocking call on the I/O thread pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    # Carry the caller's context along, so stages timed inside the thread land in the request's Server-Timing
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_io_pool(), functools.partial(context.run, func, *args, **kwargs))
+
+async def run_cpu_bound(func, *args):
+    """Runs a picklable, module-level function on the CPU process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_pool(), func, *args)
+
+async def run_auth_bound(func, *args):
+    """Runs a password hashing job on the auth pool, raising PoolBusyError when the queue stays full."""
+    global _auth_slots
+    # Created lazily so it binds to the running event loop
+    if _auth_slots is None:
+        _auth_slots = asyncio.Semaphore(AUTH_MAX_PENDING)
+    try:
+        await asyncio.wait_for(_auth_slots.acquire(), timeout=AUTH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PoolBusyError("Too many sign-in attempts in progress. Please retry in a moment.")
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_auth_pool(), func, *args)
+    finally:
+        _auth_slots.release()
+
+def shutdown_pools():
+    """Stops all pools. Called from the FastAPI shutdown hook."""
+    global _io_pool, _cpu_pool, _auth_pool, _auth_slots
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=True)
+        _io_pool = None
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=True)
+        _cpu_pool = None
+    if _auth_pool is not None:
+        _auth_pool.shutdown(wait=True)
+        _auth_pool = None
+    _auth_slots = None
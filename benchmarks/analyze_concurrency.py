@@ -0,0 +1,110 @@
+"""
+Concurrency check for /api/analyze.
+
+Times one analyze call on its own, then fires N analyze calls at the app in parallel, with the slow
+upstreams (job site, Supabase, Gemini) replaced by local sleeps. A concurrent event loop finishes
+all N in about the time of the single call; a blocking one takes about N times as long. Exits 1 (FAIL)
+when the parallel wall time exceeds 1.5x the single call. The PDF parse and the match are real CPU work
+(~30 ms a call) and do queue on a small machine, so keep --calls x 30 ms well under half a call's time.
+
+--blocking-scrape swaps the job site stub for one that blocks the event loop with time.sleep, to
+check that the test really catches a serialised loop (it should FAIL).
+
+Run from the repo root:  python -m benchmarks.analyze_concurrency --calls 10
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+
+import fitz
+import httpx
+import backend.main as main
+from backend.services import ai_service, analysis
+from backend.services.llm_cache import ResponseCache
+from backend.services.resume_cache import ParsedResumeCache
+from backend.services.workers import shutdown_pools
+from benchmarks.stubs import FakeGeminiClient
+
+SCRAPE_DELAY = 0.30
+DB_DELAY = 0.10
+LLM_DELAY = 0.50
+
+def make_pdf(pages: int = 2) -> bytes:
+    """Builds a small text PDF in memory so the real parser runs."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {i}: python sql pandas docker kubernetes machine learning", fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+async def fake_scrape(url: str) -> str:
+    await asyncio.sleep(SCRAPE_DELAY)
+    return "Backend engineer. Must have python, fastapi, docker, aws, kubernetes and terraform."
+
+async def blocking_scrape(url: str) -> str:
+    time.sleep(SCRAPE_DELAY) # What a sync HTTP client inside an async endpoint does to the loop
+    return "Backend engineer. Must have python, fastapi, docker, aws, kubernetes and terraform."
+
+def fake_log(sessions: list) -> int:
+    time.sleep(DB_DELAY) # Blocking on purpose: the sync Supabase SDK blocks too
+    return len(sessions)
+
+async def call_analyze(client: httpx.AsyncClient, pdf: bytes, i: int) -> float:
+    start = time.perf_counter()
+    response = await client.post(
+        "/api/analyze",
+        data={"job_url": "http://jobs.local/1", "job_role": "Backend Engineer", "candidate_name": f"bench-{i}"},
+        files={"resume": (f"resume_{i}.pdf", pdf, "application/pdf")},
+    )
+    assert response.json()["status"] == "success", response.text
+    return time.perf_counter() - start
+
+async def run(calls: int, blocking: bool = False):
+    analysis.scrape_job_description = blocking_scrape if blocking else fake_scrape
+    main.session_logger.write_batch = fake_log
+    ai_service.question_cache = ResponseCache(path="", memory_size=0)
+    analysis.resume_cache = ParsedResumeCache(path="", memory_size=0)
+    ai_service.client = FakeGeminiClient(LLM_DELAY)
+    pdf = make_pdf()
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await call_analyze(client, pdf, -1) # Warm the process pool
+        # The reference: one call with nothing else running
+        single = await call_analyze(client, pdf, -2)
+
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(call_analyze(client, pdf, i) for i in range(calls)))
+        wall = time.perf_counter() - start
+    await main.session_logger.close()
+
+    print(f"--- {calls} PARALLEL /api/analyze CALLS{' (BLOCKING SCRAPE)' if blocking else ''} ---")
+    print(f"One call alone:     {single:.2f}s")
+    print(f"Wall time:          {wall:.2f}s")
+    print(f"Slowest call:       {max(latencies):.2f}s")
+    print(f"Serialised would be:{single * calls:.2f}s")
+    print(f"Wall / one call:    {wall / single:.2f}x (1.0x = fully concurrent, {calls}x = serialised)")
+    return wall, single
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--blocking-scrape", action="store_true", help="block the event loop in the scrape stub (expect FAIL)")
+    args = parser.parse_args()
+    try:
+        wall, single = asyncio.run(run(args.calls, args.blocking_scrape))
+    finally:
+        shutdown_pools()
+    # N calls overlapping finish in about one call's time; anything well above it means they queued up
+    passed = wall < single * 1.5
+    print(f"{'PASS' if passed else 'FAIL'}: {args.calls} parallel calls took {wall / single:.2f}x one call (limit 1.5x)")
+    sys.exit(0 if passed else 1)
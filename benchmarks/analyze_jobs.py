@@ -0,0 +1,182 @@
+"""
+Blocking /api/analyze vs. queued analyze jobs, against local Gemini / Supabase / job board stand-ins.
+
+Boots backend.main:app under uvicorn and has `--concurrency` clients analyze a real PDF in a loop
+for `--duration` seconds, in each mode:
+
+  blocking                 POST /api/analyze, one request held open per analysis
+  jobs, in-process         POST /api/analyze/jobs + polling, ANALYZE_WORKERS job workers in the API process
+  jobs, standalone x N     the API only queues (ANALYZE_WORKERS=0); N `python -m backend.analyze_worker`
+                           processes share the SQLite queue and run the jobs
+
+Reports analyses/s, time to an answer for the submit request (the whole analysis when blocking),
+end-to-end latency, and p95 of a cheap probe endpoint hit every 100 ms during the run (how
+responsive the API tier stays). With one CPU the standalone workers share the core with the API,
+so read throughput against `nproc`.
+
+Run from the repo root:  python -m benchmarks.analyze_jobs --concurrency 8 --duration 20 --standalone 1,2
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from benchmarks.stubs import postgrest_server, gemini_server, job_page_server
+from benchmarks.suite import make_pdf, FIXTURE_DIR
+from benchmarks.load_test import AppProcess, REPO_ROOT, percentile
+
+class Samples:
+    def __init__(self):
+        self.submit = []
+        self.end_to_end = []
+        self.probe = []
+        self.errors = 0
+
+def with_fresh_role(form: dict, samples: Samples) -> dict:
+    # A role the question cache has not seen, so every analysis pays for its Gemini call
+    return {**form, "job_role": f"{form['job_role']} {len(samples.submit) + samples.errors}"}
+
+async def blocking_client(client: httpx.AsyncClient, form: dict, pdf: bytes, stop_at: float, samples: Samples):
+    while time.perf_counter() < stop_at:
+        form = with_fresh_role(form, samples)
+        start = time.perf_counter()
+        body = (await client.post("/api/analyze", data=form, files={"resume": ("resume.pdf", pdf, "application/pdf")})).json()
+        elapsed = time.perf_counter() - start
+        if body.get("status") != "success":
+            samples.errors += 1
+            continue
+        samples.submit.append(elapsed)
+        samples.end_to_end.append(elapsed)
+
+async def job_client(client: httpx.AsyncClient, form: dict, pdf: bytes, stop_at: float, samples: Samples, interval: float):
+    while time.perf_counter() < stop_at:
+        form = with_fresh_role(form, samples)
+        start = time.perf_counter()
+        submitted = (await client.post("/api/analyze/jobs", data=form, files={"resume": ("resume.pdf", pdf, "application/pdf")})).json()
+        samples.submit.append(time.perf_counter() - start)
+        if submitted.get("status") != "success":
+            samples.errors += 1
+            await asyncio.sleep(interval)
+            continue
+        while True:
+            await asyncio.sleep(interval)
+            job = (await client.get(f"/api/analyze/jobs/{submitted['job_id']}")).json()["job"]
+            if job["state"] in ("succeeded", "failed"):
+                break
+        if job["state"] == "failed":
+            samples.errors += 1
+            continue
+        samples.end_to_end.append(time.perf_counter() - start)
+
+async def prober(client: httpx.AsyncClient, stop_at: float, samples: Samples):
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        await client.get("/api/db/pool")
+        samples.probe.append(time.perf_counter() - start)
+        await asyncio.sleep(0.1)
+
+async def drive(base_url: str, jobs: bool, concurrency: int, duration: float, job_urls: list, pdf: bytes, interval: float) -> dict:
+    samples = Samples()
+    start = time.perf_counter()
+    stop_at = start + duration
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=httpx.Limits(max_connections=concurrency + 1)) as client:
+        clients = []
+        for user in range(concurrency):
+            form = {"job_url": job_urls[user % len(job_urls)], "job_role": "Backend Engineer", "candidate_name": f"candidate-{user}"}
+            if jobs:
+                clients.append(job_client(client, form, pdf, stop_at, samples, interval))
+            else:
+                clients.append(blocking_client(client, form, pdf, stop_at, samples))
+        await asyncio.gather(prober(client, stop_at, samples), *clients)
+    elapsed = time.perf_counter() - start
+    return {
+        "analyses": len(samples.end_to_end),
+        "per_s": len(samples.end_to_end) / elapsed,
+        "errors": samples.errors,
+        "submit_p50_ms": percentile(samples.submit, 0.50),
+        "submit_p95_ms": percentile(samples.submit, 0.95),
+        "e2e_p50_ms": percentile(samples.end_to_end, 0.50),
+        "e2e_p95_ms": percentile(samples.end_to_end, 0.95),
+        "probe_p95_ms": percentile(samples.probe, 0.95),
+    }
+
+def start_workers(count: int, concurrency: int, env: dict) -> list:
+    """Starts standalone job workers and returns once each has warmed up and printed its status line."""
+    processes = [
+        subprocess.Popen([sys.executable, "-m", "backend.analyze_worker", "--concurrency", str(concurrency), "--poll", "0.05"],
+                         cwd=REPO_ROOT, env={**os.environ, **env}, stdout=subprocess.PIPE, text=True)
+        for _ in range(count)
+    ]
+    for process in processes:
+        line = process.stdout.readline()
+        while line and not line.startswith("Status:"):
+            line = process.stdout.readline()
+        if not line:
+            stop_workers(processes)
+            raise RuntimeError("A job worker exited during start-up.")
+    return processes
+
+def stop_workers(processes: list):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="clients analyzing in a loop")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per mode")
+    parser.add_argument("--job-workers", type=int, default=8, help="job workers per process (ANALYZE_WORKERS / --concurrency)")
+    parser.add_argument("--standalone", default="1,2", help="comma-separated standalone worker process counts (empty to skip)")
+    parser.add_argument("--poll", type=float, default=0.2, help="client polling interval for job status")
+    parser.add_argument("--gemini-latency", type=float, default=0.8)
+    parser.add_argument("--job-latency", type=float, default=0.3)
+    parser.add_argument("--db-latency", type=float, default=0.04)
+    args = parser.parse_args()
+
+    fixtures = sorted(os.listdir(FIXTURE_DIR))
+    pages = {f"/jobs/{i}": open(os.path.join(FIXTURE_DIR, name), encoding="utf-8").read() for i, name in enumerate(fixtures)}
+    modes = [("blocking", False, args.job_workers, 0), ("jobs, in-process", True, args.job_workers, 0)]
+    modes += [(f"jobs, standalone x{n}", True, 0, n) for n in (int(value) for value in args.standalone.split(",") if value)]
+
+    print(f"--- {args.concurrency} clients, {args.duration:.0f} s per mode, Gemini {args.gemini_latency} s, {os.cpu_count()} CPU ---")
+    print(f"{'mode':22} {'done':>5} {'/s':>6} {'err':>4} {'submit p50':>11} {'p95':>8} {'e2e p50':>9} {'p95':>8} {'probe p95':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "resume.pdf")
+        make_pdf(pdf_path, 2)
+        with open(pdf_path, "rb") as f:
+            pdf = f.read()
+
+        for index, (label, jobs, in_process, standalone) in enumerate(modes):
+            with postgrest_server(args.db_latency, unique={"documents": "hash"}, generated=("interviews",)) as db, \
+                 gemini_server(args.gemini_latency) as gemini, job_page_server(pages, args.job_latency) as board:
+                env = {
+                    "SUPABASE_URL": db.url, "SUPABASE_KEY": "offline-benchmark",
+                    "GEMINI_API_KEY": "offline-benchmark", "GEMINI_BASE_URL": gemini.url,
+                    "LLM_CACHE_PATH": "", "JD_CACHE_PATH": "", "RESUME_CACHE_PATH": "",
+                    "SESSION_LOG_SPILL_PATH": os.path.join(tmp, "spill.jsonl"),
+                    "TFIDF_MODEL_PATH": os.path.join(tmp, "no-model.joblib"),
+                    "ANALYZE_JOBS_PATH": os.path.join(tmp, f"jobs-{index}.sqlite3"),
+                    "ANALYZE_WORKERS": str(in_process),
+                    # Every client uploads the same PDF; keep parsing in the measurement
+                    "RESUME_CACHE_MEMORY_SIZE": "0",
+                }
+                workers = start_workers(standalone, args.job_workers, env)
+                try:
+                    with AppProcess(1, env) as app:
+                        job_urls = [f"{board.url}{path}" for path in pages]
+                        result = asyncio.run(drive(app.url, jobs, args.concurrency, args.duration, job_urls, pdf, args.poll))
+                finally:
+                    stop_workers(workers)
+            print(f"{label:22} {result['analyses']:5d} {result['per_s']:6.2f} {result['errors']:4d} "
+                  f"{result['submit_p50_ms']:9.1f}ms {result['submit_p95_ms']:6.1f}ms {result['e2e_p50_ms']:7.1f}ms "
+                  f"{result['e2e_p95_ms']:6.1f}ms {result['probe_p95_ms']:8.1f}ms")
@@ -0,0 +1,108 @@
+"""
+Login load test: bcrypt on the event loop vs. on the bounded auth process pool.
+
+Fires --logins concurrent /api/login requests at the app (served by uvicorn, Supabase replaced by
+the stub PostgREST server) while a prober hits /api/keepalive every 50 ms. Reports login
+throughput and keepalive latency for the old inline verification and for AUTH_WORKERS = each
+value of --workers. Throughput can only scale up to the number of cores in the machine.
+
+Run from the repo root:  python -m benchmarks.auth_load --logins 64 --workers 1,2,4
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+
+import httpx
+from benchmarks.stubs import postgrest_server, LocalAppServer
+
+PASSWORD = "correct horse battery staple"
+
+def keepalive_prober(base_url: str, stop: threading.Event, latencies: list):
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get("/api/keepalive")
+            latencies.append(time.perf_counter() - start)
+            stop.wait(0.05)
+
+def login_burst(base_url: str, logins: int, concurrency: int) -> tuple:
+    """Returns (successful logins per second, logins shed by backpressure, keepalive latencies during the burst)."""
+    stop, latencies = threading.Event(), []
+    prober = threading.Thread(target=keepalive_prober, args=(base_url, stop, latencies))
+    prober.start()
+    time.sleep(0.2)
+
+    def login(_):
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            result = client.post("/api/login", data={"username": "candidate", "password": PASSWORD}).json()
+            assert result["status"] == "success" or result.get("retryable"), result
+            return result["status"] == "success"
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        succeeded = sum(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+    return succeeded / elapsed, logins - succeeded, latencies
+
+def report(name: str, rate: float, shed: int, latencies: list):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<24} {rate:6.1f} logins/s, {shed:3d} shed | keepalive p50 {statistics.median(latencies) * 1000:7.1f} ms, "
+          f"p99 {p99 * 1000:7.1f} ms ({len(latencies)} probes)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}", help="comma-separated AUTH_WORKERS values")
+    args = parser.parse_args()
+
+    rows = {"users": []}
+    with postgrest_server(latency=0.002, rows=rows, unique={"users": "username"}) as db:
+        # backend.database reads SUPABASE_URL at import time
+        os.environ["SUPABASE_URL"] = db.url
+        import backend.main as main
+        from backend.services import auth_service, workers
+        rows["users"].append({"username": "candidate", "password_hash": auth_service.hash_password(PASSWORD)})
+
+        print(f"--- {args.logins} LOGINS, {args.concurrency} CONCURRENT, {os.cpu_count()} CPU(S) ---")
+        with LocalAppServer(main.app) as server:
+            idle = []
+            stop = threading.Event()
+            prober = threading.Thread(target=keepalive_prober, args=(server.url, stop, idle))
+            prober.start()
+            time.sleep(1.0)
+            stop.set()
+            prober.join()
+            print(f"{'idle':<24} {'':>6}                     | keepalive p50 {statistics.median(idle) * 1000:7.1f} ms")
+
+            # The old behaviour: bcrypt straight on the event loop thread
+            pooled = auth_service.run_auth_bound
+            async def inline(func, *func_args):
+                return func(*func_args)
+            auth_service.run_auth_bound = inline
+            report("inline (event loop)", *login_burst(server.url, args.logins, args.concurrency))
+            auth_service.run_auth_bound = pooled
+
+            for count in sorted({int(n) for n in args.workers.split(",")}):
+                workers.shutdown_pools()
+                workers.AUTH_WORKERS = count
+                workers.AUTH_MAX_PENDING = count * 4
+                report(f"auth pool, {count} worker(s)", *login_burst(server.url, args.logins, args.concurrency))
+
+            # Registration: one insert, duplicates rejected by the unique constraint
+            with httpx.Client(base_url=server.url, timeout=60) as client:
+                first = client.post("/api/register", data={"username": "new-user", "password": PASSWORD}).json()
+                again = client.post("/api/register", data={"username": "new-user", "password": PASSWORD}).json()
+            print(f"register: {first['message']} / again: {again['message']} "
+                  f"(stub saw {db.requests_served} requests in total)")
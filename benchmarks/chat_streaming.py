@@ -0,0 +1,59 @@
+"""
+Time-to-first-token for /api/chat vs. /api/chat/stream with a local fake streaming model.
+
+The fake model takes --latency seconds to the first token and --chunk-delay per further chunk,
+so a blocking call costs the whole generation while the stream shows text after the first chunk.
+
+Run from the repo root:  python -m benchmarks.chat_streaming --chunks 40 --chunk-delay 0.05
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+
+import httpx
+import backend.main as main
+from backend.services import ai_service
+from benchmarks.stubs import FakeGeminiClient, LocalAppServer
+
+PAYLOAD = {"question": "How does a B-tree index speed up range queries?", "answer": "It keeps keys sorted."}
+
+def time_blocking(client: httpx.Client) -> float:
+    start = time.perf_counter()
+    response = client.post("/api/chat", json=PAYLOAD)
+    assert response.json()["status"] == "success"
+    return time.perf_counter() - start
+
+def time_stream(client: httpx.Client) -> tuple:
+    start = time.perf_counter()
+    first = None
+    with client.stream("POST", "/api/chat/stream", json=PAYLOAD) as response:
+        for line in response.iter_lines():
+            if first is None and line.startswith("data:"):
+                first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.4, help="fake model time to first token (s)")
+    parser.add_argument("--chunks", type=int, default=40)
+    parser.add_argument("--chunk-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    ai_service.client = FakeGeminiClient(args.latency, args.chunks, args.chunk_delay)
+    with LocalAppServer(main.app) as server:
+        with httpx.Client(base_url=server.url, timeout=60) as client:
+            blocking = [time_blocking(client) for _ in range(args.repeat)]
+            streamed = [time_stream(client) for _ in range(args.repeat)]
+
+    print(f"--- /api/chat vs /api/chat/stream ({args.chunks} chunks) ---")
+    print(f"blocking  first byte = full response: {statistics.median(blocking) * 1000:7.0f} ms")
+    print(f"streaming first token:                {statistics.median(t for t, _ in streamed) * 1000:7.0f} ms")
+    print(f"streaming full response:              {statistics.median(t for _, t in streamed) * 1000:7.0f} ms")
@@ -0,0 +1,37 @@
+"""
+Deterministic synthetic resumes and job descriptions for offline benchmarks.
+"""
+import random
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "go", "rust", "scala", "sql", "postgresql", "mysql",
+    "mongodb", "redis", "kafka", "spark", "airflow", "dbt", "snowflake", "pandas", "numpy", "pytorch",
+    "tensorflow", "scikit-learn", "docker", "kubernetes", "terraform", "ansible", "aws", "gcp", "azure",
+    "fastapi", "django", "flask", "react", "node.js", "graphql", "grpc", "linux", "bash", "git", "ci/cd",
+    "machine learning", "deep learning", "data engineering", "microservices", "rest api", "tableau",
+    "power bi", "excel", "statistics", "nlp", "computer vision", "elasticsearch", "rabbitmq", "celery",
+]
+FILLER = (
+    "team collaborate ownership design build deliver scalable reliable systems product customers "
+    "stakeholders mentor communicate requirements quality testing production services platform data "
+    "pipelines analytics performance experience strong ability work environment fast paced growth"
+).split()
+ROLES = ["Backend Engineer", "Data Engineer", "Data Scientist", "ML Engineer", "Platform Engineer", "Data Analyst"]
+
+def _sentence(rng: random.Random, skills: list) -> str:
+    words = rng.sample(FILLER, 8) + rng.sample(skills, min(2, len(skills)))
+    rng.shuffle(words)
+    return " ".join(words) + "."
+
+def synthetic_jd(rng: random.Random, sentences: int = 25) -> str:
+    skills = rng.sample(SKILLS, 12)
+    return f"{rng.choice(ROLES)}. " + " ".join(_sentence(rng, skills) for _ in range(sentences))
+
+def synthetic_resume(rng: random.Random, sentences: int = 40) -> str:
+    skills = rng.sample(SKILLS, 10)
+    return "experience education projects skills " + " ".join(_sentence(rng, skills) for _ in range(sentences))
+
+def corpus(count: int, kind: str = "jd", seed: int = 0, **kwargs) -> list:
+    rng = random.Random(seed)
+    make = synthetic_jd if kind == "jd" else synthetic_resume
+    return [make(rng, **kwargs) for _ in range(count)]
@@ -0,0 +1,59 @@
+"""
+Supabase client pooling benchmark against a local stub PostgREST server.
+
+Compares a burst of login-style lookups using a fresh create_client() per call (the old
+get_db_client) with the shared pooled client from backend.database, and prints the pool stats.
+
+Run from the repo root:  python -m benchmarks.db_pool --requests 200 --concurrency 16
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubs import postgrest_server
+
+def burst(fetch, requests: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda i: fetch(f"user-{i}"), range(requests)))
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.005, help="stub server latency per request (s)")
+    args = parser.parse_args()
+
+    with postgrest_server(args.latency) as server:
+        os.environ["SUPABASE_URL"] = server.url
+        os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+        from supabase import create_client
+        import backend.database as database
+
+        def fresh_client_lookup(username):
+            client = create_client(database.url, database.key)
+            return client.table("users").select("password_hash").eq("username", username).execute()
+
+        def pooled_lookup(username):
+            return database.get_db_client().table("users").select("password_hash").eq("username", username).execute()
+
+        before = server.connections_opened
+        fresh = burst(fresh_client_lookup, args.requests, args.concurrency)
+        fresh_conns = server.connections_opened - before
+
+        database.init_db_client()
+        before = server.connections_opened
+        pooled = burst(pooled_lookup, args.requests, args.concurrency)
+        pooled_conns = server.connections_opened - before
+        stats = database.get_pool_stats()
+        database.close_db_client()
+
+    print(f"--- {args.requests} LOOKUPS, {args.concurrency} CONCURRENT ---")
+    print(f"create_client per call: {fresh:.2f}s, {fresh_conns} TCP connections opened")
+    print(f"shared pooled client:   {pooled:.2f}s, {pooled_conns} TCP connections opened")
+    print(f"Pool stats: {stats}")
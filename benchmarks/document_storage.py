@@ -0,0 +1,106 @@
+"""
+Storage report for content-addressed, compressed resume / JD documents.
+
+Builds a synthetic history where candidates re-run practice interviews with the same one or two
+resumes against a Zipf-skewed pool of job postings, then writes it to stub PostgREST servers
+twice: inline text on every interviews row (the old log_interview_session) and through
+db_service.log_interview_session (documents table + hashes). Finally backfills an old-format
+table with backend.backfill_documents and checks every session still reads back identically.
+
+Run from the repo root:  python -m benchmarks.document_storage --sessions 500
+"""
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+
+from benchmarks.stubs import postgrest_server
+from benchmarks.corpus import ROLES, SKILLS, synthetic_jd, synthetic_resume
+import backend.database as database
+from backend.services import db_service, document_store
+
+def synthetic_sessions(sessions: int, candidates: int, postings: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    resumes = {c: [synthetic_resume(rng) for _ in range(rng.choice((1, 1, 2)))] for c in range(candidates)}
+    jds = [synthetic_jd(rng) for _ in range(postings)]
+    weights = [1 / (rank + 1) for rank in range(postings)]
+    rows = []
+    for _ in range(sessions):
+        candidate = rng.randrange(candidates)
+        rows.append({
+            "job_role": rng.choice(ROLES),
+            "match_score": round(rng.uniform(10, 90), 2),
+            "missing_skills": rng.sample(SKILLS, 5),
+            "resume_text": rng.choice(resumes[candidate]),
+            "jd_text": rng.choices(jds, weights=weights)[0],
+            "candidate_name": f"candidate-{candidate}",
+        })
+    return rows
+
+def table_bytes(server, table: str) -> int:
+    return sum(len(json.dumps(row).encode()) for row in server.httpd.RequestHandlerClass.rows.get(table, []))
+
+def use_server(server):
+    """Points the shared Supabase client at a stub server."""
+    database.close_db_client()
+    database.url = server.url
+    database.init_db_client()
+    document_store._known_hashes.clear()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--candidates", type=int, default=100)
+    parser.add_argument("--postings", type=int, default=150)
+    args = parser.parse_args()
+
+    sessions = synthetic_sessions(args.sessions, args.candidates, args.postings)
+
+    # 1. Old layout: full text on every row
+    with postgrest_server() as old:
+        use_server(old)
+        for row in sessions:
+            database.get_db_client().table("interviews").insert(row).execute()
+        old_requests, old_upload = old.requests_served, old.httpd.bytes_received
+        old_storage = table_bytes(old, "interviews")
+
+    # 2. New layout: documents stored once, compressed; rows carry hashes
+    with postgrest_server(unique={"documents": "hash"}) as new:
+        use_server(new)
+        for row in sessions:
+            db_service.log_interview_session(row["job_role"], row["match_score"], row["missing_skills"],
+                                             row["resume_text"], row["jd_text"], row["candidate_name"])
+        new_requests, new_upload = new.requests_served, new.httpd.bytes_received
+        new_docs, new_rows = table_bytes(new, "documents"), table_bytes(new, "interviews")
+        distinct = len(new.httpd.RequestHandlerClass.rows["documents"])
+
+    # 3. Backfill an old-format table and read every session back
+    from backend.backfill_documents import backfill, clear_inline_text
+    legacy = [dict(row, id=i + 1) for i, row in enumerate(sessions)]
+    with postgrest_server(rows={"interviews": legacy}, unique={"documents": "hash"}) as migrated:
+        use_server(migrated)
+        report = backfill()
+        cleared = clear_inline_text()
+        mismatches = 0
+        for row in legacy:
+            stored = db_service.get_interview_session(row["candidate_name"], str(row["id"]))
+            original = sessions[row["id"] - 1]
+            # Reads must resolve the hashes even once the inline copies are gone
+            mismatches += stored["resume_text"] != original["resume_text"] or stored["jd_text"] != original["jd_text"]
+    database.close_db_client()
+
+    raw = sum(len(r["resume_text"].encode()) + len(r["jd_text"].encode()) for r in sessions)
+    print(f"--- {args.sessions} SESSIONS, {args.candidates} CANDIDATES, {args.postings} POSTINGS ---")
+    print(f"inline text per row:   table {old_storage:>10,d} bytes | upload {old_upload:>10,d} bytes | {old_requests} requests")
+    print(f"documents by hash:     table {new_docs + new_rows:>10,d} bytes | upload {new_upload:>10,d} bytes | {new_requests} requests")
+    print(f"  documents table:     {new_docs:,d} bytes for {distinct} distinct texts (raw text {raw:,d} bytes)")
+    print(f"  interviews table:    {new_rows:,d} bytes")
+    print(f"storage saved:         {1 - (new_docs + new_rows) / old_storage:.1%}, upload saved {1 - new_upload / old_upload:.1%}")
+    print(f"backfill:              {report}, {cleared} rows cleared | read-back mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
@@ -0,0 +1,107 @@
+"""
+Interview history payload and latency: select("*") top-10 vs. projected, keyset-paginated, cached pages.
+
+Seeds the stub PostgREST server with --sessions interviews for one candidate (full resume and JD
+text on every row, timestamps with ties) and compares what one history view costs, then pages
+through the whole history with the cursor to check nothing is skipped or repeated.
+
+Run from the repo root:  python -m benchmarks.history --sessions 400 --latency 0.02
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+
+from benchmarks.stubs import postgrest_server
+from benchmarks.corpus import ROLES, SKILLS, synthetic_jd, synthetic_resume
+
+CANDIDATE = "heavy-user"
+
+def seed_rows(count: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for i in range(count):
+        # Pairs of sessions share a timestamp, so the id tie-breaker matters
+        created = start + timedelta(hours=i // 2)
+        rows.append({
+            "id": i + 1,
+            "created_at": created.isoformat(),
+            "candidate_name": CANDIDATE,
+            "job_role": rng.choice(ROLES),
+            "match_score": round(rng.uniform(10, 90), 2),
+            "missing_skills": rng.sample(SKILLS, 5),
+            "resume_text": synthetic_resume(rng),
+            "jd_text": synthetic_jd(rng),
+        })
+    return rows
+
+def timed(func, repeat: int) -> tuple:
+    """Median seconds and the last result of func()."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+def payload_bytes(data) -> int:
+    return len(json.dumps({"status": "success", "data": data}).encode())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.02, help="stub database latency per request (s)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = seed_rows(args.sessions)
+    with postgrest_server(latency=args.latency, rows={"interviews": rows}) as db:
+        # backend.database reads SUPABASE_URL at import time
+        os.environ["SUPABASE_URL"] = db.url
+        from backend.database import get_db_client
+        from backend.services import db_service
+
+        def old_history():
+            return (get_db_client().table("interviews").select("*").eq("candidate_name", CANDIDATE)
+                    .order("created_at", desc=True).limit(10).execute().data)
+
+        def new_history_uncached():
+            db_service.invalidate_history(CANDIDATE)
+            return db_service.get_interview_history(CANDIDATE)
+
+        old_s, old_rows = timed(old_history, args.repeat)
+        new_s, page = timed(new_history_uncached, args.repeat)
+        cached_s, _ = timed(lambda: db_service.get_interview_history(CANDIDATE), args.repeat)
+        detail_s, detail = timed(lambda: db_service.get_interview_session(CANDIDATE, str(page["items"][0]["id"])), args.repeat)
+
+        # Walk every page with the cursor
+        db_service.invalidate_history(CANDIDATE)
+        seen, cursor, pages = [], None, 0
+        start = time.perf_counter()
+        while True:
+            result = db_service.get_interview_history(CANDIDATE, 50, cursor)
+            seen += [row["id"] for row in result["items"]]
+            pages += 1
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+        walk_s = time.perf_counter() - start
+
+    expected = [row["id"] for row in sorted(rows, key=lambda r: (r["created_at"], r["id"]), reverse=True)]
+    print(f"--- HISTORY FOR A CANDIDATE WITH {args.sessions} SESSIONS (db latency {args.latency * 1000:.0f} ms) ---")
+    print(f"select(*) newest 10:        {payload_bytes(old_rows):8d} bytes, {old_s * 1000:6.1f} ms")
+    print(f"projected page of 10:       {payload_bytes(page['items']):8d} bytes, {new_s * 1000:6.1f} ms")
+    print(f"projected page, cached:     {payload_bytes(page['items']):8d} bytes, {cached_s * 1000:6.3f} ms")
+    print(f"one session's full text:    {payload_bytes(detail):8d} bytes, {detail_s * 1000:6.1f} ms (on demand)")
+    print(f"keyset walk, pages of 50:   {pages} pages, {len(seen)} rows in {walk_s * 1000:.0f} ms, "
+          f"order {'OK' if seen == expected else 'MISMATCH'}")
+    if seen != expected:
+        sys.exit(1)
@@ -0,0 +1,53 @@
+"""
+HTML extraction benchmark: legacy find_all(...) + get_text() vs. the single-pass extractor.
+
+Runs both extractors over the saved job pages in benchmarks/fixtures/job_pages and prints the
+output size and median parse time for each. The legacy extractor repeats the text of nested
+divs once per ancestor, which is most visible on nested_divs.html.
+
+Run from the repo root:  python -m benchmarks.html_extraction --repeat 10
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from backend.services.scraper import extract_job_text, HTML_PARSER
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "job_pages")
+
+def legacy_extract(html: str) -> str:
+    """The pre-change extractor, kept here only as the comparison baseline."""
+    soup = BeautifulSoup(html, 'html.parser')
+    text_elements = soup.find_all(['p', 'li', 'h1', 'h2', 'h3', 'div'])
+    raw_text = " ".join([elem.get_text(separator=' ', strip = True) for elem in text_elements])
+    return re.sub(r'\s+', ' ', raw_text).strip()
+
+def median_ms(func, html: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"HTML parser backend: {HTML_PARSER}")
+    print(f"{'fixture':<20} {'legacy chars':>13} {'new chars':>10} {'legacy ms':>10} {'new ms':>8}")
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        legacy_text = legacy_extract(html)
+        new_text = extract_job_text(html)
+        print(f"{os.path.basename(path):<20} {len(legacy_text):>13} {len(new_text):>10} "
+              f"{median_ms(legacy_extract, html, args.repeat):>10.1f} {median_ms(extract_job_text, html, args.repeat):>8.1f}")
@@ -0,0 +1,67 @@
+"""
+Job description cache benchmark against a local job board.
+
+Replays a practice-style workload (a handful of job URLs requested over and over) through
+scraper.scrape_job_description, first with the cache disabled (TTL 0 and no validators, i.e.
+the old always-download path) and then with the cache on, and prints the cache counters.
+
+Run from the repo root:  python -m benchmarks.jd_cache --requests 200 --urls 5
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubs import job_page_server
+from backend.services import scraper
+from backend.services.jd_cache import JobDescriptionCache
+from backend.services.workers import shutdown_pools
+
+def make_page(i: int) -> str:
+    items = "".join(f"<li>Requirement {j}: python, sql, docker and aws experience</li>" for j in range(200))
+    return f"<html><body><h1>Job {i}</h1><div><div><p>We are hiring.</p><ul>{items}</ul></div></div></body></html>"
+
+async def replay(urls: list, requests: int, seed: int = 7) -> float:
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await scraper.scrape_job_description(rng.choice(urls))
+    return time.perf_counter() - start
+
+async def run(requests: int, url_count: int, latency: float, ttl: float):
+    pages = {f"/jobs/{i}": make_page(i) for i in range(url_count)}
+    with job_page_server(pages, latency) as server:
+        urls = [server.url + path for path in pages]
+
+        # Baseline: every lookup is a miss (entries expire immediately, validators stripped)
+        scraper.jd_cache = JobDescriptionCache(ttl=0)
+        original_put = scraper.jd_cache.put
+        scraper.jd_cache.put = lambda url, text, etag=None, last_modified=None: original_put(url, text)
+        uncached = await replay(urls, requests)
+        uncached_requests = server.requests_served
+
+        scraper.jd_cache = JobDescriptionCache(ttl=ttl)
+        cached = await replay(urls, requests)
+        stats = scraper.jd_cache.stats()
+        await scraper.close_http_session()
+
+    print(f"--- {requests} LOOKUPS OVER {url_count} URLS ---")
+    print(f"No cache:   {uncached:.2f}s ({uncached_requests} full downloads)")
+    print(f"With cache: {cached:.2f}s ({server.requests_served - uncached_requests} upstream requests)")
+    print(f"Cache stats: {stats}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--urls", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="job board latency per request (s)")
+    parser.add_argument("--ttl", type=float, default=3600, help="cache TTL; use 0 to force revalidation")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.requests, args.urls, args.latency, args.ttl))
+    finally:
+        shutdown_pools()
@@ -0,0 +1,61 @@
+"""
+Interview question cache benchmark with a local fake Gemini model.
+
+Replays a skewed stream of (role, skill set) prompts, the way popular postings repeat across
+users, through ai_service.generate_interview_question and reports the cache stats.
+
+Run from the repo root:  python -m benchmarks.llm_cache --requests 300 --latency 0.2
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+
+from benchmarks.stubs import FakeGeminiClient
+from benchmarks.corpus import ROLES, SKILLS
+from backend.services import ai_service
+from backend.services.llm_cache import ResponseCache
+from backend.services.workers import shutdown_pools
+
+def prompt_stream(requests: int, distinct: int, seed: int = 3) -> list:
+    """Zipf-like mix: a few prompts dominate, a long tail appears once or twice."""
+    rng = random.Random(seed)
+    prompts = [(rng.choice(ROLES), rng.sample(SKILLS, 5)) for _ in range(distinct)]
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    picked = rng.choices(prompts, weights=weights, k=requests)
+    # Same skills in a different order and case must still hit
+    return [(role, [s.upper() if rng.random() < 0.3 else s for s in rng.sample(skills, len(skills))]) for role, skills in picked]
+
+async def run(requests: int, distinct: int, latency: float, variants: int):
+    ai_service.client = FakeGeminiClient(latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        ai_service.question_cache = ResponseCache(path=os.path.join(tmp, "llm.sqlite3"), variants=variants)
+        start = time.perf_counter()
+        for role, skills in prompt_stream(requests, distinct):
+            await ai_service.generate_interview_question(role, skills)
+        elapsed = time.perf_counter() - start
+        stats = ai_service.question_cache.stats()
+        ai_service.question_cache.close()
+
+    print(f"--- {requests} QUESTION REQUESTS, {distinct} DISTINCT PROMPTS, {variants} VARIANT(S) ---")
+    print(f"Model calls: {ai_service.client.aio.models.calls} (uncached would be {requests})")
+    print(f"Wall time:   {elapsed:.2f}s (uncached would be ~{requests * latency:.2f}s)")
+    print(f"Cache stats: {stats}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--distinct", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model latency per call (s)")
+    parser.add_argument("--variants", type=int, default=1)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.requests, args.distinct, args.latency, args.variants))
+    finally:
+        shutdown_pools()
@@ -0,0 +1,144 @@
+"""
+Gemini gateway fault-injection benchmark against the local fake Gemini server.
+
+Scenarios (each drives --calls generate() calls, --concurrency at a time):
+  tail     10% of requests take +2s; compare p50/p99 with hedging off and on
+  faults   30% of requests fail with 429/503; compare success rate with retries off and on
+  outage   every request fails; the circuit breaker should stop calling upstream and fail fast
+
+Before the scenarios, a retry check (in-process client that always answers 503 / 429) asserts that
+one call makes exactly max_retries + 1 attempts, counts max_retries retries, sleeps each backoff delay
+and leaves the breaker closed; --check-retries runs only that.
+
+Run from the repo root:  python -m benchmarks.llm_gateway --calls 100
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google import genai
+from google.genai import types
+from benchmarks.stubs import gemini_server
+from backend.services.llm_gateway import GeminiGateway, CircuitBreaker, LLMError
+
+MODEL = "gemini-2.5-flash"
+
+async def drive(url: str, gateway_kwargs: dict, calls: int, concurrency: int) -> dict:
+    client = genai.Client(api_key="offline", http_options=types.HttpOptions(base_url=url))
+    gateway = GeminiGateway(lambda: client, **gateway_kwargs)
+    limit = asyncio.Semaphore(concurrency)
+    latencies, errors = [], {}
+
+    async def one(i):
+        async with limit:
+            start = time.perf_counter()
+            try:
+                await gateway.generate(f"prompt {i}", MODEL)
+                latencies.append(time.perf_counter() - start)
+            except LLMError as e:
+                errors[e.code] = errors.get(e.code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    wall = time.perf_counter() - start
+    await client.aio.aclose()
+
+    latencies.sort()
+    pct = lambda p: round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000) if latencies else None
+    return {"ok": len(latencies), "errors": errors, "p50_ms": pct(0.5), "p95_ms": pct(0.95), "p99_ms": pct(0.99), "wall_s": round(wall, 2),
+            "upstream_requests": gateway.counters["upstream_requests"], "hedges": gateway.counters["hedges"],
+            "circuit": gateway.breaker.state}
+
+class StatusError(Exception):
+    """What the SDK raises for an HTTP error: the status is in .code."""
+    def __init__(self, code: int):
+        super().__init__(f"{code} from upstream")
+        self.code = code
+
+class FailingModels:
+    def __init__(self, status: int):
+        self.status = status
+        self.requests = 0
+
+    async def generate_content(self, model: str, contents: str, **kwargs):
+        self.requests += 1
+        raise StatusError(self.status)
+
+    async def generate_content_stream(self, model: str, contents: str, **kwargs):
+        self.requests += 1
+        raise StatusError(self.status)
+
+class RecordingGateway(GeminiGateway):
+    """Remembers every backoff delay it hands out."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delays = []
+
+    def backoff(self, attempt: int) -> float:
+        delay = super().backoff(attempt)
+        self.delays.append(delay)
+        return delay
+
+async def check_retries(max_retries: int = 3, backoff_base: float = 0.02):
+    """One failing call: max_retries + 1 attempts, max_retries retries, every backoff slept, breaker still closed."""
+    for status in (503, 429):
+        for mode in ("generate", "stream"):
+            models = FailingModels(status)
+            client = type("Client", (), {"aio": type("Aio", (), {"models": models})()})()
+            # The default breaker threshold (5) is above one call's attempts, so it must stay closed
+            gateway = RecordingGateway(lambda: client, max_retries=max_retries, backoff_base=backoff_base, backoff_cap=1.0)
+            start = time.perf_counter()
+            try:
+                if mode == "generate":
+                    await gateway.generate("prompt", MODEL)
+                else:
+                    async for _ in gateway.stream("prompt", MODEL):
+                        pass
+                raise AssertionError("the call should have failed")
+            except LLMError:
+                pass
+            elapsed = time.perf_counter() - start
+            slept = sum(gateway.delays[:max_retries])
+            assert models.requests == max_retries + 1, f"{status} {mode}: {models.requests} attempts"
+            assert gateway.counters["retries"] == max_retries, f"{status} {mode}: {gateway.counters['retries']} retries"
+            assert all(delay <= backoff_base * 2 ** i for i, delay in enumerate(gateway.delays)), gateway.delays
+            assert elapsed >= slept, f"{status} {mode}: {elapsed:.3f}s elapsed, backoff alone is {slept:.3f}s"
+            assert gateway.breaker.state == "closed", f"{status} {mode}: breaker {gateway.breaker.state}"
+            print(f"retry check {status} {mode:<8} attempts {models.requests}, retries {gateway.counters['retries']}, "
+                  f"backoff {slept * 1000:.1f} ms slept in {elapsed * 1000:.1f} ms, breaker {gateway.breaker.state}")
+
+def scenario(name: str, server_kwargs: dict, gateway_kwargs: dict, calls: int, concurrency: int):
+    with gemini_server(**server_kwargs) as server:
+        result = asyncio.run(drive(server.url, gateway_kwargs, calls, concurrency))
+    print(f"{name:<28} {result}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--check-retries", action="store_true", help="only run the retry check")
+    args = parser.parse_args()
+    n, c = args.calls, args.concurrency
+
+    asyncio.run(check_retries())
+    if args.check_retries:
+        sys.exit(0)
+
+    tail = {"latency": 0.2, "tail_rate": 0.1, "tail_latency": 2.0}
+    scenario("tail, no hedging", tail, {"hedge_after": 0}, n, c)
+    scenario("tail, hedge after 500ms", tail, {"hedge_after": 0.5}, n, c)
+
+    faults = {"latency": 0.02, "fault_rate": 0.3}
+    scenario("30% faults, no retries", faults, {"max_retries": 0, "breaker": CircuitBreaker(threshold=10**6)}, n, c)
+    scenario("30% faults, 3 retries", faults, {"max_retries": 3, "backoff_base": 0.05,
+                                               "breaker": CircuitBreaker(threshold=10**6)}, n, c)
+
+    outage = {"latency": 0.02, "fault_rate": 1.0}
+    scenario("outage, breaker off", outage, {"max_retries": 1, "backoff_base": 0.01,
+                                             "breaker": CircuitBreaker(threshold=10**6)}, n, c)
+    scenario("outage, breaker after 5", outage, {"max_retries": 1, "backoff_base": 0.01,
+                                                 "breaker": CircuitBreaker(threshold=5, reset=30)}, n, c)
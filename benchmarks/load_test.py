@@ -0,0 +1,262 @@
+"""
+End-to-end load harness: the real app under uvicorn, every upstream replaced by a local stand-in.
+
+Starts a fake Gemini API, a fake Supabase/PostgREST and a job board serving the fixture pages on
+localhost (each with configurable latency and fault rates), then boots backend.main:app with
+uvicorn --workers W pointed at them. Virtual users replay whole interviews in a loop:
+
+  login -> analyze (real PDF upload, job page from the local board) -> N x (chat/stream + next-question) -> history
+
+For every (workers, concurrency) setting it reports completed interviews per second and, per
+endpoint, throughput, error count and p50 / p95 / p99 latency. On a machine with fewer cores than
+workers the extra workers only add contention, so read the numbers against `nproc`.
+
+Run from the repo root:
+  python -m benchmarks.load_test --workers 1,2 --concurrency 4,16 --duration 30
+  python -m benchmarks.load_test --gemini-latency 1.5 --gemini-fault-rate 0.05 --db-latency 0.08 --output load.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+
+import httpx
+from backend.services.auth_service import hash_password
+from benchmarks.corpus import ROLES
+from benchmarks.stubs import postgrest_server, gemini_server, job_page_server
+from benchmarks.suite import make_pdf, FIXTURE_DIR
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "correct horse battery staple"
+ANSWER = "I would put a queue in front of the writes, batch them, and watch the p99 while load testing."
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class AppProcess:
+    """backend.main:app under `uvicorn --workers N` in a child process, configured through the environment."""
+
+    def __init__(self, workers: int, env: dict):
+        self.port = free_port()
+        self.workers = workers
+        self.env = {**os.environ, **env}
+        self.process = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(self.port),
+             "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=REPO_ROOT, env=self.env,
+        )
+        # Ready once /api/ready has said 200 as many times in a row as there are workers (each worker warms up
+        # on its own, and the kernel spreads connections across them)
+        deadline = time.monotonic() + 60
+        ready_in_a_row = 0
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {self.process.returncode} during startup.")
+            try:
+                ready_in_a_row = ready_in_a_row + 1 if httpx.get(f"{self.url}/api/ready", timeout=1).status_code == 200 else 0
+                if ready_in_a_row >= self.workers:
+                    return self
+            except httpx.TransportError:
+                ready_in_a_row = 0
+            time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError("The app did not become ready within 60 s.")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.interviews = 0
+
+    async def call(self, endpoint: str, request) -> dict:
+        """Awaits `request` (a coroutine returning an httpx.Response or a body dict) and records the outcome."""
+        start = time.perf_counter()
+        try:
+            result = await request
+            ok = result.get("status") in ("success", "alive")
+        except Exception:
+            result, ok = {}, False
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if not ok:
+            self.errors[endpoint] += 1
+        return result
+
+async def json_of(response_coroutine) -> dict:
+    response = await response_coroutine
+    return response.json()
+
+async def read_stream(client: httpx.AsyncClient, question: str) -> dict:
+    """Consumes /api/chat/stream to the end; success means a `done` frame arrived."""
+    async with client.stream("POST", "/api/chat/stream", json={"question": question, "answer": ANSWER}) as response:
+        async for line in response.aiter_lines():
+            if line == "event: done":
+                return {"status": "success"}
+            if line == "event: error":
+                return {"status": "error"}
+    return {"status": "error"}
+
+async def virtual_user(base_url: str, user: int, job_urls: list, pdf: bytes, turns: int, stop_at: float,
+                       recorder: Recorder, rng: random.Random):
+    username = f"candidate-{user}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        while time.perf_counter() < stop_at:
+            # 1. Sign in
+            await recorder.call("login", json_of(client.post("/api/login", data={"username": username, "password": PASSWORD})))
+
+            # 2. Analyze a real PDF against one of the job postings (a few postings are much more popular)
+            job_url = rng.choices(job_urls, weights=[1 / (rank + 1) for rank in range(len(job_urls))])[0]
+            analysis = await recorder.call("analyze", json_of(client.post(
+                "/api/analyze",
+                data={"job_url": job_url, "job_role": rng.choice(ROLES), "candidate_name": username},
+                files={"resume": ("resume.pdf", pdf, "application/pdf")},
+            )))
+            if analysis.get("status") != "success":
+                continue
+
+            # 3. Interview turns: streamed feedback, then the next pre-generated question
+            question = analysis["interview_question"]
+            for _ in range(turns):
+                if time.perf_counter() >= stop_at or not question:
+                    break
+                await recorder.call("chat_stream", read_stream(client, question))
+                following = await recorder.call("next_question", json_of(client.get(f"/api/session/{analysis['session_id']}/next-question")))
+                question = following.get("question")
+
+            # 4. Look back at past sessions
+            await recorder.call("history", json_of(client.get(f"/api/history/{username}")))
+            recorder.interviews += 1
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else float("nan")
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for endpoint, latencies in recorder.latencies.items():
+        endpoints[endpoint] = {
+            "requests": len(latencies),
+            "errors": recorder.errors[endpoint],
+            "rps": round(len(latencies) / elapsed, 2),
+            "p50_ms": round(percentile(latencies, 0.50), 1),
+            "p95_ms": round(percentile(latencies, 0.95), 1),
+            "p99_ms": round(percentile(latencies, 0.99), 1),
+        }
+    return {"elapsed_s": round(elapsed, 1), "interviews": recorder.interviews,
+            "interviews_per_s": round(recorder.interviews / elapsed, 3), "endpoints": endpoints}
+
+async def drive(base_url: str, concurrency: int, duration: float, turns: int, job_urls: list, pdf: bytes, seed: int) -> dict:
+    recorder = Recorder()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        virtual_user(base_url, user, job_urls, pdf, turns, start + duration, recorder, random.Random(seed + user))
+        for user in range(concurrency)
+    ))
+    # Users finish the request they are in, so measure to the last answer
+    return summarize(recorder, time.perf_counter() - start)
+
+def report(workers: int, concurrency: int, summary: dict):
+    print(f"\n--- workers={workers} concurrency={concurrency}: {summary['interviews']} interviews in "
+          f"{summary['elapsed_s']} s ({summary['interviews_per_s']}/s) ---")
+    print(f"{'endpoint':14} {'requests':>8} {'errors':>6} {'req/s':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for endpoint in ("login", "analyze", "chat_stream", "next_question", "history"):
+        row = summary["endpoints"].get(endpoint)
+        if row:
+            print(f"{endpoint:14} {row['requests']:8d} {row['errors']:6d} {row['rps']:7.2f} "
+                  f"{row['p50_ms']:9.1f} {row['p95_ms']:9.1f} {row['p99_ms']:9.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1", help="comma-separated uvicorn worker counts")
+    parser.add_argument("--concurrency", default="4,16", help="comma-separated numbers of virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per setting")
+    parser.add_argument("--turns", type=int, default=3, help="chat turns per interview")
+    parser.add_argument("--pdf-pages", type=int, default=2)
+    parser.add_argument("--postings", type=int, default=30, help="distinct job URLs on the local board")
+    parser.add_argument("--gemini-latency", type=float, default=0.8)
+    parser.add_argument("--gemini-tail-rate", type=float, default=0.02)
+    parser.add_argument("--gemini-tail-latency", type=float, default=4.0)
+    parser.add_argument("--gemini-fault-rate", type=float, default=0.01)
+    parser.add_argument("--db-latency", type=float, default=0.04)
+    parser.add_argument("--db-error-rate", type=float, default=0.0)
+    parser.add_argument("--job-latency", type=float, default=0.3)
+    parser.add_argument("--cpu-workers", type=int, help="CPU_WORKERS inside each app worker (default: the app's own)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write all summaries to this JSON file")
+    args = parser.parse_args()
+
+    worker_counts = [int(value) for value in args.workers.split(",")]
+    concurrencies = [int(value) for value in args.concurrency.split(",")]
+    max_users = max(concurrencies)
+
+    fixtures = {name: open(os.path.join(FIXTURE_DIR, name), encoding="utf-8").read() for name in sorted(os.listdir(FIXTURE_DIR))}
+    pages = {f"/jobs/{i}": fixtures[sorted(fixtures)[i % len(fixtures)]] for i in range(args.postings)}
+
+    print("Hashing the virtual users' passwords...")
+    password_hash = hash_password(PASSWORD)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "resume.pdf")
+        make_pdf(pdf_path, args.pdf_pages)
+        with open(pdf_path, "rb") as f:
+            pdf = f.read()
+
+        for workers in worker_counts:
+            for concurrency in concurrencies:
+                # Fresh stand-ins per setting, so history sizes and caches do not leak between runs
+                users = [{"id": i, "username": f"candidate-{i}", "password_hash": password_hash} for i in range(max_users)]
+                with postgrest_server(args.db_latency, rows={"users": users}, unique={"users": "username", "documents": "hash"},
+                                      generated=("interviews",), error_rate=args.db_error_rate, seed=args.seed) as db, \
+                     gemini_server(args.gemini_latency, args.gemini_tail_rate, args.gemini_tail_latency,
+                                   args.gemini_fault_rate, seed=args.seed) as gemini, \
+                     job_page_server(pages, args.job_latency) as board:
+                    env = {
+                        "SUPABASE_URL": db.url, "SUPABASE_KEY": "offline-benchmark",
+                        "GEMINI_API_KEY": "offline-benchmark", "GEMINI_BASE_URL": gemini.url,
+                        "LLM_CACHE_PATH": "", "JD_CACHE_PATH": "", "RESUME_CACHE_PATH": "",
+                        "SESSION_LOG_SPILL_PATH": os.path.join(tmp, "spill.jsonl"), "ANALYZE_JOBS_PATH": os.path.join(tmp, "jobs.sqlite3"),
+                        "TFIDF_MODEL_PATH": os.path.join(tmp, "no-model.joblib"),
+                    }
+                    if args.cpu_workers:
+                        env["CPU_WORKERS"] = str(args.cpu_workers)
+                    with AppProcess(workers, env) as app:
+                        job_urls = [f"{board.url}{path}" for path in pages]
+                        summary = asyncio.run(drive(app.url, concurrency, args.duration, args.turns, job_urls, pdf, args.seed))
+                    summary.update({"workers": workers, "concurrency": concurrency,
+                                    "upstream_requests": {"gemini": gemini.requests_served, "supabase": db.requests_served,
+                                                          "job_board": board.requests_served}})
+                report(workers, concurrency, summary)
+                print(f"upstream requests: {summary['upstream_requests']}")
+                results.append(summary)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"settings": vars(args), "cpus": os.cpu_count(), "results": results}, f, indent=2)
+        print(f"\nSummaries written to {args.output}")
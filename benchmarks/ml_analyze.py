@@ -0,0 +1,70 @@
+"""
+Per-request ML latency: legacy two-fit path vs. ml_engine.analyze.
+
+Legacy = calculate_match_score + extract_missing_keywords, each fitting its own TfidfVectorizer.
+New    = analyze() with no saved model (one local fit) and with a corpus-fitted model loaded
+         from disk (transform + sparse dot product only).
+
+Run from the repo root:  python -m benchmarks.ml_analyze --pairs 200 --corpus 5000
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from backend.services import ml_engine
+from benchmarks.corpus import corpus
+
+def legacy_analyze(resume_text: str, job_description: str):
+    """The pre-change pair of functions, kept here only as the comparison baseline."""
+    vectorizer = TfidfVectorizer(stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
+    score = round(cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0] * 100, 2)
+
+    vectorizer = TfidfVectorizer(stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform([job_description])
+    word_weights = dict(zip(vectorizer.get_feature_names_out(), tfidf_matrix.toarray()[0]))
+    missing = []
+    for word, weight in sorted(word_weights.items(), key=lambda x: x[1], reverse=True):
+        if word not in resume_text.lower() and not word.isnumeric():
+            missing.append(word)
+            if len(missing) >= 5:
+                break
+    return score, missing
+
+def per_call_ms(func, pairs: list) -> tuple:
+    timings = []
+    for resume, jd in pairs:
+        start = time.perf_counter()
+        func(resume, jd)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument("--corpus", type=int, default=5000, help="JDs used to fit the offline model")
+    args = parser.parse_args()
+
+    pairs = list(zip(corpus(args.pairs, "resume", seed=1), corpus(args.pairs, "jd", seed=2)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "tfidf.joblib")
+        ml_engine.load_model(model_path) # No file yet: per-request fallback fit
+        results = {"legacy (2 fits)": per_call_ms(legacy_analyze, pairs),
+                   "analyze, no model": per_call_ms(ml_engine.analyze, pairs)}
+
+        ml_engine.fit_corpus_model(corpus(args.corpus, "jd", seed=3), model_path, min_df=2)
+        ml_engine.load_model(model_path)
+        results["analyze, fitted model"] = per_call_ms(ml_engine.analyze, pairs)
+
+    print(f"--- {args.pairs} RESUME/JD PAIRS ---")
+    for name, (p50, p99) in results.items():
+        print(f"{name:<24} p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
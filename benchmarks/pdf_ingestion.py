@@ -0,0 +1,84 @@
+"""
+PDF ingestion benchmark: legacy temp-file path vs. in-memory page-parallel path.
+
+Legacy = copy the upload to temp_<name>.pdf, fitz.open(path), extracted_text += page.get_text().
+New    = pdf_parser.extract_text_parallel(bytes), no disk and a single join.
+
+Fixtures are generated in memory with PyMuPDF at 1, 10 and 100 pages.
+
+Run from the repo root:  python -m benchmarks.pdf_ingestion --repeat 5
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from backend.services.pdf_parser import extract_text_parallel
+from backend.services.workers import shutdown_pools
+
+PAGE_COUNTS = [1, 10, 100]
+LINE = "Senior data engineer with python, sql, spark, airflow, kafka and kubernetes experience. "
+
+def make_pdf(pages: int) -> bytes:
+    """Builds a text-dense PDF with the given number of pages."""
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), f"Page {i}. " + LINE * 40, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def legacy_extract(pdf_bytes: bytes, filename: str) -> str:
+    """The pre-change /api/analyze path, kept here only as the comparison baseline."""
+    temp_pdf_path = f"temp_{filename}"
+    with open(temp_pdf_path, "wb") as buffer:
+        buffer.write(pdf_bytes)
+    extracted_text = ""
+    with fitz.open(temp_pdf_path) as doc:
+        for page in doc:
+            extracted_text += page.get_text()
+    os.remove(temp_pdf_path)
+    return extracted_text
+
+async def time_new(pdf_bytes: bytes, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await extract_text_parallel(pdf_bytes, max_pages=max(PAGE_COUNTS))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def time_legacy(pdf_bytes: bytes, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        legacy_extract(pdf_bytes, "bench.pdf")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+async def run(repeat: int):
+    # Warm the process pool so worker start-up is not billed to the first fixture
+    await extract_text_parallel(make_pdf(1))
+
+    print(f"{'pages':>6} {'legacy ms':>10} {'new ms':>10} {'speedup':>8}")
+    for pages in PAGE_COUNTS:
+        pdf_bytes = make_pdf(pages)
+        assert legacy_extract(pdf_bytes, "check.pdf") == await extract_text_parallel(pdf_bytes, max_pages=pages)
+        legacy = statistics.median(time_legacy(pdf_bytes, repeat)) * 1000
+        new = statistics.median(await time_new(pdf_bytes, repeat)) * 1000
+        print(f"{pages:>6} {legacy:>10.1f} {new:>10.1f} {legacy / new:>7.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.repeat))
+    finally:
+        shutdown_pools()
@@ -0,0 +1,81 @@
+"""
+Per-turn question latency: one Gemini call per turn vs. the pre-generated session question bank.
+
+Simulates interviews of --turns questions with a fake model of --latency seconds and a candidate
+who spends --think seconds answering each question. Without the bank every turn waits for a full
+model round trip; with it only the first question waits and later turns come from memory while
+refills run in the background during the candidate's answer.
+
+Run from the repo root:  python -m benchmarks.question_bank --turns 10 --latency 1.5 --think 2
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+
+from benchmarks.stubs import FakeGeminiClient
+from benchmarks.corpus import SKILLS
+from backend.services import ai_service
+from backend.services.llm_cache import ResponseCache
+from backend.services.question_bank import QuestionBank
+from backend.services.workers import shutdown_pools
+
+ROLE = "Backend Engineer"
+
+async def per_turn_calls(turns: int, think: float) -> list:
+    """Today's shape: a synchronous model call in front of every question."""
+    waits = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        await ai_service.generate_interview_question(ROLE, SKILLS[turn:turn + 5])
+        waits.append(time.perf_counter() - start)
+        await asyncio.sleep(think)
+    return waits
+
+async def banked(bank: QuestionBank, turns: int, think: float) -> list:
+    waits = []
+    session_id = bank.create(ROLE, SKILLS[:5])
+    for _ in range(turns):
+        start = time.perf_counter()
+        question, _ = await bank.next_question(session_id)
+        assert question
+        waits.append(time.perf_counter() - start)
+        await asyncio.sleep(think)
+    return waits
+
+def report(name: str, waits: list, calls: int):
+    later = waits[1:] or waits
+    print(f"{name:<22} first {waits[0] * 1000:7.0f} ms | later turns median {statistics.median(later) * 1000:7.1f} ms, "
+          f"max {max(later) * 1000:7.1f} ms | model calls {calls}")
+
+async def run(turns: int, latency: float, think: float, batch_size: int):
+    # Memory-only cache of size 0, so neither path is helped by the question cache
+    ai_service.question_cache = ResponseCache(path="", memory_size=0)
+
+    ai_service.client = FakeGeminiClient(latency)
+    waits = await per_turn_calls(turns, think)
+    report("one call per turn", waits, ai_service.client.aio.models.calls)
+
+    ai_service.client = FakeGeminiClient(latency)
+    bank = QuestionBank(ai_service.generate_question_batch, batch_size=batch_size)
+    waits = await banked(bank, turns, think)
+    report(f"bank (batch of {batch_size})", waits, ai_service.client.aio.models.calls)
+    print(f"Bank stats: {bank.stats()}")
+    await bank.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=1.5, help="fake model latency per call (s)")
+    parser.add_argument("--think", type=float, default=2.0, help="candidate answer time per turn (s)")
+    parser.add_argument("--batch-size", type=int, default=6)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.turns, args.latency, args.think, args.batch_size))
+    finally:
+        shutdown_pools()
@@ -0,0 +1,67 @@
+"""
+Batch ranking scaling benchmark: one JD against 100 .. 10k synthetic resumes.
+
+Compares ranking.rank_resumes, the implementation /api/rank streams (chunked sparse matrix-vector
+scoring on the process pool + top-k heap), with the one-call-per-resume approach (ml_engine.analyze
+in a loop), which is what ranking through /api/analyze amounted to minus the scrape and the LLM call.
+Also checks that tied scores come back earliest resume first.
+
+Run from the repo root:  python -m benchmarks.rank_scaling --sizes 100 1000 10000
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services import ml_engine
+from backend.services.ranking import rank_resumes
+from backend.services.workers import run_cpu_bound, shutdown_pools
+from benchmarks.corpus import corpus
+
+LOOP_LIMIT = 2000 # The per-resume loop is too slow to be worth timing beyond this
+
+async def rank(resumes: list, jd: str, top_k: int, chunk_size: int) -> list:
+    return [event async for event in rank_resumes(resumes, jd, top_k, chunk_size)]
+
+async def run(sizes: list, top_k: int, chunk_size: int):
+    jd = corpus(1, "jd", seed=11)[0]
+    # Start the process pool outside the measurement
+    await run_cpu_bound(ml_engine.score_resumes, [jd], jd)
+
+    # Identical resumes score the same: the top k must be the first k, in order, whatever the chunking
+    tied = await rank([corpus(1, "resume", seed=1)[0]] * (chunk_size * 2 + 7), jd, top_k, chunk_size)
+    indices = [event["index"] for event in tied if event["event"] == "candidate"]
+    assert indices == list(range(top_k)), f"ties not broken by position: {indices}"
+
+    print(f"{'resumes':>8} {'batch s':>9} {'resumes/s':>10} {'loop s':>9} {'speedup':>8}")
+    for size in sizes:
+        resumes = corpus(size, "resume", seed=size)
+
+        start = time.perf_counter()
+        events = await rank(resumes, jd, top_k, chunk_size)
+        batch = time.perf_counter() - start
+        assert sum(1 for e in events if e["event"] == "candidate") == min(top_k, size)
+
+        loop = None
+        if size <= LOOP_LIMIT:
+            start = time.perf_counter()
+            for resume in resumes:
+                ml_engine.analyze(resume, jd)
+            loop = time.perf_counter() - start
+
+        loop_cols = f"{loop:>9.2f} {loop / batch:>7.1f}x" if loop else f"{'-':>9} {'-':>8}"
+        print(f"{size:>8} {batch:>9.2f} {size / batch:>10.0f} {loop_cols}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.sizes, args.top_k, args.chunk_size))
+    finally:
+        shutdown_pools()
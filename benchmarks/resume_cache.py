@@ -0,0 +1,123 @@
+"""
+Repeat-upload latency with the parsed resume cache.
+
+Drives /api/analyze in-process with the job page, Supabase and Gemini replaced by instant stand-ins,
+so what is left on the critical path is the resume parse and the match. For each of --pages, uploads
+--resumes distinct resume PDFs of that length three times:
+
+  first upload       cache miss: page count, page-parallel extraction on the process pool, clean_text
+  repeat, memory     the same bytes again in the same process (in-process LRU tier)
+  repeat, disk       the same bytes after a restart or on another worker (fresh memory tier, same SQLite file)
+
+Reports the median request latency and the median pdf_extract + clean_text time from the Server-Timing
+header, then the cache's own stats (hit ratio, average parse, estimated time saved).
+
+Run from the repo root:  python -m benchmarks.resume_cache --pages 1,3,10,30 --resumes 10
+"""
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+
+import fitz
+import httpx
+import backend.main as main
+from backend.services import ai_service, analysis
+from backend.services.llm_cache import ResponseCache
+from backend.services.resume_cache import ParsedResumeCache
+from backend.services.workers import shutdown_pools
+from benchmarks.corpus import synthetic_resume
+from benchmarks.stubs import FakeGeminiClient
+
+async def instant_scrape(url: str) -> str:
+    return "Backend engineer. Must have python, fastapi, docker, aws, kubernetes and terraform."
+
+def make_resume(pages: int, rng: random.Random) -> bytes:
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(36, 36, 576, 806), synthetic_resume(rng, sentences=30), fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+def parse_ms(server_timing: str) -> float:
+    """pdf_extract + clean_text from a Server-Timing header."""
+    total = 0.0
+    for part in server_timing.split(","):
+        name, _, duration = part.strip().partition(";dur=")
+        if name in ("pdf_extract", "clean_text"):
+            total += float(duration)
+    return total
+
+async def upload_all(client: httpx.AsyncClient, pdfs: list) -> tuple:
+    latencies, parses = [], []
+    for i, pdf in enumerate(pdfs):
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/analyze",
+            data={"job_url": "http://jobs.local/1", "job_role": "Backend Engineer", "candidate_name": f"bench-{i}"},
+            files={"resume": ("resume.pdf", pdf, "application/pdf")},
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.json()["status"] == "success", response.text
+        parses.append(parse_ms(response.headers["server-timing"]))
+    return statistics.median(latencies), statistics.median(parses)
+
+async def run(page_counts: list, resumes: int, cache_path: str):
+    analysis.scrape_job_description = instant_scrape
+    main.session_logger.write_batch = lambda sessions: len(sessions)
+    ai_service.question_cache = ResponseCache(path="", memory_size=512)
+    ai_service.client = FakeGeminiClient(0.0)
+    rng = random.Random(0)
+
+    print(f"--- {resumes} RESUMES PER SIZE, {os.cpu_count()} CPU ---")
+    print(f"{'pages':>5}  {'first upload':>22}  {'repeat, memory':>22}  {'repeat, disk':>22}   (request / parse, median)")
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        # Warm the process pool, the question cache and the model outside the measurement
+        analysis.resume_cache = ParsedResumeCache(path="", memory_size=0)
+        await upload_all(client, [make_resume(1, rng)])
+
+        memory_stats, disk_stats = [], []
+        for pages in page_counts:
+            pdfs = [make_resume(pages, rng) for _ in range(resumes)]
+            analysis.resume_cache = ParsedResumeCache(path=cache_path)
+            first = await upload_all(client, pdfs)
+            memory = await upload_all(client, pdfs)
+            memory_stats.append(analysis.resume_cache.stats())
+            analysis.resume_cache.close()
+
+            # A new process: empty memory tier over the same file
+            analysis.resume_cache = ParsedResumeCache(path=cache_path)
+            disk = await upload_all(client, pdfs)
+            disk_stats.append(analysis.resume_cache.stats())
+            analysis.resume_cache.close()
+            print(f"{pages:5d}  " + "  ".join(f"{request:9.1f} / {parse:6.1f} ms" for request, parse in (first, memory, disk)))
+    await main.session_logger.close()
+
+    print("\n--- CACHE STATS (per size: first + memory repeat, then disk repeat) ---")
+    for pages, memory, disk in zip(page_counts, memory_stats, disk_stats):
+        print(f"{pages:3d} pages: hit ratio {memory['hit_ratio']:.2f} then {disk['hit_ratio']:.2f}, "
+              f"avg parse {memory['avg_parse_ms']:.1f} ms, saved {memory['estimated_saved_ms'] + disk['disk_hits'] * memory['avg_parse_ms']:.0f} ms "
+              f"({memory['memory_hits']} memory hits, {disk['disk_hits']} disk hits, {memory['misses']} misses)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default="1,3,10,30", help="comma-separated resume lengths")
+    parser.add_argument("--resumes", type=int, default=10, help="distinct resumes per length")
+    args = parser.parse_args()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(run([int(value) for value in args.pages.split(",")], args.resumes, os.path.join(tmp, "resume_cache.sqlite3")))
+    finally:
+        shutdown_pools()
@@ -0,0 +1,156 @@
+"""
+Write-behind session logging vs an inline Supabase insert on /api/analyze.
+
+Part 1 drives /api/analyze against a stub PostgREST server with a fixed per-request latency and
+the fake Gemini model, once with the insert awaited inside the request (the old behaviour) and
+once through db_service.session_logger, and reports analyze p50 / p99 plus the logger's stats.
+The question batch is served from the LLM cache after warm-up, as it is for repeat postings, so
+what is left on the critical path is parsing, matching and the database write.
+
+Part 2 exercises the overflow policies with the database down: "spill" appends to a local file
+which the next start replays (two workers starting together, plus a file left by a worker that crashed
+mid-replay: every session written once), "block" holds callers for at most the block timeout.
+
+Run from the repo root:  python -m benchmarks.session_logging --calls 200 --db-latency 0.2
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+
+import httpx
+import backend.main as main
+from backend.services import ai_service, analysis, db_service
+from backend.services.llm_cache import ResponseCache
+from backend.services.resume_cache import ParsedResumeCache
+from backend.services.session_logger import SessionLogger
+from backend.services.workers import run_blocking, shutdown_pools
+from benchmarks.analyze_concurrency import make_pdf, fake_scrape
+from benchmarks.document_storage import use_server
+from benchmarks.stubs import FakeGeminiClient, postgrest_server
+
+class InlineLogger:
+    """The old path: the request waits for its own insert."""
+
+    async def enqueue(self, session: dict):
+        await run_blocking(db_service.insert_sessions, [session])
+
+    async def close(self):
+        pass
+
+def pct(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+async def drive(logger, calls: int, concurrency: int, pdf: bytes) -> list:
+    analysis.session_logger = logger
+    slots = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        async def one(i: int) -> float:
+            async with slots:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/analyze",
+                    data={"job_url": "http://jobs.local/1", "job_role": "Backend Engineer", "candidate_name": f"bench-{i % 20}"},
+                    files={"resume": ("resume.pdf", pdf, "application/pdf")},
+                )
+                assert response.json()["status"] == "success", response.text
+                return time.perf_counter() - start
+
+        await one(-1) # Warm the process pool and the question cache
+        latencies = await asyncio.gather(*(one(i) for i in range(calls)))
+    await logger.close()
+    return latencies
+
+async def compare(calls: int, concurrency: int, db_latency: float):
+    analysis.scrape_job_description = fake_scrape
+    ai_service.question_cache = ResponseCache(path="", memory_size=512)
+    # The same PDF every call: keep its parse on the critical path
+    analysis.resume_cache = ParsedResumeCache(path="", memory_size=0)
+    ai_service.client = FakeGeminiClient(0.5)
+    pdf = make_pdf()
+
+    print(f"--- {calls} /api/analyze CALLS, CONCURRENCY {concurrency}, DB LATENCY {db_latency * 1000:.0f} ms ---")
+    for name, make_logger in (("inline insert", InlineLogger),
+                              ("write-behind", lambda: SessionLogger(db_service.insert_sessions, spill_path=""))):
+        with postgrest_server(latency=db_latency, unique={"documents": "hash"}) as server:
+            use_server(server)
+            logger = make_logger()
+            latencies = await drive(logger, calls, concurrency, pdf)
+            rows = len(server.httpd.RequestHandlerClass.rows.get("interviews", []))
+            print(f"{name:14} p50 {pct(latencies, 0.50):7.1f} ms | p99 {pct(latencies, 0.99):7.1f} ms | "
+                  f"{rows} rows written in {server.requests_served} DB requests")
+            if isinstance(logger, SessionLogger):
+                stats = logger.stats()
+                print(f"{'':14} batches {stats['batches']}, avg batch {stats['avg_batch_size']}, "
+                      f"avg flush {stats['avg_flush_ms']} ms, max flush {stats['max_flush_ms']} ms")
+
+async def overflow(sessions: int):
+    def db_down(batch):
+        raise ConnectionError("database unavailable")
+
+    written = []
+    with tempfile.TemporaryDirectory() as tmp:
+        spill_path = os.path.join(tmp, "spill.jsonl")
+
+        print(f"--- OVERFLOW: {sessions} SESSIONS, QUEUE OF 10, DATABASE DOWN ---")
+        logger = SessionLogger(db_down, queue_size=10, batch_size=5, flush_interval=0.01, max_retries=2,
+                               backoff_base=0.01, overflow="spill", spill_path=spill_path)
+        start = time.perf_counter()
+        for i in range(sessions):
+            await logger.enqueue({"candidate_name": f"c{i}"})
+        enqueue_ms = (time.perf_counter() - start) * 1000 / sessions
+        await logger.close(timeout=1)
+        stats = logger.stats()
+        print(f"spill:  avg enqueue {enqueue_ms:.2f} ms | spilled {stats['spilled']} | "
+              f"failed batches {stats['failed_batches']} | retries {stats['retries']}")
+
+        # A worker that crashed mid-replay leaves a .replaying file behind
+        with open(f"{spill_path}.replaying", "w", encoding="utf-8") as f:
+            f.writelines(json.dumps({"candidate_name": f"crashed-{i}"}) + "\n" for i in range(3))
+        # Two workers starting together both try to replay the same files
+        workers = [SessionLogger(written.extend, spill_path=spill_path, flush_interval=0.01) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            await worker.close()
+        names = [session["candidate_name"] for session in written]
+        left = [name for name in os.listdir(tmp) if name.startswith("spill.jsonl")]
+        print(f"replay: replayed {sum(worker.stats()['replayed'] for worker in workers)} by 2 workers | "
+              f"written {len(written)} of {sessions} + 3 crash leftovers | duplicates {len(names) - len(set(names))} | "
+              f"spill files left: {left or 'none'}")
+
+        def slow_db(batch):
+            time.sleep(0.05)
+        logger = SessionLogger(slow_db, queue_size=10, batch_size=5, flush_interval=0.01,
+                               overflow="block", block_timeout=0.2, spill_path=spill_path)
+        waits = []
+        for i in range(sessions):
+            start = time.perf_counter()
+            await logger.enqueue({"candidate_name": f"c{i}"})
+            waits.append(time.perf_counter() - start)
+        await logger.close()
+        stats = logger.stats()
+        print(f"block:  p99 enqueue {pct(waits, 0.99):.1f} ms | blocked {stats['blocked']} | "
+              f"written {stats['written']} | spilled {stats['spilled']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--db-latency", type=float, default=0.2)
+    args = parser.parse_args()
+    try:
+        asyncio.run(compare(args.calls, args.concurrency, args.db_latency))
+        asyncio.run(overflow(200))
+    finally:
+        shutdown_pools()
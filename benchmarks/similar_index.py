@@ -0,0 +1,173 @@
+"""
+Similarity index at scale: query latency and recall against brute-force search.
+
+Generates --docs synthetic job descriptions (the benchmark corpus plus a Zipf-distributed tail of rarer
+terms, so the vocabulary is postings-sized rather than a few hundred words), builds the index with
+similar_index.build_index for each of --dims and queries it with --queries held-out postings:
+
+  index, 1 query         SimilarityIndex.search for one vector (blocked matrix products + argpartition, metadata)
+  index, batch           all queries in one search call (one matrix product per block for the whole batch)
+  dense brute force      every score, then a full argsort, over the same vectors
+  tf-idf brute force     exact cosine over the sparse TF-IDF vectors, which the SVD embedding approximates
+
+recall vs dense is the share of the dense brute-force top-k the index returns (1.0 = the blocked search is
+exact); recall vs tf-idf is what the embedding itself loses, in the top k and in a 10k shortlist. Then times incremental appends: batches of
+--append-batch sessions through append_sessions, embedding on the process pool.
+
+Run from the repo root:  python -m benchmarks.similar_index --docs 100000 --dims 64,128,256
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+# Fit the TF-IDF vocabulary on the benchmark corpus, never on a locally saved model
+os.environ["TFIDF_MODEL_PATH"] = os.path.join(tempfile.gettempdir(), "no-model.joblib")
+
+import numpy as np
+from backend.services.similar_index import SimilarityIndex, build_index, top_k
+from backend.services.ml_engine import embed_with_saved
+from backend.services.document_store import content_hash
+from backend.services.workers import get_cpu_pool, shutdown_pools
+from benchmarks.corpus import synthetic_jd, SKILLS, ROLES
+from benchmarks.load_test import percentile
+
+TAIL_TERMS = 20000
+
+def postings(count: int, seed: int) -> list:
+    """Corpus JDs, each with 40 tail terms (company names, products, locations, ...) drawn Zipf-style."""
+    rng = random.Random(seed)
+    tail = np.random.default_rng(seed).zipf(1.3, (count, 40)) % TAIL_TERMS
+    return [synthetic_jd(rng, sentences=10) + " " + " ".join(f"term{t}" for t in terms) for terms in tail]
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    return float(np.mean([len(set(a) & set(b)) / len(b) for a, b in zip(found, truth)]))
+
+def measure(path: str, docs: list, queries: list, k: int) -> dict:
+    index = SimilarityIndex(path)
+    vectors = embed_with_saved(index.embedder_path, queries)
+
+    # 1. One query per call, then the whole batch in one call (both include the metadata lookups)
+    single = []
+    found = []
+    for vector in vectors:
+        start = time.perf_counter()
+        hits = index.search("jobs", vector[None, :], k)[0]
+        single.append(time.perf_counter() - start)
+        found.append([hit["jd_hash"] for hit in hits])
+    start = time.perf_counter()
+    index.search("jobs", vectors, k)
+    batch = (time.perf_counter() - start) / len(vectors)
+
+    # 2. Dense brute force over the same memory-mapped vectors
+    with index._lock:
+        index._open()
+        matrix = np.asarray(index._vectors["jobs"].rows(index._count("jobs")))
+    dense, dense_rows = [], []
+    for vector in vectors:
+        start = time.perf_counter()
+        dense_rows.append(np.argsort(-(matrix @ vector), kind="stable")[:k])
+        dense.append(time.perf_counter() - start)
+    hashes = [content_hash(doc) for doc in docs]
+    dense_truth = [[hashes[row] for row in rows] for rows in dense_rows]
+    blocked_scores, blocked_rows = top_k(matrix, vectors, k)
+
+    # 3. Exact TF-IDF cosine: sparse matrix-vector product, then the top k
+    from backend.services.ml_engine import _embedders
+    vectorizer = _embedders[index.embedder_path][1]["vectorizer"]
+    tfidf = vectorizer.transform(docs).tocsr()
+    sparse, sparse_truth = [], []
+    for query in vectorizer.transform(queries):
+        start = time.perf_counter()
+        scores = (tfidf @ query.T).toarray().ravel()
+        rows = np.argpartition(-scores, k - 1)[:k]
+        sparse_truth.append([hashes[row] for row in rows[np.argsort(-scores[rows])]])
+        sparse.append(time.perf_counter() - start)
+    # How much of the exact top k a wider SVD shortlist (10k) holds, e.g. for re-ranking with full TF-IDF
+    shortlist = [[hit["jd_hash"] for hit in hits] for hits in index.search("jobs", vectors, k * 10)]
+    index.close()
+    return {
+        "single_p50": percentile(single, 0.50), "single_p95": percentile(single, 0.95), "batch": batch * 1000,
+        "dense_p50": percentile(dense, 0.50), "sparse_p50": percentile(sparse, 0.50),
+        "recall_dense": recall(found, dense_truth), "recall_blocked": recall(blocked_rows, dense_rows),
+        "recall_tfidf": recall(found, sparse_truth), "recall_tfidf_shortlist": recall(shortlist, sparse_truth),
+    }
+
+def appends(path: str, count: int, batch_size: int, seed: int) -> dict:
+    """append_sessions as the session logger calls it, with fresh postings and skill gaps."""
+    index = SimilarityIndex(path)
+    before = index.sizes()
+    # Start the process pool (and load the embedder in it) outside the measurement
+    get_cpu_pool().submit(embed_with_saved, index.embedder_path, ["warm"]).result()
+    rng = random.Random(seed)
+    texts = postings(count, seed)
+    latencies = []
+    for start in range(0, count, batch_size):
+        sessions = [{
+            "job_role": rng.choice(ROLES), "match_score": round(rng.uniform(20, 90), 2),
+            "missing_skills": rng.sample(SKILLS, 5), "jd_text": text, "resume_text": "", "candidate_name": f"candidate-{rng.randrange(1000)}",
+        } for text in texts[start:start + batch_size]]
+        began = time.perf_counter()
+        index.append_sessions(sessions, [content_hash(session["jd_text"]) for session in sessions])
+        latencies.append(time.perf_counter() - began)
+    after = index.sizes()
+    stats = index.stats()
+    index.close()
+    return {"p50": percentile(latencies, 0.50), "p95": percentile(latencies, 0.95),
+            "jobs": after["jobs"] - before["jobs"], "gaps": after["gaps"] - before["gaps"], "errors": stats["append_errors"]}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000, help="indexed job descriptions")
+    parser.add_argument("--dims", default="64,128,256", help="comma-separated SVD sizes to build and compare")
+    parser.add_argument("--queries", type=int, default=200, help="held-out postings used as queries")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--appends", type=int, default=1000, help="sessions appended after the build (0 to skip)")
+    parser.add_argument("--append-batch", type=int, default=20, help="sessions per append (the session logger's batch)")
+    args = parser.parse_args()
+
+    docs = postings(args.docs, seed=1)
+    queries = postings(args.queries, seed=2)
+    docs = list({content_hash(doc): doc for doc in docs}.values())
+    jobs = [{"jd_hash": content_hash(doc), "job_role": None, "text": doc} for doc in docs]
+    rng = random.Random(3)
+    gaps = [{"candidate_name": f"candidate-{i % 1000}", "job_role": rng.choice(ROLES), "match_score": 50.0,
+             "missing_skills": rng.sample(SKILLS, 5)} for i in range(args.docs)]
+
+    print(f"--- {args.docs} JOB DESCRIPTIONS, {args.queries} QUERIES, k={args.k}, {os.cpu_count()} CPU ---")
+    print(f"{'dims':>4} {'build':>7} {'index 1q p50':>13} {'p95':>7} {'batch/q':>8} {'dense bf':>9} {'tf-idf bf':>10} "
+          f"{'recall vs dense':>16} {'vs tf-idf':>10} {'in 10k':>7}")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for dims in (int(value) for value in args.dims.split(",")):
+                path = os.path.join(tmp, f"index_{dims}")
+                start = time.perf_counter()
+                build_index(path, jobs, gaps, dims)
+                build = time.perf_counter() - start
+                result = measure(path, docs, queries, args.k)
+                assert result["recall_blocked"] == 1.0, "blocked top-k disagrees with a full sort"
+                print(f"{dims:4d} {build:6.1f}s {result['single_p50']:11.2f}ms {result['single_p95']:5.2f}ms "
+                      f"{result['batch']:6.3f}ms {result['dense_p50']:7.2f}ms {result['sparse_p50']:8.2f}ms "
+                      f"{result['recall_dense']:16.3f} {result['recall_tfidf']:10.3f} {result['recall_tfidf_shortlist']:7.3f}")
+
+            if args.appends:
+                result = appends(path, args.appends, args.append_batch, seed=4)
+                print(f"\nappends ({dims} dims): {args.append_batch} sessions per batch, p50 {result['p50']:.1f} ms, "
+                      f"p95 {result['p95']:.1f} ms; +{result['jobs']} jobs, +{result['gaps']} gaps, {result['errors']} errors")
+                # Readers pick up the grown vector file on their next search
+                index = SimilarityIndex(path)
+                vectors = embed_with_saved(index.embedder_path, queries)
+                latencies = []
+                for vector in vectors:
+                    start = time.perf_counter()
+                    index.search("jobs", vector[None, :], args.k)
+                    latencies.append(time.perf_counter() - start)
+                print(f"after appends: {index.sizes()['jobs']} jobs, index 1q p50 {percentile(latencies, 0.50):.2f} ms")
+                index.close()
+    finally:
+        shutdown_pools()
@@ -0,0 +1,101 @@
+"""
+Skill gap accuracy checks and benchmark: legacy substring scan vs. the skill automaton.
+
+Accuracy: known substring false positives ("java" inside "javascript", "go" inside "google")
+and multi-word / punctuated skills ("machine learning", "ci/cd") that single tokens cannot express.
+Exits non-zero if any case fails.
+
+Speed: on long JDs and resumes (the JD/resume text is repeated to grow it), the substring scan vs.
+the automaton + resume index alone, and the old score+keywords pair vs. ml_engine.analyze.
+
+Run from the repo root:  python -m benchmarks.skill_matching --scale 1 10 50
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from backend.services import ml_engine
+from backend.services.skill_matcher import find_skills, top_skill_gaps, ResumeSkillIndex
+from backend.services.data_cleaner import clean_text
+from benchmarks.corpus import corpus
+
+# (resume, jd, skills that must be reported missing, skills that must NOT be reported missing)
+CASES = [
+    ("Senior JavaScript developer, React and Node.js.", "Java engineer needed: Java 17, Spring.", {"java"}, set()),
+    ("Worked at Google on ads ranking with Python.", "Backend role in Go and Python.", {"go"}, {"python"}),
+    ("Data analyst: SQL, Excel, dashboards.", "Must know machine learning and deep learning.", {"machine learning", "deep learning"}, set()),
+    ("Built Flask APIs; deployed by hand.", "Own our CI/CD pipelines and Docker images.", {"ci/cd", "docker"}, set()),
+    ("Kept CI/CD green with GitHub Actions and Docker.", "Own our CI/CD pipelines and Docker images.", set(), {"ci/cd", "docker"}),
+    ("Ran workloads on Amazon Web Services and k8s.", "Experience with AWS and Kubernetes required.", set(), {"aws", "kubernetes"}),
+]
+
+def legacy_missing(resume_text: str, job_description: str) -> list:
+    """The pre-change extract_missing_keywords, kept here only as the comparison baseline."""
+    vectorizer = TfidfVectorizer(stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform([job_description])
+    word_weights = dict(zip(vectorizer.get_feature_names_out(), tfidf_matrix.toarray()[0]))
+    missing = []
+    for word, weight in sorted(word_weights.items(), key=lambda x: x[1], reverse=True):
+        if word not in resume_text.lower() and not word.isnumeric():
+            missing.append(word)
+            if len(missing) >= 5:
+                break
+    return missing
+
+def legacy_pair(resume_text: str, job_description: str):
+    """Old per-request ML work: calculate_match_score's fit plus extract_missing_keywords."""
+    vectorizer = TfidfVectorizer(stop_words='english')
+    tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
+    cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
+    return legacy_missing(resume_text, job_description)
+
+def skill_gaps(resume_text: str, job_description: str) -> list:
+    """Just the new gap step: one automaton pass over the JD plus the resume index."""
+    jd_skills, _ = find_skills(job_description)
+    return top_skill_gaps(jd_skills, ResumeSkillIndex(resume_text))
+
+def check_accuracy() -> bool:
+    ok = True
+    print("--- ACCURACY ---")
+    for resume, jd, must, must_not in CASES:
+        resume, jd = clean_text(resume), clean_text(jd)
+        new = set(ml_engine.analyze(resume, jd)["missing_skills"])
+        old = set(legacy_missing(resume, jd))
+        passed = must <= new and not (must_not & new)
+        ok &= passed
+        print(f"[{'PASS' if passed else 'FAIL'}] jd={jd[:45]!r}\n       new={sorted(new)}\n       old={sorted(old)}")
+    return ok
+
+def median_ms(func, resume: str, jd: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(resume, jd)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ml_engine.load_model("/nonexistent") # Compare like for like: per-request fit, no saved model
+    accurate = check_accuracy()
+
+    print("\n--- SPEED ---")
+    print(f"{'scale':>6} {'jd chars':>9} {'resume chars':>13} {'substring ms':>13} {'automaton ms':>13} {'old pair ms':>12} {'analyze ms':>11}")
+    base_resume = clean_text(corpus(1, "resume", seed=5, sentences=60)[0])
+    base_jd = clean_text(corpus(1, "jd", seed=6, sentences=40)[0])
+    for scale in args.scale:
+        resume, jd = " ".join([base_resume] * scale), " ".join([base_jd] * scale)
+        timings = [median_ms(func, resume, jd, args.repeat) for func in (legacy_missing, skill_gaps, legacy_pair, ml_engine.analyze)]
+        print(f"{scale:>6} {len(jd):>9} {len(resume):>13} " + " ".join(f"{t:>{w}.1f}" for t, w in zip(timings, (13, 13, 12, 11))))
+
+    sys.exit(0 if accurate else 1)
@@ -0,0 +1,187 @@
+"""
+Cold start: import cost of backend.main and time-to-first-successful-request under uvicorn.
+
+1. `import backend.main` in a fresh interpreter, --runs times (median), plus the slowest top-level
+   imports from `python -X importtime`.
+2. For each setting, a fresh uvicorn process against local Gemini / Supabase / job board stand-ins,
+   timed from the moment the process is spawned:
+
+     listening     first HTTP answer of any kind
+     ready         /api/ready answers 200 (every subsystem prewarmed)
+     1st analyze   first successful /api/analyze (real PDF upload)
+
+   Settings: PREWARM=1 (the default) with the analyze sent as soon as the port answers, PREWARM=1
+   "gated" (sent once /api/ready says 200, like a load balancer with a readiness probe), and
+   PREWARM=0 (everything loaded by the first request that needs it). --baseline-ref also boots the tree at that git ref (e.g. HEAD~1), exported with
+   `git archive`, for a before / after comparison; trees without /api/ready report no ready time.
+
+Run from the repo root:  python -m benchmarks.startup --runs 5 --baseline-ref HEAD~1
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from benchmarks.stubs import postgrest_server, gemini_server, job_page_server
+from benchmarks.suite import make_pdf, FIXTURE_DIR
+from benchmarks.load_test import free_port, REPO_ROOT
+
+OFFLINE_ENV = {"GEMINI_API_KEY": "offline-benchmark", "SUPABASE_URL": "http://127.0.0.1:9", "SUPABASE_KEY": "offline-benchmark"}
+
+def import_seconds(tree: str, runs: int) -> float:
+    """Median wall time of `import backend.main` in a fresh interpreter."""
+    code = "import time; start = time.perf_counter(); import backend.main; print(time.perf_counter() - start)"
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], cwd=tree, env={**os.environ, **OFFLINE_ENV},
+                                capture_output=True, text=True, check=True).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+def slowest_imports(tree: str, top: int) -> list:
+    """(cumulative seconds, module) for the slowest top-level imports pulled in by backend.main."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.main"], cwd=tree,
+                            env={**os.environ, **OFFLINE_ENV}, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Direct children of the interpreter or of backend.main (two spaces of nesting at most)
+        if len(name) - len(name.lstrip()) <= 3:
+            rows.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def poll_ready(client: httpx.Client, spawned: float, deadline: float, result: dict):
+    """Polls /api/ready until it answers 200 and records when; trees without the endpoint record nothing."""
+    while time.perf_counter() < deadline:
+        response = client.get("/api/ready")
+        if response.status_code == 404:
+            return # Tree predates the readiness endpoint
+        subsystems = response.json()["subsystems"]
+        if response.status_code == 200:
+            result["ready"] = time.perf_counter() - spawned
+            result["subsystems"] = {name: status.get("seconds") for name, status in subsystems.items()}
+            return
+        failed = {name: status["error"] for name, status in subsystems.items() if status["state"] == "failed"}
+        if failed:
+            raise RuntimeError(f"Prewarm failed: {failed}")
+        time.sleep(0.02)
+
+def cold_start(tree: str, env: dict, job_url: str, pdf: bytes, gated: bool = False, timeout: float = 120) -> dict:
+    """Spawns uvicorn and returns seconds from spawn to listening, ready and the first successful analyze.
+
+    gated=False sends the analyze as soon as the port answers (while any warm-up is still running);
+    gated=True waits for /api/ready first, the way a load balancer with a readiness probe would.
+    """
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    spawned = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=tree, env={**os.environ, **env},
+    )
+    result = {"listening": None, "first_analyze": None, "ready": None}
+    deadline = spawned + timeout
+    try:
+        with httpx.Client(base_url=url, timeout=timeout) as client:
+            # 1. Port answers
+            while result["listening"] is None and time.perf_counter() < deadline:
+                if process.poll() is not None:
+                    raise RuntimeError(f"uvicorn exited with code {process.returncode} during startup.")
+                try:
+                    client.get("/api/db/pool", timeout=1)
+                    result["listening"] = time.perf_counter() - spawned
+                except httpx.TransportError:
+                    time.sleep(0.01)
+
+            # 2. The first real request, before or after every subsystem is warm
+            if gated:
+                poll_ready(client, spawned, deadline, result)
+            while result["first_analyze"] is None and time.perf_counter() < deadline:
+                response = client.post("/api/analyze", data={"job_url": job_url, "job_role": "Backend Engineer", "candidate_name": "cold-start"},
+                                       files={"resume": ("resume.pdf", pdf, "application/pdf")})
+                if response.json().get("status") == "success":
+                    result["first_analyze"] = time.perf_counter() - spawned
+                else:
+                    time.sleep(0.05)
+            if not gated:
+                poll_ready(client, spawned, deadline, result)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return result
+
+def export_tree(ref: str, target: str) -> str:
+    """Writes the files of git ref `ref` into `target` and returns it."""
+    archive = subprocess.run(["git", "archive", ref], cwd=REPO_ROOT, capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+    return target
+
+def seconds(value) -> str:
+    return f"{value:8.2f} s" if value is not None else f"{'-':>10}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="cold starts (and import timings) per setting")
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list")
+    parser.add_argument("--baseline-ref", help="also measure the tree at this git ref")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trees = {"current": REPO_ROOT}
+        if args.baseline_ref:
+            os.makedirs(os.path.join(tmp, "baseline"))
+            trees[args.baseline_ref] = export_tree(args.baseline_ref, os.path.join(tmp, "baseline"))
+
+        # 1. Import cost
+        print(f"--- IMPORT backend.main (median of {args.runs}) ---")
+        for label, tree in trees.items():
+            print(f"{label:14} {import_seconds(tree, args.runs):6.2f} s   slowest: "
+                  + ", ".join(f"{name} {elapsed:.2f}" for elapsed, name in slowest_imports(tree, args.top)))
+
+        # 2. Cold starts against local stand-ins
+        pdf_path = os.path.join(tmp, "resume.pdf")
+        make_pdf(pdf_path, 2)
+        with open(pdf_path, "rb") as f:
+            pdf = f.read()
+        page = open(os.path.join(FIXTURE_DIR, sorted(os.listdir(FIXTURE_DIR))[0]), encoding="utf-8").read()
+
+        settings = [
+            ("current", "PREWARM=1", {"PREWARM": "1"}, False),
+            ("current", "PREWARM=1, gated", {"PREWARM": "1"}, True),
+            ("current", "PREWARM=0", {"PREWARM": "0"}, False),
+        ]
+        if args.baseline_ref:
+            settings.append((args.baseline_ref, "", {}, False))
+
+        print(f"\n--- COLD START, seconds from spawn (median of {args.runs}) ---")
+        print(f"{'tree':14} {'setting':18} {'listening':>10} {'ready':>10} {'1st analyze':>12}")
+        for label, setting, extra, gated in settings:
+            runs = []
+            for i in range(args.runs):
+                with postgrest_server(unique={"documents": "hash"}, generated=("interviews",)) as db, \
+                     gemini_server(0.05) as gemini, job_page_server({f"/jobs/{i}": page}) as board:
+                    env = {
+                        "SUPABASE_URL": db.url, "SUPABASE_KEY": "offline-benchmark",
+                        "GEMINI_API_KEY": "offline-benchmark", "GEMINI_BASE_URL": gemini.url,
+                        "LLM_CACHE_PATH": "", "JD_CACHE_PATH": "", "RESUME_CACHE_PATH": "",
+                        "SESSION_LOG_SPILL_PATH": os.path.join(tmp, "spill.jsonl"), "ANALYZE_JOBS_PATH": os.path.join(tmp, "jobs.sqlite3"),
+                        "TFIDF_MODEL_PATH": os.path.join(tmp, "no-model.joblib"),
+                        **extra,
+                    }
+                    runs.append(cold_start(trees[label], env, f"{board.url}/jobs/{i}", pdf, gated))
+
+            def median(key):
+                values = [run[key] for run in runs if run[key] is not None]
+                return statistics.median(values) if values else None
+
+            print(f"{label:14} {setting:18} {seconds(median('listening'))} {seconds(median('ready'))} {seconds(median('first_analyze')):>12}")
+            if runs[-1].get("subsystems"):
+                print(f"{'':33} warm-up steps (last run): " + ", ".join(f"{name} {value:.2f}" for name, value in runs[-1]["subsystems"].items() if value is not None))
@@ -0,0 +1,448 @@
+"""
+Local stand-ins for the services the backend talks to, so benchmarks run with no network.
+"""
+import re
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class StubServer:
+    """Runs a ThreadingHTTPServer on a free localhost port in a background thread."""
+
+    def __init__(self, handler_class):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+        self.httpd.daemon_threads = True
+        self.httpd.connections_opened = 0
+        self.httpd.requests_served = 0
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections_opened(self) -> int:
+        return self.httpd.connections_opened
+
+    @property
+    def requests_served(self) -> int:
+        return self.httpd.requests_served
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class PostgrestHandler(BaseHTTPRequestHandler):
+    """Minimal in-memory PostgREST look-alike for the query shapes the backend uses.
+
+    `rows` seeds tables ({table: [row, ...]}); GET filters, orders, limits and projects them, POST
+    appends, PATCH updates matching rows. A repeated value in a `unique` column answers 409 / 23505,
+    unless the client asked for resolution=ignore-duplicates (upsert ... ignore_duplicates=True).
+    Rows inserted into a `generated` table get a serial id and a created_at timestamp, like the
+    real interviews table. With probability `error_rate` a request fails with 503.
+    """
+
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real Supabase edge
+    latency = 0.0
+    rows = {}   # table -> list of row dicts
+    unique = {} # table -> column with a UNIQUE constraint
+    generated = ()
+    error_rate = 0.0
+    rng = None
+
+    def setup(self):
+        super().setup()
+        self.server.connections_opened += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload):
+        time.sleep(self.latency)
+        body = json.dumps(payload).encode()
+        self.server.requests_served += 1
+        self.server.bytes_received += int(self.headers.get("Content-Length") or 0)
+        self.server.bytes_sent += len(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    @property
+    def table(self) -> str:
+        return self.path.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+
+    @property
+    def params(self) -> list:
+        from urllib.parse import urlsplit, parse_qsl
+        return parse_qsl(urlsplit(self.path).query)
+
+    @staticmethod
+    def _sort_key(value):
+        try:
+            return (0, float(value), "")
+        except (TypeError, ValueError):
+            return (1, 0.0, str(value))
+
+    def _matches(self, row: dict, column: str, condition: str) -> bool:
+        key = self._sort_key
+        negate = condition.startswith("not.")
+        if negate:
+            condition = condition[4:]
+        op, _, value = condition.partition(".")
+        if op == "eq":
+            result = str(row.get(column)) == value
+        elif op in ("gt", "lt"):
+            result = row.get(column) is not None and (key(row[column]) > key(value) if op == "gt" else key(row[column]) < key(value))
+        elif op == "is":
+            result = row.get(column) is None if value == "null" else str(row.get(column)).lower() == value
+        elif op == "in":
+            result = str(row.get(column)) in {item.strip('"') for item in value.strip("()").split(",")}
+        else:
+            raise ValueError(f"stub PostgREST does not support {op!r}")
+        return result != negate
+
+    def _filter(self, rows: list) -> list:
+        """eq / gt / lt / is / in (optionally not.) filters plus the two-column keyset `or` used for pagination."""
+        key = self._sort_key
+        for name, value in self.params:
+            if name in ("select", "order", "limit", "on_conflict", "columns"):
+                continue
+            if name == "or":
+                # (a.lt.X,and(a.eq.X,b.lt.Y)): rows after the cursor (a, b) in descending order
+                keyset = re.fullmatch(r'\((\w+)\.lt\."?([^",]+)"?,and\(\w+\.eq\."?[^",]+"?,(\w+)\.lt\.([^)]+)\)\)', value)
+                a, x, b, y = keyset.groups()
+                rows = [row for row in rows if key(row[a]) < key(x) or (key(row[a]) == key(x) and key(row[b]) < key(y))]
+            else:
+                rows = [row for row in rows if self._matches(row, name, value)]
+        return rows
+
+    def _select(self, rows: list) -> list:
+        key = self._sort_key
+        rows = self._filter(rows)
+        params = dict(self.params)
+        for term in reversed(params.get("order", "").split(",") if params.get("order") else []):
+            column, _, direction = term.partition(".")
+            rows = sorted(rows, key=lambda row: key(row.get(column)), reverse=direction.startswith("desc"))
+        if "limit" in params:
+            rows = rows[:int(params["limit"])]
+        columns = params.get("select", "*")
+        if columns != "*":
+            rows = [{c: row.get(c) for c in columns.split(",")} for row in rows]
+        return rows
+
+    def _injected_fault(self) -> bool:
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self._read_json()
+            self._reply(503, {"code": "PGRST000", "details": None, "hint": None, "message": "injected fault"})
+            return True
+        return False
+
+    def do_GET(self):
+        if self._injected_fault():
+            return
+        with self.server.lock:
+            result = self._select(self.rows.get(self.table, []))
+        self._reply(200, result)
+
+    def do_HEAD(self):
+        self._reply(200, [])
+
+    def do_POST(self):
+        if self._injected_fault():
+            return
+        body = self._read_json()
+        body = body if isinstance(body, list) else [body]
+        ignore_duplicates = "ignore-duplicates" in self.headers.get("Prefer", "")
+        column = self.unique.get(self.table)
+        with self.server.lock:
+            if column:
+                seen = self.server.unique_values.setdefault(self.table, set())
+                if not ignore_duplicates and any(row.get(column) in seen for row in body):
+                    conflict = {"code": "23505", "details": None, "hint": None,
+                                "message": f"duplicate key value violates unique constraint on {column}"}
+                    self._reply(409, conflict)
+                    return
+                fresh = []
+                for row in body:
+                    if row.get(column) not in seen:
+                        seen.add(row.get(column))
+                        fresh.append(row)
+                body = fresh
+            if self.table in self.generated:
+                for row in body:
+                    self.server.serial += 1
+                    row.setdefault("id", self.server.serial)
+                    row.setdefault("created_at", time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()) + f".{self.server.serial % 1000000:06d}+00:00")
+            self.rows.setdefault(self.table, []).extend(dict(row) for row in body)
+        self._reply(201, [] if "return=minimal" in self.headers.get("Prefer", "") else body)
+
+    def do_PATCH(self):
+        if self._injected_fault():
+            return
+        changes = self._read_json()
+        with self.server.lock:
+            updated = self._filter(self.rows.get(self.table, []))
+            for row in updated:
+                row.update(changes)
+        self._reply(200, updated)
+
+    def do_DELETE(self):
+        self._reply(200, [])
+
+def postgrest_server(latency: float = 0.0, rows: dict = None, unique: dict = None, generated: tuple = (),
+                     error_rate: float = 0.0, seed: int = 0) -> StubServer:
+    """Returns a stub PostgREST server answering under /rest/v1 with the given per-request latency."""
+    import random
+    handler = type("LatencyPostgrestHandler", (PostgrestHandler,), {"latency": latency, "rows": rows if rows is not None else {},
+                                                                    "unique": unique or {}, "generated": tuple(generated),
+                                                                    "error_rate": error_rate, "rng": random.Random(seed)})
+    server = StubServer(handler)
+    server.httpd.serial = 0
+    server.httpd.lock = threading.Lock()
+    server.httpd.unique_values = {}
+    server.httpd.bytes_received = 0
+    server.httpd.bytes_sent = 0
+    return server
+
+class JobPageHandler(BaseHTTPRequestHandler):
+    """Serves job pages from a {path: html} dict with ETag / Last-Modified validators and 304 support."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without TCP_NODELAY the body can wait on a delayed ACK
+    disable_nagle_algorithm = True
+    latency = 0.0
+    pages = {}
+    last_modified = "Mon, 05 Oct 2026 09:00:00 GMT"
+
+    def setup(self):
+        super().setup()
+        self.server.connections_opened += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self.server.requests_served += 1
+        html = self.pages.get(self.path)
+        if html is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = f'"{hash(html) & 0xffffffff:08x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = html.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+def job_page_server(pages: dict, latency: float = 0.0) -> StubServer:
+    """Returns a stub job board serving the given {path: html} pages."""
+    handler = type("FixtureJobPageHandler", (JobPageHandler,), {"pages": pages, "latency": latency})
+    return StubServer(handler)
+
+class FakeGeminiResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGeminiModels:
+    """Async stand-in for genai.Client().aio.models.
+
+    `latency` is the time to the first token; each further chunk takes `chunk_delay`. The blocking
+    call pays for the whole generation, the streaming call hands chunks over as they are "produced".
+    """
+
+    def __init__(self, latency: float = 0.5, chunks: int = 1, chunk_delay: float = 0.0):
+        self.latency = latency
+        self.chunks = chunks
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+
+    def _text(self, contents: str) -> str:
+        # Batch prompts ("... JSON array of N strings") get N distinct questions back
+        batch = re.search(r"JSON array of (\d+) strings", contents)
+        if batch:
+            return json.dumps([f"Question #{self.calls}.{i} for prompt hash {hash(contents) & 0xffff:04x}?"
+                               for i in range(int(batch.group(1)))])
+        return f"Question #{self.calls} for prompt hash {hash(contents) & 0xffff:04x}?"
+
+    async def generate_content(self, model: str, contents: str, **kwargs):
+        import asyncio
+        self.calls += 1
+        await asyncio.sleep(self.latency + self.chunk_delay * (self.chunks - 1))
+        return FakeGeminiResponse(self._text(contents) + " token" * (self.chunks - 1))
+
+    async def generate_content_stream(self, model: str, contents: str, **kwargs):
+        import asyncio
+        self.calls += 1
+        text = self._text(contents)
+
+        async def chunks():
+            await asyncio.sleep(self.latency)
+            yield FakeGeminiResponse(text)
+            for _ in range(self.chunks - 1):
+                await asyncio.sleep(self.chunk_delay)
+                yield FakeGeminiResponse(" token")
+        return chunks()
+
+class FakeGeminiClient:
+    """Drop-in for ai_service.client: only the async models surface the service uses."""
+
+    def __init__(self, latency: float = 0.5, chunks: int = 1, chunk_delay: float = 0.0):
+        self.aio = type("FakeAio", (), {})()
+        self.aio.models = FakeGeminiModels(latency, chunks, chunk_delay)
+
+class LocalAppServer:
+    """Serves a FastAPI app with uvicorn on a free localhost port from a background thread.
+
+    Unlike httpx's in-memory ASGI transport this really streams, so time-to-first-byte is honest.
+    """
+
+    def __init__(self, app, port: int = 0, ready_path: str = "/api/ready"):
+        import socket
+        import uvicorn
+        if not port:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+        self.port = port
+        self.ready_path = ready_path
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("The app failed to start (see the lifespan error above).")
+            time.sleep(0.01)
+        # Measure the warm app: wait for its background warm-up (a 404 means it has no readiness endpoint)
+        if self.ready_path:
+            import urllib.error
+            import urllib.request
+            deadline = time.monotonic() + 120
+            while time.monotonic() < deadline:
+                try:
+                    urllib.request.urlopen(f"{self.url}{self.ready_path}", timeout=5).close()
+                    break
+                except urllib.error.HTTPError as e:
+                    if e.code == 404:
+                        break
+                    time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+class GeminiHandler(BaseHTTPRequestHandler):
+    """Fake Gemini REST API (generateContent and streamGenerateContent?alt=sse) with injectable faults.
+
+    Latency per request is `latency` plus, with probability `tail_rate`, an extra `tail_latency`.
+    With probability `fault_rate` the request fails with a random status from `fault_statuses`.
+    """
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.2
+    tail_rate = 0.0
+    tail_latency = 2.0
+    fault_rate = 0.0
+    fault_statuses = (429, 503)
+    chunks = 8
+    chunk_delay = 0.02
+    rng = None
+
+    def setup(self):
+        super().setup()
+        self.server.connections_opened += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The gateway cancelled this request (hedge loser or deadline)
+            self.close_connection = True
+
+    @staticmethod
+    def _candidate(text: str) -> dict:
+        return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}]}
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        prompt = self.rfile.read(length).decode("utf-8", errors="ignore")
+        self.server.requests_served += 1
+
+        delay = self.latency + (self.tail_latency if self.rng.random() < self.tail_rate else 0.0)
+        time.sleep(delay)
+        if self.rng.random() < self.fault_rate:
+            status = self.rng.choice(self.fault_statuses)
+            self._send_json(status, {"error": {"code": status, "message": "injected fault", "status": "UNAVAILABLE"}})
+            return
+
+        text = f"Explain how you would design this system (request {self.server.requests_served})."
+        batch = re.search(r"JSON array of (\d+) strings", prompt)
+        if batch:
+            # Question bank prompts get the JSON array they ask for
+            questions = [f"{text[:-1]}, part {i + 1}?" for i in range(int(batch.group(1)))]
+            self._send_json(200, self._candidate(json.dumps(questions)))
+            return
+        if ":streamGenerateContent" not in self.path:
+            self._send_json(200, self._candidate(text + " It should be scalable." * (self.chunks - 1)))
+            return
+
+        # Server-Sent Events, one candidate chunk per frame
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for i in range(self.chunks):
+            if i:
+                time.sleep(self.chunk_delay)
+            piece = text if i == 0 else " It should be scalable."
+            self.wfile.write(f"data: {json.dumps(self._candidate(piece))}\r\n\r\n".encode())
+            self.wfile.flush()
+        self.close_connection = True
+
+def gemini_server(latency: float = 0.2, tail_rate: float = 0.0, tail_latency: float = 2.0,
+                  fault_rate: float = 0.0, chunks: int = 8, chunk_delay: float = 0.02, seed: int = 0) -> StubServer:
+    """Returns a fake Gemini API server; point genai at it with http_options base_url (GEMINI_BASE_URL)."""
+    import random
+    handler = type("ConfiguredGeminiHandler", (GeminiHandler,), {
+        "latency": latency, "tail_rate": tail_rate, "tail_latency": tail_latency, "fault_rate": fault_rate,
+        "chunks": chunks, "chunk_delay": chunk_delay, "rng": random.Random(seed),
+    })
+    return StubServer(handler)
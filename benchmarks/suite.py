@@ -0,0 +1,259 @@
+"""
+Offline micro-benchmark suite for the backend services, with JSON baselines.
+
+Cases (all local, no network):
+  pdf.extract_text[pages=N]       pdf_parser.extract_text_from_pdf on generated PDFs
+  clean_text[size]                data_cleaner.clean_text on 1 KB .. 1 MB of resume-like text
+  ml.analyze[vocab=N]             ml_engine.analyze (score + missing skills) with a corpus model of N terms
+  ml.score_resumes[vocab=N]       ml_engine.score_resumes for 200 resumes against one JD
+  ml.missing_skills[vocab=N]      ml_engine.missing_skills_batch for 20 resumes
+  scraper.fetch_parse[page]       fetch from a local job board + extract_job_text, per fixture page
+
+Every case is timed `--repeat` times after one warm-up call; results store the median, min and max.
+Shared and throttled machines drift by tens of percent within seconds, so each case is also paired
+with a fixed pure-Python calibration loop timed right before it, and compare judges the case's
+median relative to that calibration (pass --absolute to compare raw medians).
+
+  python -m benchmarks.suite run                     # writes benchmarks/results/latest.json
+  python -m benchmarks.suite run --save-baseline     # ...and copies it to benchmarks/baselines/baseline.json
+  python -m benchmarks.suite compare --threshold 0.25
+
+compare exits 1 when any case's median is more than --threshold slower than the baseline (and by
+more than --min-delta-ms, so sub-millisecond jitter does not fail a build). Baselines are only
+comparable on the same machine; the environment they were recorded on is stored with them.
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import statistics
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from backend.services import ml_engine
+from backend.services.pdf_parser import extract_text_from_pdf
+from backend.services.data_cleaner import clean_text
+from backend.services.scraper import fetch_capped, extract_job_text, close_http_session
+from benchmarks.corpus import SKILLS, FILLER, corpus, synthetic_jd, synthetic_resume
+from benchmarks.stubs import job_page_server
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(BENCH_DIR, "results", "latest.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baselines", "baseline.json")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures", "job_pages")
+
+PDF_PAGES = (1, 10, 50)
+TEXT_SIZES = {"1KB": 1024, "64KB": 64 * 1024, "1MB": 1024 * 1024}
+VOCAB_SIZES = (1000, 10000, 50000)
+
+def make_pdf(path: str, pages: int):
+    """A text PDF of `pages` resume-like pages (about 40 lines each)."""
+    rng = random.Random(pages)
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        for line in range(40):
+            words = rng.sample(FILLER, 6) + rng.sample(SKILLS, 2)
+            page.insert_text((50, 40 + line * 18), " ".join(words), fontsize=10)
+    doc.save(path)
+    doc.close()
+
+def resume_like_text(size: int) -> str:
+    """Raw PDF-ish text with bullets, symbols and odd whitespace, `size` characters long."""
+    rng = random.Random(size)
+    parts = []
+    total = 0
+    while total < size:
+        chunk = f"•  {' '.join(rng.sample(FILLER, 5))} {rng.choice(SKILLS).upper()} (C++/C#) – {rng.randint(1, 99)}%\n\t"
+        parts.append(chunk)
+        total += len(chunk)
+    return "".join(parts)[:size]
+
+def vocabulary_corpus(vocab: int, documents: int = 400) -> list:
+    """Synthetic JDs padded with words from a `vocab`-word dictionary, so the fitted model has ~vocab terms."""
+    rng = random.Random(vocab)
+    words = [f"term{i:05d}" for i in range(vocab)]
+    docs = corpus(documents, "jd", seed=vocab)
+    per_doc = max(50, 2 * vocab // documents)
+    return [doc + " " + " ".join(rng.choices(words, k=per_doc)) for doc in docs]
+
+def with_setup(func, setup):
+    """Attaches an untimed setup step that measure() runs before the warm-up call."""
+    func.setup = setup
+    return func
+
+def pdf_cases(tmp: str) -> dict:
+    cases = {}
+    for pages in PDF_PAGES:
+        path = os.path.join(tmp, f"resume_{pages}.pdf")
+        make_pdf(path, pages)
+        cases[f"pdf.extract_text[pages={pages}]"] = lambda path=path: extract_text_from_pdf(path)
+    return cases
+
+def clean_text_cases() -> dict:
+    return {f"clean_text[{label}]": (lambda text=resume_like_text(size): clean_text(text)) for label, size in TEXT_SIZES.items()}
+
+def ml_cases(tmp: str) -> dict:
+    cases = {}
+    rng = random.Random(7)
+    jd = synthetic_jd(rng)
+    resumes = [synthetic_resume(rng) for _ in range(200)]
+    for vocab in VOCAB_SIZES:
+        path = os.path.join(tmp, f"tfidf_{vocab}.joblib")
+        ml_engine.fit_corpus_model(vocabulary_corpus(vocab), path=path)
+        # Each case runs against its own model; loading it is setup, outside the timed calls
+        setup = lambda path=path: ml_engine.load_model(path)
+        cases[f"ml.analyze[vocab={vocab}]"] = with_setup(lambda: ml_engine.analyze(resumes[0], jd), setup)
+        cases[f"ml.score_resumes[vocab={vocab}]"] = with_setup(lambda: ml_engine.score_resumes(resumes, jd), setup)
+        cases[f"ml.missing_skills[vocab={vocab}]"] = with_setup(lambda: ml_engine.missing_skills_batch(resumes[:20], jd), setup)
+    return cases
+
+def scraper_cases(server_url: str, loop: asyncio.AbstractEventLoop) -> dict:
+    async def fetch_and_parse(url: str) -> str:
+        _, body = await fetch_capped(url, {})
+        return extract_job_text(body)
+
+    return {
+        f"scraper.fetch_parse[{name.rsplit('.', 1)[0]}]": (lambda url=f"{server_url}/{name}": loop.run_until_complete(fetch_and_parse(url)))
+        for name in sorted(os.listdir(FIXTURE_DIR))
+    }
+
+def calibration_loop(n: int = 100000) -> int:
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+def time_calls(func, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def measure(func, repeat: int) -> dict:
+    setup = getattr(func, "setup", None)
+    if setup is not None:
+        setup()
+    func() # Warm-up: imports, caches, keep-alive connection
+    # How fast this machine is right now, measured next to the case
+    calibration = statistics.median(time_calls(calibration_loop, 7))
+    timings = time_calls(func, repeat)
+    median = statistics.median(timings)
+    return {
+        "median_ms": round(median, 4),
+        "min_ms": round(min(timings), 4),
+        "max_ms": round(max(timings), 4),
+        "calibration_ms": round(calibration, 4),
+        "relative": round(median / calibration, 4),
+        "runs": repeat,
+    }
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+def run(repeat: int, only: str = None) -> dict:
+    results = {}
+    pages = {f"/{name}": open(os.path.join(FIXTURE_DIR, name), encoding="utf-8").read() for name in os.listdir(FIXTURE_DIR)}
+    loop = asyncio.new_event_loop()
+    with tempfile.TemporaryDirectory() as tmp, job_page_server(pages) as server:
+        # Built lazily per group, so --only skips the setup of everything else (e.g. the model fits)
+        groups = [
+            ("pdf", lambda: pdf_cases(tmp)),
+            ("clean_text", clean_text_cases),
+            ("ml", lambda: ml_cases(tmp)),
+            ("scraper", lambda: scraper_cases(server.url, loop)),
+        ]
+        try:
+            for prefix, build in groups:
+                if only and not (only.startswith(prefix) or prefix.startswith(only)):
+                    continue
+                for name, func in build().items():
+                    if only and only not in name:
+                        continue
+                    results[name] = measure(func, repeat)
+                    print(f"{name:40} median {results[name]['median_ms']:10.3f} ms   min {results[name]['min_ms']:10.3f} ms")
+        finally:
+            loop.run_until_complete(close_http_session())
+            loop.close()
+            ml_engine.load_model() # Back to the deployment's model (or none)
+    return {"environment": environment(), "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeat": repeat, "cases": results}
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_ms: float, absolute: bool = False) -> list:
+    """Prints a comparison table and returns the names of regressed cases."""
+    if baseline["environment"] != current["environment"]:
+        print(f"warning: baseline was recorded on {baseline['environment']}, this run on {current['environment']}")
+    regressions = []
+    print(f"{'case':40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            print(f"{name:40} {'-':>12} {result['median_ms']:12.3f} {'new':>8}")
+            continue
+        if absolute or "relative" not in base:
+            change = result["median_ms"] / base["median_ms"] - 1 if base["median_ms"] else 0.0
+        else:
+            change = result["relative"] / base["relative"] - 1
+        regressed = change > threshold and result["median_ms"] - base["median_ms"] > min_delta_ms
+        if regressed:
+            regressions.append(name)
+        print(f"{name:40} {base['median_ms']:12.3f} {result['median_ms']:12.3f} {change:+8.1%}{'  REGRESSED' if regressed else ''}")
+    for name in baseline["cases"]:
+        if name not in current["cases"]:
+            print(f"{name:40} {baseline['cases'][name]['median_ms']:12.3f} {'-':>12} {'missing':>8}")
+    return regressions
+
+def write_json(path: str, data: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def read_json(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the suite and write a results file")
+    run_parser.add_argument("--repeat", type=int, default=15)
+    run_parser.add_argument("--only", help="run only cases whose name contains this (e.g. ml.analyze)")
+    run_parser.add_argument("--output", default=RESULTS_PATH)
+    run_parser.add_argument("--save-baseline", action="store_true", help="also write the results as the baseline")
+    run_parser.add_argument("--baseline", default=BASELINE_PATH)
+
+    compare_parser = commands.add_parser("compare", help="compare a results file against the baseline")
+    compare_parser.add_argument("--results", default=RESULTS_PATH)
+    compare_parser.add_argument("--baseline", default=BASELINE_PATH)
+    compare_parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown of the median (0.25 = 25%%)")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.05)
+    compare_parser.add_argument("--absolute", action="store_true", help="compare raw medians, not calibration-relative ones")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(args.repeat, args.only)
+        write_json(args.output, results)
+        print(f"Results written to {args.output}")
+        if args.save_baseline:
+            write_json(args.baseline, results)
+            print(f"Baseline written to {args.baseline}")
+    else:
+        regressions = compare(read_json(args.baseline), read_json(args.results), args.threshold, args.min_delta_ms, args.absolute)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions.")
@@ -0,0 +1,141 @@
+"""
+Overhead and output of the telemetry layer (backend/services/telemetry.py).
+
+1. Per-request cost of TelemetryMiddleware and of one stage(), measured against a bare ASGI app.
+2. A few /api/analyze calls against a stub job board, a stub PostgREST server and the fake
+   Gemini model: the Server-Timing header of one call, then the stage and external-call series
+   scraped from /metrics.
+3. The opt-in sampling profiler on a deliberately slow request: the hottest collapsed stacks.
+
+Run from the repo root:  python -m benchmarks.telemetry --requests 20000
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:9")
+os.environ.setdefault("SUPABASE_KEY", "offline-benchmark")
+
+import httpx
+import backend.main as main
+from backend.services import ai_service, telemetry
+from backend.services.llm_cache import ResponseCache
+from backend.services.workers import shutdown_pools
+from benchmarks.analyze_concurrency import make_pdf
+from benchmarks.document_storage import use_server
+from benchmarks.stubs import FakeGeminiClient, postgrest_server, job_page_server
+
+JOB_HTML = "<html><body><h1>Backend Engineer</h1><p>python fastapi docker aws kubernetes terraform</p></body></html>"
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def staged_app(scope, receive, send):
+    with telemetry.stage("bench_stage"):
+        pass
+    await bare_app(scope, receive, send)
+
+async def drive_asgi(app, requests: int) -> float:
+    """Mean microseconds per request, calling the ASGI app directly (no sockets, no HTTP parsing)."""
+    scope = {"type": "http", "method": "GET", "path": "/bench", "headers": []}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) * 1e6 / requests
+
+async def overhead(requests: int):
+    print(f"--- MIDDLEWARE OVERHEAD, {requests} REQUESTS ---")
+    bare = await drive_asgi(bare_app, requests)
+    wrapped = await drive_asgi(telemetry.TelemetryMiddleware(bare_app, profile_slow_ms=0), requests)
+    staged = await drive_asgi(telemetry.TelemetryMiddleware(staged_app, profile_slow_ms=0), requests)
+    print(f"bare ASGI app:          {bare:6.1f} us/request")
+    print(f"+ TelemetryMiddleware:  {wrapped:6.1f} us/request (+{wrapped - bare:.1f} us)")
+    print(f"+ one stage():          {staged:6.1f} us/request (+{staged - wrapped:.1f} us)")
+
+def print_series(metrics: str, prefixes: tuple):
+    for line in metrics.splitlines():
+        if line.startswith(prefixes):
+            print(f"   {line}")
+
+async def analyze_calls(calls: int, db_latency: float, job_latency: float):
+    ai_service.question_cache = ResponseCache(path="", memory_size=512)
+    ai_service.client = FakeGeminiClient(0.3)
+    pdf = make_pdf()
+    nonce = int(time.time())
+    pages = {f"/jobs/{nonce}-{i}": JOB_HTML for i in range(calls)}
+
+    print(f"\n--- {calls} /api/analyze CALLS (job page {job_latency * 1000:.0f} ms, DB {db_latency * 1000:.0f} ms, Gemini 300 ms) ---")
+    with postgrest_server(latency=db_latency, unique={"documents": "hash"}) as db, job_page_server(pages, job_latency) as jobs:
+        use_server(db)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for i, path in enumerate(pages):
+                response = await client.post(
+                    "/api/analyze",
+                    data={"job_url": f"{jobs.url}{path}", "job_role": "Backend Engineer", "candidate_name": f"bench-{i}"},
+                    files={"resume": ("resume.pdf", pdf, "application/pdf")},
+                )
+                assert response.json()["status"] == "success", response.text
+                if i == 0:
+                    print(f"Server-Timing (first call): {response.headers['server-timing']}")
+            await main.session_logger.close()
+            missing = await client.get("/api/session/no-such-session/next-question")
+            print(f"Unknown session answers HTTP {missing.status_code}")
+            metrics = (await client.get("/metrics")).text
+
+    print("/metrics excerpt:")
+    print_series(metrics, ("pipeline_stage_duration_seconds_count", "external_calls_total", "http_request_errors_total"))
+
+async def profile_slow_request(threshold_ms: float):
+    def burn_cpu(seconds: float):
+        deadline = time.perf_counter() + seconds
+        total = 0
+        while time.perf_counter() < deadline:
+            total += sum(i * i for i in range(500))
+        return total
+
+    async def slow_app(scope, receive, send):
+        burn_cpu(0.3)
+        await bare_app(scope, receive, send)
+
+    print(f"\n--- SAMPLING PROFILER (threshold {threshold_ms:.0f} ms) ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        middleware = telemetry.TelemetryMiddleware(slow_app, profile_slow_ms=threshold_ms)
+        middleware.profiler.out_dir = tmp
+        await drive_asgi(middleware, 1)
+        middleware.profiler.stop()
+        for name in os.listdir(tmp):
+            with open(os.path.join(tmp, name), encoding="utf-8") as f:
+                lines = f.read().splitlines()
+            samples = sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+            print(f"{name}: {samples} samples, {len(lines)} distinct stacks; hottest:")
+            for line in lines[:3]:
+                stack, count = line.rsplit(" ", 1)
+                print(f"   {count:>4}  ...;{';'.join(stack.split(';')[-2:])}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--db-latency", type=float, default=0.05)
+    parser.add_argument("--job-latency", type=float, default=0.2)
+    args = parser.parse_args()
+    try:
+        asyncio.run(overhead(args.requests))
+        asyncio.run(analyze_calls(args.calls, args.db_latency, args.job_latency))
+        asyncio.run(profile_slow_request(100))
+    finally:
+        shutdown_pools()
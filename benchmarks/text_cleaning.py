@@ -0,0 +1,90 @@
+"""
+Bulk text cleaning throughput: legacy per-document regex + DataFrame vs. data_cleaner.clean_texts.
+
+Builds a corpus of resume / JD texts with the bullets, symbols and odd whitespace PDF extraction
+produces (about a third of them with non-ASCII characters), checks that the new cleaner returns
+exactly what the legacy one did, then reports documents/s and MB/s for:
+
+  legacy structure_resume_data   two uncompiled re.sub passes + a one-row DataFrame per document
+  legacy clean_text loop         the same regex passes, no DataFrame
+  clean_text loop                the translate fast path, one call per document
+  clean_texts                    bulk, one columnar frame with word counts
+  clean_texts(parallel=True)     bulk, chunks spread over the CPU process pool
+
+Run from the repo root:  python -m benchmarks.text_cleaning --documents 10000
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from backend.services.data_cleaner import clean_text, clean_texts
+from backend.services.workers import shutdown_pools, CPU_WORKERS
+from benchmarks.corpus import corpus
+
+def legacy_clean_text(raw_text: str) -> str:
+    """The pre-change cleaner, kept here only as the comparison baseline."""
+    if not raw_text:
+        return ""
+    text = raw_text.lower()
+    text = re.sub(r'[^a-z0-9\s\.\,\+]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+def legacy_structure(raw_text: str) -> pd.DataFrame:
+    cleaned_text = legacy_clean_text(raw_text)
+    return pd.DataFrame({"document_type": ["resume"], "cleaned_content": [cleaned_text], "word_count": [len(cleaned_text.split())]})
+
+def noisy_corpus(documents: int, seed: int = 3) -> list:
+    rng = random.Random(seed)
+    texts = corpus(documents // 2, "resume", seed=seed) + corpus(documents - documents // 2, "jd", seed=seed + 1)
+    noisy = []
+    for text in texts:
+        words = text.split()
+        for _ in range(len(words) // 8):
+            i = rng.randrange(len(words))
+            words[i] = rng.choice(["\n\t" + words[i].upper(), f"({words[i]})", words[i] + ";", "-", "|", "C#/C++"])
+        if rng.random() < 0.33:
+            words.insert(rng.randrange(len(words)), rng.choice(["•", "–", "★", "é", " ", "✓"]))
+        noisy.append("  ".join(words))
+    return noisy
+
+def throughput(name: str, func, documents: list, megabytes: float) -> float:
+    start = time.perf_counter()
+    func(documents)
+    elapsed = time.perf_counter() - start
+    print(f"{name:32} {elapsed:7.2f} s  {len(documents) / elapsed:9.0f} docs/s  {megabytes / elapsed:6.1f} MB/s")
+    return elapsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=10000)
+    args = parser.parse_args()
+
+    documents = noisy_corpus(args.documents)
+    megabytes = sum(len(text.encode("utf-8")) for text in documents) / 1e6
+
+    # 1. Same output as before, document for document
+    frame = clean_texts(documents)
+    expected = [legacy_clean_text(text) for text in documents]
+    mismatches = sum(a != b for a, b in zip(frame["cleaned_content"], expected))
+    bad_counts = sum(int(n) != len(text.split()) for n, text in zip(frame["word_count"], expected))
+    print(f"--- {len(documents)} DOCUMENTS, {megabytes:.1f} MB, CPU_WORKERS={CPU_WORKERS} ---")
+    print(f"mismatches vs legacy: {mismatches} texts, {bad_counts} word counts")
+
+    # 2. Throughput
+    legacy = throughput("legacy structure_resume_data", lambda docs: pd.concat([legacy_structure(t) for t in docs], ignore_index=True), documents, megabytes)
+    throughput("legacy clean_text loop", lambda docs: [legacy_clean_text(t) for t in docs], documents, megabytes)
+    throughput("clean_text loop", lambda docs: [clean_text(t) for t in docs], documents, megabytes)
+    bulk = throughput("clean_texts", clean_texts, documents, megabytes)
+    try:
+        clean_texts(documents[:4], parallel=True, chunk_size=1) # Start the pool outside the timing
+        throughput("clean_texts(parallel=True)", lambda docs: clean_texts(docs, parallel=True), documents, megabytes)
+    finally:
+        shutdown_pools()
+    print(f"clean_texts vs legacy structure_resume_data: {legacy / bulk:.1f}x")
+    sys.exit(1 if mismatches or bad_counts else 0)
@@ -1,4 +1,6 @@
 import os
+import json
+import time
 import streamlit as st
 import requests
 import pandas as pd
@@ -13,6 +15,43 @@ else:
 # Set this only ONCE at the very top
 st.set_page_config(page_title="Shadow Recruiter", page_icon="🤖", layout="wide")
 
+def read_sse(response):
+    """Yields (event, data) pairs from a Server-Sent Events response as frames arrive."""
+    event = None
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            event = None # A blank line ends the frame
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            yield event, json.loads(line[len("data:"):])
+
+# Progress labels for the analyze job's stages
+STAGE_LABELS = {
+    "pdf_extract": "Reading your resume",
+    "scrape": "Fetching the job description",
+    "clean_text": "Cleaning the text",
+    "ml_analyze": "Scoring the match",
+    "session_log_enqueue": "Saving the session",
+    "question": "Preparing your first question",
+}
+
+def wait_for_analysis(job_id, progress_bar, timeout=180, interval=0.5):
+    """Polls an analyze job, updating the progress bar with the running stage, until it finishes or times out."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = requests.get(f"{API_URL}/api/analyze/jobs/{job_id}", timeout=(10, 30)).json()["job"]
+        if job["state"] in ("succeeded", "failed") or time.monotonic() > deadline:
+            progress_bar.empty()
+            return job
+        if job["state"] == "queued":
+            text = f"Queued ({job['queue_position']} ahead of you)..."
+        else:
+            running = [STAGE_LABELS.get(s["name"], s["name"]) for s in job["stages"] if s["state"] == "running"]
+            text = " and ".join(running) + "..." if running else "Analyzing..."
+        progress_bar.progress(job["progress"], text=text)
+        time.sleep(interval)
+
 # --- STATE MACHINE ---
 if "analysis_complete" not in st.session_state:
     st.session_state.analysis_complete = False
@@ -26,6 +65,8 @@ if "current_question" not in st.session_state:
     st.session_state.current_question = ""
 if "candidate_name" not in st.session_state:
     st.session_state.candidate_name = None
+if "interview_session" not in st.session_state:
+    st.session_state.interview_session = None
 
 # --- LOGIN GATE ---
 if not st.session_state.candidate_name:
@@ -95,25 +136,32 @@ if page == "Mock Interview":
 
         if st.button("Initialize Shadow Recruiter"):
             if job_url and job_role and resume_pdf:
-                with st.spinner("Analyzing application... This takes about 10 seconds."):
-                    try:
-                        files = {"resume": (resume_pdf.name, resume_pdf.getvalue(), "application/pdf")}
-                        data = {"job_url": job_url, "job_role": job_role, "candidate_name": st.session_state.candidate_name}
-                        
-                        response = requests.post(f"{API_URL}/api/analyze", data=data, files=files)
-                        
-                        if response.status_code == 200 and response.json().get("status") == "success":
-                            result = response.json()
+                try:
+                    files = {"resume": (resume_pdf.name, resume_pdf.getvalue(), "application/pdf")}
+                    data = {"job_url": job_url, "job_role": job_role, "candidate_name": st.session_state.candidate_name}
+
+                    # Queue the analysis, then follow its stages instead of holding one request open
+                    response = requests.post(f"{API_URL}/api/analyze/jobs", data=data, files=files, timeout=(10, 60))
+                    submitted = response.json()
+                    if submitted.get("status") != "success":
+                        st.error(f"Backend Error: {submitted.get('message')}")
+                    else:
+                        job = wait_for_analysis(submitted["job_id"], st.progress(0.0, text="Queued..."))
+                        if job["state"] == "succeeded":
+                            result = job["result"]
                             st.session_state.match_score = result['match_score']
                             st.session_state.missing_skills = result['missing_skills']
                             st.session_state.current_question = result['interview_question']
+                            st.session_state.interview_session = result.get('session_id')
                             st.session_state.chat_history.append({"role": "ai", "content": result['interview_question']})
                             st.session_state.analysis_complete = True
                             st.rerun()
+                        elif job["state"] == "failed":
+                            st.error(f"Backend Error: {job['error'].get('message')}")
                         else:
-                            st.error(f"Backend Error: {response.json().get('message')}")
-                    except Exception as e:
-                        st.error(f"Connection Failed: {e}")
+                            st.error("The analysis is taking longer than expected. Please try again.")
+                except Exception as e:
+                    st.error(f"Connection Failed: {e}")
             else:
                 st.warning("Strict requirement: Provide Job URL, Job Role, and Resume PDF.")
 
@@ -152,19 +200,44 @@ if page == "Mock Interview":
                 st.write(user_answer)
                 
             with st.chat_message("ai"):
-                with st.spinner("Grading your response..."):
-                    try:
-                        payload = {"question": st.session_state.current_question, "answer": user_answer}
-                        eval_response = requests.post(f"{API_URL}/api/chat", json=payload)
-                        
-                        if eval_response.status_code == 200 and eval_response.json().get("status") == "success":
-                            ai_feedback = eval_response.json()["feedback"]
-                            st.write(ai_feedback)
-                            st.session_state.chat_history.append({"role": "ai", "content": ai_feedback})
-                        else:
-                            st.error("Failed to get evaluation from backend.")
-                    except Exception as e:
-                        st.error(f"Connection error: {e}")
+                try:
+                    payload = {"question": st.session_state.current_question, "answer": user_answer}
+                    stream_errors = []
+
+                    # Render the critique token by token instead of waiting behind a spinner
+                    def feedback_chunks():
+                        with requests.post(f"{API_URL}/api/chat/stream", json=payload, stream=True, timeout=(10, 120)) as eval_response:
+                            eval_response.raise_for_status()
+                            for event, data in read_sse(eval_response):
+                                if event == "error":
+                                    stream_errors.append(data.get("message"))
+                                elif event is None:
+                                    yield data["delta"]
+
+                    ai_feedback = st.write_stream(feedback_chunks())
+
+                    if stream_errors:
+                        st.error(f"Failed to get evaluation from backend: {stream_errors[0]}")
+                    elif ai_feedback:
+                        # Store the final text so the chat survives Streamlit's reruns
+                        st.session_state.chat_history.append({"role": "ai", "content": ai_feedback.strip()})
+                except Exception as e:
+                    st.error(f"Connection error: {e}")
+
+            # Follow-up question, served instantly from the session's pre-generated bank
+            if st.session_state.interview_session:
+                try:
+                    next_response = requests.get(f"{API_URL}/api/session/{st.session_state.interview_session}/next-question", timeout=(10, 60))
+                    next_result = next_response.json()
+                    if next_result.get("status") == "success" and next_result.get("question"):
+                        st.session_state.current_question = next_result["question"]
+                        st.session_state.chat_history.append({"role": "ai", "content": next_result["question"]})
+                        with st.chat_message("ai"):
+                            st.write(next_result["question"])
+                    elif next_result.get("finished"):
+                        st.info("That was the last question of this interview.")
+                except Exception as e:
+                    st.error(f"Could not load the next question: {e}")
 
 # ==========================================
 # PAGE 2: INTERVIEW HISTORY
@@ -173,22 +246,57 @@ elif page == "Interview History":
     st.header("Your Historical Performance")
     st.markdown("Review your past technical assessments stored in Supabase.")
     
+    if "history_rows" not in st.session_state:
+        st.session_state.history_rows = []
+        st.session_state.history_cursor = None
+
+    def fetch_history_page(cursor=None):
+        """Appends one page of session summaries; the backend hands back a cursor for the next one."""
+        params = {"cursor": cursor} if cursor else {}
+        response = requests.get(f"{API_URL}/api/history/{st.session_state.candidate_name}", params=params)
+        if response.status_code == 200 and response.json().get("status") == "success":
+            result = response.json()
+            st.session_state.history_rows += result["data"]
+            st.session_state.history_cursor = result.get("next_cursor")
+        else:
+            st.error("Failed to retrieve data from backend.")
+
     if st.button("Fetch Latest Data"):
         with st.spinner("Pulling records from cloud database..."):
             try:
-                response = requests.get(f"{API_URL}/api/history/{st.session_state.candidate_name}")
-                if response.status_code == 200 and response.json().get("status") == "success":
-                    data = response.json()["data"]
-                    
-                    if not data:
-                        st.info("No interview history found yet. Go crush a mock interview!")
-                    else:
-                        df = pd.DataFrame(data)
-                        df['created_at'] = pd.to_datetime(df['created_at']).dt.strftime('%Y-%m-%d %H:%M')
-                        display_df = df[['created_at', 'job_role', 'match_score', 'missing_skills']]
-                        display_df.columns = ['Date', 'Job Role', 'Match Score (%)', 'Missing Skills Detected']
-                        st.dataframe(display_df, use_container_width=True, hide_index=True)
-                else:
-                    st.error("Failed to retrieve data from backend.")
+                st.session_state.history_rows = []
+                fetch_history_page()
+                if not st.session_state.history_rows:
+                    st.info("No interview history found yet. Go crush a mock interview!")
             except Exception as e:
-                st.error(f"Connection Failed: {e}")
\ No newline at end of file
+                st.error(f"Connection Failed: {e}")
+
+    if st.session_state.history_rows:
+        df = pd.DataFrame(st.session_state.history_rows)
+        df['created_at'] = pd.to_datetime(df['created_at']).dt.strftime('%Y-%m-%d %H:%M')
+        display_df = df[['created_at', 'job_role', 'match_score', 'missing_skills']]
+        display_df.columns = ['Date', 'Job Role', 'Match Score (%)', 'Missing Skills Detected']
+        st.dataframe(display_df, use_container_width=True, hide_index=True)
+
+        if st.session_state.history_cursor and st.button("Load Older Sessions"):
+            with st.spinner("Pulling older records..."):
+                try:
+                    fetch_history_page(st.session_state.history_cursor)
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Connection Failed: {e}")
+
+        # Full resume / JD text is only downloaded for the one session the candidate opens
+        labels = {f"{row['created_at']} - {row['job_role']}": row["id"] for row in df.to_dict("records")}
+        with st.expander("Review a session's resume and job description"):
+            choice = st.selectbox("Session", list(labels))
+            if st.button("Load Session Details"):
+                try:
+                    detail = requests.get(f"{API_URL}/api/history/{st.session_state.candidate_name}/sessions/{labels[choice]}").json()
+                    if detail.get("status") == "success":
+                        st.text_area("Resume", detail["data"].get("resume_text", ""), height=200)
+                        st.text_area("Job Description", detail["data"].get("jd_text", ""), height=200)
+                    else:
+                        st.error(detail.get("message"))
+                except Exception as e:
+                    st.error(f"Connection Failed: {e}")